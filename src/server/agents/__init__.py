@@ -1,6 +1,7 @@
 """AI agents for MindPulse."""
 
 from .claude_agent import ClaudeAgent
+from .async_claude_agent import AsyncClaudeAgent
+from .local_sentiment import LocalSentimentClassifier
 
-__all__ = ["ClaudeAgent"]
-
+__all__ = ["ClaudeAgent", "AsyncClaudeAgent", "LocalSentimentClassifier"]
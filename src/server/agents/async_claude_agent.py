@@ -0,0 +1,420 @@
+"""Async Claude AI Agent for MindPulse - non-blocking variant for the API server."""
+
+import asyncio
+import time
+from typing import AsyncIterator, List, Dict, Any, Optional
+from anthropic import AsyncAnthropic
+from loguru import logger
+
+from config import settings
+from .claude_agent import ClaudeAgent
+
+
+class AsyncClaudeAgent(ClaudeAgent):
+    """
+    Claude agent whose public methods are coroutines built on ``AsyncAnthropic``.
+    
+    Prompt construction and response parsing are shared with ``ClaudeAgent``;
+    only the model calls are awaited. Blocking local work (embedding lookups,
+    DataFrame scans, SMS sends) is pushed to a worker thread so a single
+    uvicorn worker can keep many model calls in flight at once. The
+    synchronous ``ClaudeAgent`` remains the entry point for scripts.
+    """
+    
+    def __init__(
+        self,
+        counseling_loader=None,
+        sentiment_loader=None,
+        diagnosis_loader=None,
+        embeddings_model=None,
+        local_sentiment=None
+    ):
+        """
+        Initialize the async Claude agent.
+        
+        Args:
+            counseling_loader: Counseling data loader
+            sentiment_loader: Sentiment data loader
+            diagnosis_loader: Diagnosis data loader
+            embeddings_model: Sentence transformer model for RAG
+            local_sentiment: Optional LocalSentimentClassifier tried before Claude
+        """
+        super().__init__(
+            counseling_loader=counseling_loader,
+            sentiment_loader=sentiment_loader,
+            diagnosis_loader=diagnosis_loader,
+            embeddings_model=embeddings_model,
+            local_sentiment=local_sentiment
+        )
+        self.async_client = AsyncAnthropic(api_key=settings.anthropic_api_key)
+        self._async_probe_lock = asyncio.Lock()
+    
+    async def chat(
+        self,
+        message: str,
+        session_id: Optional[str] = None,
+        use_rag: bool = True,
+        include_sentiment: bool = True,
+        retrieval_mode: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Handle a chat message from the user.
+        
+        The reply and the sentiment analysis are independent round trips,
+        so they are dispatched concurrently.
+        
+        Args:
+            message: User's message
+            session_id: Optional session ID for conversation continuity
+            use_rag: Whether to use RAG (Retrieval-Augmented Generation)
+            include_sentiment: Whether to analyze the sentiment of the message
+            retrieval_mode: RAG retrieval mode (dense, lexical or hybrid);
+                defaults to ``settings.retrieval_mode``
+        
+        Returns:
+            Response dictionary with message, sentiment, and metadata
+        """
+        sentiment_task = None
+        try:
+            if include_sentiment:
+                sentiment_task = asyncio.create_task(self.analyze_sentiment(message))
+            
+            request, context_examples = await asyncio.to_thread(
+                self._build_chat_request, message, session_id, use_rag, retrieval_mode
+            )
+            
+            response = await self.async_client.messages.create(**request)
+            self.usage.record("chat", response.usage)
+            self.upstream.record(True)
+            assistant_message = response.content[0].text
+            
+            sentiment_info = await sentiment_task if sentiment_task else {}
+            
+            # Session backends may do I/O, so record the exchange off the event loop
+            return await asyncio.to_thread(
+                self._finish_chat,
+                message, session_id, assistant_message, sentiment_info, context_examples
+            )
+        
+        except Exception as e:
+            logger.error(f"Error in chat: {e}")
+            self._record_upstream_error(e)
+            if sentiment_task:
+                sentiment_task.cancel()
+            return self._chat_error(e, session_id)
+    
+    async def chat_stream(
+        self,
+        message: str,
+        session_id: Optional[str] = None,
+        use_rag: bool = True,
+        include_sentiment: bool = True,
+        retrieval_mode: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a chat reply token by token.
+        
+        Yields ``{"event": ..., "data": {...}}`` items in this order: one
+        ``start``, a ``token`` per text delta, a trailing ``sentiment`` (when
+        requested) and a final ``done``; or an ``error`` if the call fails. The
+        session history is only updated once the full reply has streamed.
+        
+        Args:
+            message: User's message
+            session_id: Optional session ID for conversation continuity
+            use_rag: Whether to use RAG (Retrieval-Augmented Generation)
+            include_sentiment: Whether to analyze the sentiment of the message
+            retrieval_mode: RAG retrieval mode (dense, lexical or hybrid);
+                defaults to ``settings.retrieval_mode``
+        
+        Yields:
+            Stream event dictionaries
+        """
+        sentiment_task = None
+        try:
+            if include_sentiment:
+                sentiment_task = asyncio.create_task(self.analyze_sentiment(message))
+            
+            request, context_examples = await asyncio.to_thread(
+                self._build_chat_request, message, session_id, use_rag, retrieval_mode
+            )
+            yield {
+                "event": "start",
+                "data": {
+                    "session_id": session_id,
+                    "num_examples_retrieved": len(context_examples)
+                }
+            }
+            
+            chunks = []
+            async with self.async_client.messages.stream(**request) as stream:
+                async for text in stream.text_stream:
+                    chunks.append(text)
+                    yield {"event": "token", "data": {"text": text}}
+                final_message = await stream.get_final_message()
+            self.usage.record("chat_stream", final_message.usage)
+            self.upstream.record(True)
+            
+            sentiment_info = await sentiment_task if sentiment_task else {}
+            result = await asyncio.to_thread(
+                self._finish_chat,
+                message, session_id, "".join(chunks), sentiment_info, context_examples
+            )
+            
+            if include_sentiment:
+                yield {"event": "sentiment", "data": sentiment_info}
+            yield {
+                "event": "done",
+                "data": {
+                    "session_id": session_id,
+                    "context_used": result["context_used"],
+                    "num_examples_retrieved": result["num_examples_retrieved"]
+                }
+            }
+        
+        except Exception as e:
+            logger.error(f"Error in chat stream: {e}")
+            self._record_upstream_error(e)
+            yield {"event": "error", "data": self._chat_error(e, session_id)}
+        
+        finally:
+            # Also reached when the client disconnects mid-stream
+            if sentiment_task and not sentiment_task.done():
+                sentiment_task.cancel()
+    
+    async def analyze_sentiment(self, text: str) -> Dict[str, Any]:
+        """
+        Analyze sentiment and emotional content of text.
+        
+        Args:
+            text: Text to analyze
+        
+        Returns:
+            Sentiment analysis results
+        """
+        try:
+            cache_key = self._sentiment_cache_key(text)
+            # The cache may read from its SQLite file on an in-memory miss
+            cached = await asyncio.to_thread(self.sentiment_cache.get, cache_key)
+            if cached is not None:
+                return cached
+            
+            # Confident, low-risk texts are answered by the local classifier
+            local = self.local_sentiment.classify(text) if self.local_sentiment else None
+            if local is not None:
+                return local
+            
+            response = await self.async_client.messages.create(
+                **self._build_sentiment_request(text)
+            )
+            self.usage.record("sentiment", response.usage)
+            self.upstream.record(True)
+            
+            result = self._parse_sentiment_response(response.content[0].text)
+            await asyncio.to_thread(self.sentiment_cache.put, cache_key, result)
+            return result
+        
+        except Exception as e:
+            logger.error(f"Error in sentiment analysis: {e}")
+            self._record_upstream_error(e)
+            return self._sentiment_error(e)
+    
+    async def get_diagnosis_insights(
+        self,
+        symptoms: List[str],
+        duration: str,
+        additional_info: str = None
+    ) -> Dict[str, Any]:
+        """
+        Get insights about symptoms and potential conditions.
+        
+        Args:
+            symptoms: List of symptoms
+            duration: How long symptoms have persisted
+            additional_info: Any additional context
+        
+        Returns:
+            Insights and recommendations
+        """
+        try:
+            request, similar_cases = await asyncio.to_thread(
+                self._build_diagnosis_request, symptoms, duration, additional_info
+            )
+            
+            response = await self.async_client.messages.create(**request)
+            self.usage.record("diagnosis", response.usage)
+            self.upstream.record(True)
+            
+            return self._diagnosis_result(
+                response.content[0].text, similar_cases, symptoms, duration
+            )
+        
+        except Exception as e:
+            logger.error(f"Error getting diagnosis insights: {e}")
+            self._record_upstream_error(e)
+            return self._diagnosis_error(e)
+    
+    async def analyze_survey(
+        self,
+        medication_taken: bool,
+        mood_rating: int,
+        sleep_quality: int,
+        physical_activity: int,
+        thoughts: str
+    ) -> Dict[str, Any]:
+        """
+        Analyze daily survey responses and provide empathetic support.
+        
+        Args:
+            medication_taken: Whether medication was taken
+            mood_rating: Mood rating 1-10
+            sleep_quality: Sleep quality 1-10
+            physical_activity: Activity level 1-10
+            thoughts: User's thoughts/feelings
+        
+        Returns:
+            Empathetic message with recommendations
+        """
+        started = time.perf_counter()
+        mode = "claude"
+        # Rule evaluation may send a provider SMS, so keep it off the event loop
+        assessment = await asyncio.to_thread(
+            self._assess_survey,
+            medication_taken, mood_rating, sleep_quality, physical_activity
+        )
+        determined_risk, determined_concerns, provider_contacted = assessment
+        try:
+            # Fast mode: clearly low-risk check-ins get a pre-rendered reply
+            templated = self._templated_survey_response(
+                thoughts, determined_risk, determined_concerns, mood_rating, sleep_quality
+            )
+            if templated is not None:
+                mode = "template"
+                return templated
+            
+            request = self._build_survey_request(
+                medication_taken, mood_rating, sleep_quality, physical_activity,
+                thoughts, determined_risk, determined_concerns
+            )
+            response = await self.async_client.messages.create(**request)
+            self.usage.record("survey", response.usage)
+            self.upstream.record(True)
+            
+            return self._parse_survey_response(
+                response.content[0].text,
+                determined_risk,
+                determined_concerns,
+                mood_rating,
+                sleep_quality,
+                physical_activity,
+                provider_contacted
+            )
+        
+        except Exception as e:
+            mode = "fallback"
+            logger.error(f"Error analyzing survey: {e}")
+            self._record_upstream_error(e)
+            return self._survey_fallback(e, *assessment)
+        
+        finally:
+            self.survey_latency.record(mode, time.perf_counter() - started)
+    
+    async def analyze_survey_batch(
+        self,
+        surveys: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze many daily surveys at once.
+        
+        Risk rules run over the whole batch in one vectorized pass; the Claude
+        messages are then generated concurrently, bounded by a semaphore. A
+        failed item gets a templated fallback message and an ``error`` field
+        instead of failing the batch.
+        
+        Args:
+            surveys: Dicts with the analyze_survey arguments (and optional user_id)
+            max_concurrency: Concurrent Claude calls (default: settings.survey_batch_concurrency)
+        
+        Returns:
+            One result per survey, in input order
+        """
+        assessments = await asyncio.to_thread(
+            self._assess_surveys, surveys, [s.get("user_id") for s in surveys]
+        )
+        semaphore = asyncio.Semaphore(max_concurrency or settings.survey_batch_concurrency)
+        
+        async def analyze_one(survey: Dict[str, Any], assessment) -> Dict[str, Any]:
+            started = time.perf_counter()
+            mode = "claude"
+            try:
+                templated = self._templated_survey_response(
+                    survey["thoughts"], assessment[0], assessment[1],
+                    survey["mood_rating"], survey["sleep_quality"]
+                )
+                if templated is not None:
+                    mode = "template"
+                    return templated
+                
+                request = self._build_survey_request(
+                    survey["medication_taken"], survey["mood_rating"], survey["sleep_quality"],
+                    survey["physical_activity"], survey["thoughts"], assessment[0], assessment[1]
+                )
+                async with semaphore:
+                    response = await self.async_client.messages.create(**request)
+                self.usage.record("survey", response.usage)
+                self.upstream.record(True)
+                return self._parse_survey_response(
+                    response.content[0].text, assessment[0], assessment[1], survey["mood_rating"],
+                    survey["sleep_quality"], survey["physical_activity"], assessment[2]
+                )
+            except Exception as e:
+                mode = "fallback"
+                logger.error(f"Error analyzing survey in batch: {e}")
+                self._record_upstream_error(e)
+                return self._survey_fallback(e, *assessment)
+            finally:
+                self.survey_latency.record(mode, time.perf_counter() - started)
+        
+        return await asyncio.gather(*(
+            analyze_one(survey, assessment) for survey, assessment in zip(surveys, assessments)
+        ))
+    
+    async def health_check(self) -> Dict[str, Any]:
+        """
+        Check if the agent and its dependencies are healthy.
+        
+        Never calls Claude: availability is the result of the last deep probe
+        (refreshed by the app's background prober), or None if no probe has
+        run yet.
+        
+        Returns:
+            Health status information
+        """
+        health_status = await asyncio.to_thread(self._base_health_status)
+        probe = self.last_probe
+        health_status["claude_available"] = probe["ok"] if probe else None
+        return health_status
+    
+    async def probe_upstream(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Send a minimal Claude request, unless the last probe is recent enough.
+        
+        Concurrent callers share one in-flight probe.
+        
+        Args:
+            force: Probe even if the cached result is still fresh
+        
+        Returns:
+            Probe result (ok, error, latency_ms, checked_at)
+        """
+        async with self._async_probe_lock:
+            if not force and self._probe_is_fresh():
+                return self.last_probe
+            started = time.perf_counter()
+            try:
+                await self.async_client.messages.create(**self._build_health_probe_request())
+                return self._store_probe(started)
+            except Exception as e:
+                logger.error(f"Claude API health check failed: {e}")
+                return self._store_probe(started, e)
@@ -0,0 +1,265 @@
+"""Lightweight in-process sentiment classifier trained on the sentiment dataset."""
+
+import hashlib
+import os
+import pickle
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+import numpy as np
+from loguru import logger
+
+from utils.risk_engine import mentions_self_harm
+
+
+CLASSIFIER_VERSION = 1
+
+# Dataset labels (sentiment, mental health status or emotion) -> sentiment
+LABEL_SENTIMENT: Dict[str, str] = {
+    "positive": "positive",
+    "negative": "negative",
+    "neutral": "neutral",
+    "mixed": "mixed",
+    "normal": "neutral",
+    "joy": "positive",
+    "hope": "positive",
+    "gratitude": "positive",
+}
+
+# Labels that must always get a full Claude assessment
+HIGH_RISK_LABELS = frozenset({"suicidal", "self-harm", "self_harm"})
+
+# Only predictions mapping to these are answered locally (reported as low risk);
+# negative and clinical labels (depression, anxiety, stress, ...) go to Claude
+LOCAL_SENTIMENTS = frozenset({"positive", "neutral"})
+
+
+class LocalSentimentClassifier:
+    """
+    TF-IDF + logistic regression classifier used as a first pass before Claude.
+    
+    :meth:`classify` returns a result in the same shape as Claude's sentiment
+    analysis when the model confidently predicts a positive or neutral label,
+    and None when the text should be escalated: low confidence, a negative or
+    clinical label, a high-risk label carrying noticeable probability, or any
+    explicit risk phrase.
+    
+    Inference bypasses the scikit-learn pipeline (whose per-call validation
+    dominates for single texts): the fitted vocabulary, IDF weights and
+    coefficients are copied into arrays once and scored directly, giving the
+    same probabilities in tens of microseconds.
+    """
+    
+    def __init__(self, min_confidence: float = 0.8, max_risk_probability: float = 0.2):
+        """
+        Initialize an untrained classifier.
+        
+        Args:
+            min_confidence: Minimum top-class probability to answer locally
+            max_risk_probability: Escalate when high-risk labels together reach this probability
+        """
+        self.min_confidence = min_confidence
+        self.max_risk_probability = max_risk_probability
+        self.model = None
+        self._analyzer = None
+        self._lock = threading.Lock()
+        self.answered = 0
+        self.escalated = 0
+    
+    def fit(self, texts: List[str], labels: List[str]) -> "LocalSentimentClassifier":
+        """
+        Train on labeled texts.
+        
+        Args:
+            texts: Training texts
+            labels: Lowercase label per text
+        
+        Returns:
+            The classifier itself, for chaining
+        
+        Raises:
+            ImportError: If scikit-learn is not installed
+        """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import make_pipeline
+        
+        self.model = make_pipeline(
+            TfidfVectorizer(ngram_range=(1, 2), min_df=2, max_features=100_000, sublinear_tf=True),
+            LogisticRegression(max_iter=1000, class_weight="balanced")
+        )
+        self.model.fit(texts, labels)
+        self._compile()
+        logger.info(
+            f"✅ Trained local sentiment classifier on {len(texts)} records ({len(set(labels))} labels)"
+        )
+        return self
+    
+    def _compile(self):
+        """Extract the fitted pipeline into arrays for fast single-text scoring."""
+        vectorizer, linear = self.model.steps[0][1], self.model.steps[-1][1]
+        self._analyzer = vectorizer.build_analyzer()
+        self._vocabulary = vectorizer.vocabulary_
+        self._idf = vectorizer.idf_.astype(np.float64)
+        self.classes = np.asarray(linear.classes_)
+        coef, intercept = linear.coef_.T, linear.intercept_
+        if coef.shape[1] == 1:
+            # Binary logistic regression: softmax over (0, z) equals sigmoid(z)
+            coef = np.hstack([np.zeros_like(coef), coef])
+            intercept = np.concatenate([[0.0], intercept])
+        self._coef = np.ascontiguousarray(coef, dtype=np.float64)
+        self._intercept = intercept.astype(np.float64)
+        self._risk_mask = np.isin(self.classes, list(HIGH_RISK_LABELS))
+    
+    def predict_proba(self, text: str) -> np.ndarray:
+        """
+        Class probabilities for one text (same as the pipeline's ``predict_proba``).
+        
+        Args:
+            text: Text to score
+        
+        Returns:
+            Probability per entry of ``classes``
+        """
+        counts = Counter(t for t in self._analyzer(text) if t in self._vocabulary)
+        logits = self._intercept.copy()
+        if counts:
+            columns = np.fromiter((self._vocabulary[t] for t in counts), dtype=np.int64, count=len(counts))
+            weights = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float64, count=len(counts)))
+            weights *= self._idf[columns]
+            weights /= np.linalg.norm(weights)
+            logits += weights @ self._coef[columns]
+        logits = np.exp(logits - logits.max())
+        return logits / logits.sum()
+    
+    def classify(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Classify a text if it is safe to do so without Claude.
+        
+        Args:
+            text: Text to analyze
+        
+        Returns:
+            Sentiment result (``source`` = ``local``), or None to escalate
+        """
+        if self.model is None or mentions_self_harm(text):
+            return self._count(None)
+        
+        probabilities = self.predict_proba(text)
+        best = int(probabilities.argmax())
+        label, confidence = str(self.classes[best]), float(probabilities[best])
+        risk_probability = float(probabilities[self._risk_mask].sum())
+        
+        if confidence < self.min_confidence or risk_probability >= self.max_risk_probability:
+            return self._count(None)
+        
+        sentiment = LABEL_SENTIMENT.get(label, "negative")
+        if sentiment not in LOCAL_SENTIMENTS:
+            return self._count(None)
+        return self._count({
+            "sentiment": sentiment,
+            "primary_emotions": [] if label == sentiment else [label],
+            "risk_level": "low",
+            "confidence": round(confidence, 3),
+            "explanation": f"Local classifier predicted '{label}'",
+            "source": "local"
+        })
+    
+    def _count(self, result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Update the answered/escalated counters and pass the result through."""
+        with self._lock:
+            if result is None:
+                self.escalated += 1
+            else:
+                self.answered += 1
+        return result
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get classifier counters.
+        
+        Returns:
+            Labels, thresholds and how many texts were answered locally or escalated
+        """
+        total = self.answered + self.escalated
+        return {
+            "labels": [str(c) for c in self.classes] if self.model is not None else [],
+            "min_confidence": self.min_confidence,
+            "answered_locally": self.answered,
+            "escalated": self.escalated,
+            "local_rate": round(self.answered / total, 4) if total else 0.0,
+        }
+    
+    @staticmethod
+    def _content_hash(texts: List[str], labels: List[str]) -> str:
+        """Hash the training data together with the classifier version."""
+        digest = hashlib.sha256(f"v{CLASSIFIER_VERSION}".encode("utf-8"))
+        for text, label in zip(texts, labels):
+            digest.update(text.encode("utf-8"))
+            digest.update(b"\0")
+            digest.update(label.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+    
+    @classmethod
+    def from_loader(
+        cls,
+        sentiment_loader,
+        cache_path: Optional[Union[str, Path]] = None,
+        min_records: int = 100,
+        **options: Any
+    ) -> Optional["LocalSentimentClassifier"]:
+        """
+        Load a cached classifier for the loader's data, or train and cache one.
+        
+        Args:
+            sentiment_loader: Sentiment data loader providing labeled texts
+            cache_path: Optional pickle file for the trained model
+            min_records: Minimum labeled records needed to train
+            **options: Constructor arguments (thresholds)
+        
+        Returns:
+            Trained classifier, or None if the data or scikit-learn is unavailable
+        """
+        texts, labels = sentiment_loader.get_labeled_texts()
+        if len(texts) < min_records or len(set(labels)) < 2:
+            logger.info(
+                f"Local sentiment classifier disabled: {len(texts)} labeled records (need {min_records})"
+            )
+            return None
+        
+        classifier = cls(**options)
+        content_hash = cls._content_hash(texts, labels)
+        cache_path = Path(cache_path) if cache_path else None
+        
+        if cache_path and cache_path.exists():
+            try:
+                with open(cache_path, "rb") as f:
+                    cached = pickle.load(f)
+                if cached.get("content_hash") == content_hash:
+                    classifier.model = cached["model"]
+                    classifier._compile()
+                    logger.info(f"✅ Loaded local sentiment classifier from {cache_path}")
+                    return classifier
+                logger.info("Local sentiment classifier cache is stale, retraining")
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable sentiment classifier cache: {e}")
+        
+        try:
+            classifier.fit(texts, labels)
+        except ImportError as e:
+            logger.warning(f"⚠️ Local sentiment classifier needs scikit-learn: {e}")
+            return None
+        
+        if cache_path:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+                with open(tmp_path, "wb") as f:
+                    pickle.dump({"content_hash": content_hash, "model": classifier.model}, f)
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                logger.warning(f"⚠️ Could not write sentiment classifier cache: {e}")
+        
+        return classifier
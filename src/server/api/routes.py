@@ -1,15 +1,20 @@
 """FastAPI routes for MindPulse API."""
 
+import asyncio
+import json
 import uuid
-from typing import List, Optional
+from contextlib import asynccontextmanager
+from typing import List, Literal, Optional
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from loguru import logger
 
 from config import settings
-from agents import ClaudeAgent
+from agents import AsyncClaudeAgent, LocalSentimentClassifier
 from data_loaders import CounselingDataLoader, SentimentDataLoader, DiagnosisDataLoader
+from utils.alerts import current_alert_dispatcher, get_alert_dispatcher, shutdown_alert_dispatcher
 
 
 # Pydantic models for request/response
@@ -18,6 +23,10 @@ class ChatRequest(BaseModel):
     message: str = Field(..., description="User's message")
     session_id: Optional[str] = Field(None, description="Optional session ID for conversation continuity")
     use_rag: bool = Field(True, description="Whether to use retrieval-augmented generation")
+    include_sentiment: bool = Field(True, description="Whether to analyze the sentiment of the message")
+    retrieval_mode: Optional[Literal["dense", "lexical", "hybrid"]] = Field(
+        None, description="RAG retrieval mode; defaults to the server's RETRIEVAL_MODE"
+    )
 
 
 class ChatResponse(BaseModel):
@@ -62,9 +71,10 @@ class DiagnosisResponse(BaseModel):
 class HealthResponse(BaseModel):
     """Response model for health check."""
     status: str
-    claude_available: bool
+    claude_available: Optional[bool] = None
     datasets_loaded: dict
     active_sessions: int
+    sessions: dict = {}
 
 
 class SurveyRequest(BaseModel):
@@ -86,6 +96,68 @@ class SurveyResponse(BaseModel):
     provider_contacted: bool
 
 
+class SurveyBatchRequest(BaseModel):
+    """Request model for batch survey analysis."""
+    surveys: List[SurveyRequest] = Field(
+        ..., min_length=1, max_length=settings.survey_batch_max_items,
+        description="Daily surveys to analyze"
+    )
+
+
+class SurveyBatchItem(SurveyResponse):
+    """Result for one survey in a batch."""
+    index: int
+    user_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class SurveyBatchResponse(BaseModel):
+    """Response model for batch survey analysis."""
+    results: List[SurveyBatchItem]
+    failed: int
+
+
+async def sweep_sessions(app: FastAPI):
+    """Periodically remove expired sessions from the agent's session store."""
+    while True:
+        await asyncio.sleep(settings.session_sweep_interval_seconds)
+        try:
+            await asyncio.to_thread(app.state.agent.sessions.sweep)
+        except Exception as e:
+            logger.warning(f"⚠️ Session sweep failed: {e}")
+
+
+async def probe_upstream(app: FastAPI):
+    """Periodically refresh the agent's cached deep Claude probe."""
+    while True:
+        try:
+            await app.state.agent.probe_upstream()
+        except Exception as e:
+            logger.warning(f"⚠️ Upstream probe failed: {e}")
+        await asyncio.sleep(settings.upstream_probe_interval_seconds)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run background maintenance tasks for the lifetime of the app."""
+    # Idle sessions also expire lazily when accessed
+    sweeper = asyncio.create_task(sweep_sessions(app))
+    prober = (
+        asyncio.create_task(probe_upstream(app)) if settings.upstream_probe_interval_seconds > 0 else None
+    )
+    if settings.enable_sms_alerts:
+        # Deliver alerts left pending in the outbox by a previous run
+        await asyncio.to_thread(get_alert_dispatcher().start)
+    try:
+        yield
+    finally:
+        sweeper.cancel()
+        if prober:
+            prober.cancel()
+        # Give queued provider alerts a chance to go out before exiting
+        await asyncio.to_thread(shutdown_alert_dispatcher)
+
+
 def create_app() -> FastAPI:
     """
     Create and configure the FastAPI application.
@@ -94,6 +166,7 @@ def create_app() -> FastAPI:
         Configured FastAPI app
     """
     app = FastAPI(
+        lifespan=lifespan,
         title="MindPulse API",
         description="AI-powered mental health support system using Claude",
         version="1.0.0",
@@ -115,9 +188,21 @@ def create_app() -> FastAPI:
     
     try:
         # Load datasets
-        counseling_loader = CounselingDataLoader(settings.counseling_data_path)
-        sentiment_loader = SentimentDataLoader(settings.sentiment_data_path)
-        diagnosis_loader = DiagnosisDataLoader(settings.diagnosis_data_path)
+        snapshot_dir = settings.snapshot_dir if settings.use_dataset_snapshots else None
+        counseling_loader = CounselingDataLoader(
+            settings.counseling_data_path,
+            cache_dir=settings.embedding_cache_dir,
+            retrieval_backend=settings.retrieval_backend,
+            index_options=settings.get_index_options(),
+            rrf_k=settings.rrf_k,
+            hybrid_candidates=settings.hybrid_candidates,
+            snapshot_dir=snapshot_dir,
+            topic_partitions=settings.topic_partitions,
+            route_partitions=settings.topic_route_partitions,
+            min_partition_size=settings.topic_min_partition_size
+        )
+        sentiment_loader = SentimentDataLoader(settings.sentiment_data_path, snapshot_dir=snapshot_dir)
+        diagnosis_loader = DiagnosisDataLoader(settings.diagnosis_data_path, snapshot_dir=snapshot_dir)
         
         # Initialize embeddings model
         embeddings_model = None
@@ -130,12 +215,32 @@ def create_app() -> FastAPI:
             logger.warning(f"⚠️ Could not load embeddings model: {e}")
             logger.info("RAG will use keyword-based search as fallback")
         
-        # Initialize Claude agent
-        agent = ClaudeAgent(
+        # Build (or memory-map the cached) corpus embeddings before serving requests
+        if embeddings_model is not None:
+            try:
+                counseling_loader.build_embeddings(embeddings_model, settings.embedding_model)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not build counseling embeddings at startup: {e}")
+        
+        # Train (or load the cached) local sentiment classifier
+        local_sentiment = None
+        if settings.local_sentiment_enabled:
+            try:
+                local_sentiment = LocalSentimentClassifier.from_loader(
+                    sentiment_loader,
+                    cache_path=settings.local_sentiment_model_path,
+                    min_confidence=settings.local_sentiment_min_confidence
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ Could not build local sentiment classifier: {e}")
+        
+        # Initialize Claude agent (async client so model calls don't block the event loop)
+        agent = AsyncClaudeAgent(
             counseling_loader=counseling_loader,
             sentiment_loader=sentiment_loader,
             diagnosis_loader=diagnosis_loader,
-            embeddings_model=embeddings_model
+            embeddings_model=embeddings_model,
+            local_sentiment=local_sentiment
         )
         
         # Store in app state
@@ -161,9 +266,13 @@ def create_app() -> FastAPI:
             "description": "AI-powered mental health support system",
             "endpoints": {
                 "chat": "/api/chat",
+                "chat_stream": "/api/chat/stream",
                 "sentiment": "/api/analyze-sentiment",
                 "diagnosis": "/api/diagnose",
-                "health": "/api/health"
+                "health": "/api/health",
+                "liveness": "/livez",
+                "readiness": "/readyz",
+                "metrics": "/api/metrics"
             },
             "documentation": {
                 "swagger": "/docs",
@@ -184,10 +293,12 @@ def create_app() -> FastAPI:
             session_id = request.session_id or str(uuid.uuid4())
             
             # Get response from agent
-            result = app.state.agent.chat(
+            result = await app.state.agent.chat(
                 message=request.message,
                 session_id=session_id,
-                use_rag=request.use_rag
+                use_rag=request.use_rag,
+                include_sentiment=request.include_sentiment,
+                retrieval_mode=request.retrieval_mode
             )
             
             return ChatResponse(
@@ -202,6 +313,33 @@ def create_app() -> FastAPI:
             logger.error(f"Error in chat endpoint: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
+    @app.post("/api/chat/stream", tags=["Chat"])
+    async def chat_stream(request: ChatRequest):
+        """
+        Chat with the assistant, streaming the reply as server-sent events.
+        
+        Emits ``start``, one ``token`` event per text delta, a trailing
+        ``sentiment`` event and a final ``done`` event (or ``error``). Each
+        event's ``data`` is a JSON object.
+        """
+        session_id = request.session_id or str(uuid.uuid4())
+        
+        async def event_source():
+            async for event in app.state.agent.chat_stream(
+                message=request.message,
+                session_id=session_id,
+                use_rag=request.use_rag,
+                include_sentiment=request.include_sentiment,
+                retrieval_mode=request.retrieval_mode
+            ):
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+        
+        return StreamingResponse(
+            event_source(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    
     @app.post("/api/analyze-sentiment", response_model=SentimentResponse, tags=["Analysis"])
     async def analyze_sentiment(request: SentimentRequest):
         """
@@ -211,7 +349,7 @@ def create_app() -> FastAPI:
         and potential risk indicators in user messages.
         """
         try:
-            result = app.state.agent.analyze_sentiment(request.text)
+            result = await app.state.agent.analyze_sentiment(request.text)
             
             return SentimentResponse(
                 sentiment=result.get("sentiment", "unknown"),
@@ -235,7 +373,7 @@ def create_app() -> FastAPI:
         similar cases, and general guidance. It does NOT provide medical diagnoses.
         """
         try:
-            result = app.state.agent.get_diagnosis_insights(
+            result = await app.state.agent.get_diagnosis_insights(
                 symptoms=request.symptoms,
                 duration=request.duration,
                 additional_info=request.additional_info
@@ -261,7 +399,7 @@ def create_app() -> FastAPI:
         to provide personalized, compassionate recommendations.
         """
         try:
-            result = app.state.agent.analyze_survey(
+            result = await app.state.agent.analyze_survey(
                 medication_taken=request.medication_taken,
                 mood_rating=request.mood_rating,
                 sleep_quality=request.sleep_quality,
@@ -281,26 +419,70 @@ def create_app() -> FastAPI:
             logger.error(f"Error in survey endpoint: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
+    @app.post("/api/analyze-survey/batch", response_model=SurveyBatchResponse, tags=["Survey"])
+    async def analyze_survey_batch(request: SurveyBatchRequest):
+        """
+        Analyze many daily surveys in one request (e.g. a clinic's check-ins).
+        
+        Risk scoring runs over the whole batch at once and the supportive
+        messages are generated concurrently. Results are returned in input
+        order; an item whose message generation failed carries an ``error``
+        and a templated fallback message.
+        """
+        try:
+            results = await app.state.agent.analyze_survey_batch(
+                [survey.model_dump() for survey in request.surveys]
+            )
+            
+            items = [
+                SurveyBatchItem(
+                    index=i,
+                    user_id=survey.user_id,
+                    message=result.get("message", ""),
+                    recommendations=result.get("recommendations", []),
+                    risk_level=result.get("risk_level", "low"),
+                    key_concerns=result.get("key_concerns", []),
+                    provider_contacted=result.get("provider_contacted", False),
+                    error=result.get("error")
+                )
+                for i, (survey, result) in enumerate(zip(request.surveys, results))
+            ]
+            return SurveyBatchResponse(
+                results=items,
+                failed=sum(item.error is not None for item in items)
+            )
+        
+        except Exception as e:
+            logger.error(f"Error in batch survey endpoint: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+    
     @app.get("/api/health", response_model=HealthResponse, tags=["Health"])
     async def health_check():
         """
         Check the health status of the API and its dependencies.
         
-        Returns information about Claude API availability, dataset loading status,
+        Returns information about Claude API availability (from the last
+        background probe; unknown until one has run), dataset loading status,
         and active sessions.
         """
         try:
-            health_status = app.state.agent.health_check()
+            health_status = await app.state.agent.health_check()
+            claude_available = health_status["claude_available"]
+            if claude_available is None:
+                status = "unknown"
+            else:
+                status = "healthy" if claude_available else "degraded"
             
             return HealthResponse(
-                status="healthy" if health_status["claude_available"] else "degraded",
-                claude_available=health_status["claude_available"],
+                status=status,
+                claude_available=claude_available,
                 datasets_loaded={
                     "counseling": health_status["counseling_data_loaded"],
                     "sentiment": health_status["sentiment_data_loaded"],
                     "diagnosis": health_status["diagnosis_data_loaded"]
                 },
-                active_sessions=health_status["active_sessions"]
+                active_sessions=health_status["active_sessions"],
+                sessions=health_status.get("sessions", {})
             )
             
         except Exception as e:
@@ -316,6 +498,29 @@ def create_app() -> FastAPI:
                 active_sessions=0
             )
     
+    @app.get("/livez", tags=["Health"])
+    async def liveness():
+        """
+        Liveness probe: the process is up and serving requests.
+        
+        Checks no dependencies, so a Claude outage never restarts the pod.
+        """
+        return {"status": "alive"}
+    
+    @app.get("/readyz", tags=["Health"])
+    async def readiness():
+        """
+        Readiness probe from in-process state only (never calls Claude).
+        
+        Returns 503 until the datasets and retrieval index are loaded, or while
+        the recent Claude error rate is above the configured threshold.
+        """
+        state = app.state.agent.readiness()
+        return JSONResponse(
+            status_code=200 if state["ready"] else 503,
+            content={"status": "ready" if state["ready"] else "not_ready", **state}
+        )
+    
     @app.delete("/api/session/{session_id}", tags=["Session"])
     async def clear_session(session_id: str):
         """
@@ -324,7 +529,7 @@ def create_app() -> FastAPI:
         This endpoint removes all conversation history for a given session ID.
         """
         try:
-            app.state.agent.clear_session(session_id)
+            await asyncio.to_thread(app.state.agent.clear_session, session_id)
             return {"message": f"Session {session_id} cleared successfully"}
         except Exception as e:
             logger.error(f"Error clearing session: {e}")
@@ -338,7 +543,7 @@ def create_app() -> FastAPI:
         Returns all messages in the specified session.
         """
         try:
-            history = app.state.agent.get_session_history(session_id)
+            history = await asyncio.to_thread(app.state.agent.get_session_history, session_id)
             return {
                 "session_id": session_id,
                 "message_count": len(history),
@@ -348,6 +553,30 @@ def create_app() -> FastAPI:
             logger.error(f"Error getting session history: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
+    @app.get("/api/metrics", tags=["Statistics"])
+    async def get_metrics():
+        """
+        Get Claude token usage per endpoint.
+        
+        Includes prompt-cache write and read token counts, the fraction of
+        input tokens served from the cache, sentiment response cache hits,
+        survey latency per response mode and provider alert delivery counts
+        (empty while SMS alerts are disabled).
+        """
+        # Only report on a dispatcher that exists: creating one opens the outbox and transport
+        dispatcher = current_alert_dispatcher()
+        provider_alerts = await asyncio.to_thread(dispatcher.stats) if dispatcher else {}
+        return {
+            "claude_usage": app.state.agent.usage.snapshot(),
+            "claude_upstream": app.state.agent.upstream.snapshot(),
+            "sentiment_cache": app.state.agent.sentiment_cache.stats(),
+            "survey_latency": app.state.agent.survey_latency.snapshot(),
+            "provider_alerts": provider_alerts,
+            "local_sentiment": (
+                app.state.agent.local_sentiment.stats() if app.state.agent.local_sentiment else None
+            )
+        }
+    
     @app.get("/api/stats", tags=["Statistics"])
     async def get_statistics():
         """
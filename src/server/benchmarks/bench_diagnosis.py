@@ -0,0 +1,107 @@
+"""Benchmark DiagnosisDataLoader.search_by_symptoms across table sizes.
+
+Compares the original row-by-row ``iterrows`` matcher with the vectorized
+matcher over dictionary-encoded lowercase symptom text, on synthetic diagnosis
+tables. The legacy matcher is skipped above ``--legacy-max-rows`` because
+it takes minutes on multi-million row tables.
+
+Usage:
+    cd src/server
+    python3 benchmarks/bench_diagnosis.py
+    python3 benchmarks/bench_diagnosis.py --rows 500 50000 5000000 --legacy-max-rows 50000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))  # Add server directory to path
+
+from data_loaders import DiagnosisDataLoader
+
+SYMPTOM_VOCABULARY = [
+    "insomnia", "fatigue", "loss of appetite", "anxiety", "panic attacks",
+    "racing thoughts", "sadness", "hopelessness", "lack of motivation",
+    "mood swings", "irritability", "impulsivity", "obsessive thoughts",
+    "compulsive behaviors", "flashbacks", "nightmares", "hypervigilance",
+    "social withdrawal", "low energy", "poor concentration", "excessive worry",
+    "restlessness", "muscle tension",
+]
+
+QUERY = ["insomnia", "anxiety", "low energy"]
+
+
+def legacy_search(data: pd.DataFrame, symptoms, max_results: int = 5):
+    """Original implementation: iterrows with per-row lowercasing and to_dict."""
+    results = []
+    symptoms_lower = [s.lower() for s in symptoms]
+    for idx, row in data.iterrows():
+        row_symptoms = str(row['symptoms']).lower()
+        match_count = sum(1 for sym in symptoms_lower if sym in row_symptoms)
+        if match_count > 0:
+            result = row.to_dict()
+            result['match_score'] = match_count / len(symptoms_lower)
+            results.append(result)
+    results.sort(key=lambda x: x['match_score'], reverse=True)
+    return results[:max_results]
+
+
+def make_table(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Generate a synthetic diagnosis table with 3 symptoms per row."""
+    rng = np.random.default_rng(seed)
+    vocab = np.array([s.title() for s in SYMPTOM_VOCABULARY], dtype=object)
+    picks = rng.integers(0, len(vocab), size=(rows, 3))
+    symptoms = pd.Series(vocab[picks[:, 0]]) + ", " + vocab[picks[:, 1]] + ", " + vocab[picks[:, 2]]
+    return pd.DataFrame({
+        "symptoms": symptoms,
+        "condition": rng.choice(["Depression", "Anxiety Disorder", "PTSD", "OCD"], size=rows),
+        "severity": rng.choice(["mild", "moderate", "severe"], size=rows),
+    })
+
+
+def timed(fn, repeats: int) -> float:
+    """Median wall time of ``fn`` in milliseconds."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[500, 50_000, 5_000_000], help="Table sizes")
+    parser.add_argument("--legacy-max-rows", type=int, default=50_000, help="Largest table timed with iterrows")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per size")
+    args = parser.parse_args()
+    
+    loader = DiagnosisDataLoader(Path("/nonexistent"))  # placeholder data, replaced below
+    
+    print("=" * 80)
+    print(f"search_by_symptoms({QUERY})")
+    print("=" * 80)
+    for rows in args.rows:
+        loader.data = make_table(rows)
+        start = time.perf_counter()
+        loader._build_symptom_index()
+        index_ms = (time.perf_counter() - start) * 1000
+        
+        current_ms = timed(lambda: loader.search_by_symptoms(QUERY), args.repeats)
+        line = f"{rows:>10,} rows | index build {index_ms:9.1f} ms | vectorized {current_ms:9.2f} ms"
+        
+        if rows <= args.legacy_max_rows:
+            legacy_ms = timed(lambda: legacy_search(loader.data, QUERY), 1)
+            assert legacy_search(loader.data, QUERY) == loader.search_by_symptoms(QUERY)
+            line += f" | iterrows {legacy_ms:10.2f} ms | speedup {legacy_ms / current_ms:6.1f}x"
+        else:
+            line += " | iterrows (skipped)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Recall@k and latency of the approximate retrieval backends against exact search.
+
+Builds each backend over a synthetic clustered corpus (a mixture of gaussians
+on the unit sphere, which resembles real sentence embeddings far more than
+uniform noise) and reports build time, median per-query latency and recall@k
+relative to the exact NumPy baseline. The topic-partitioned index is
+evaluated with synthetic topics (groups of clusters) as its labels.
+
+Usage:
+    cd src/server
+    python3 benchmarks/bench_retrieval.py
+    python3 benchmarks/bench_retrieval.py --rows 100000 --nprobe 4 8 16
+    python3 benchmarks/bench_retrieval.py --topics 30 --route 1 2 4
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))  # Add server directory to path
+
+from retrieval import PartitionedIndex, create_vector_index, normalize_rows
+
+
+def make_corpus(rows: int, dim: int, clusters: int, queries: int, seed: int = 0):
+    """Generate normalized clustered embeddings, held-out queries and corpus cluster labels."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim), dtype=np.float32)
+    labels = rng.integers(0, clusters, size=rows + queries)
+    points = centers[labels] + 0.6 * rng.standard_normal((rows + queries, dim), dtype=np.float32)
+    points = normalize_rows(points)
+    return points[:rows], points[rows:], labels[:rows]
+
+
+def evaluate(index, queries: np.ndarray, truth: np.ndarray, k: int):
+    """Return (median latency ms, recall@k) of ``index`` over ``queries``."""
+    timings = []
+    hits = 0
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        found, _ = index.search(query, k)
+        timings.append((time.perf_counter() - start) * 1000)
+        hits += len(set(found.tolist()) & set(expected.tolist()))
+    return float(np.median(timings)), hits / (len(queries) * k)
+
+
+def report(label: str, build_s: float, latency_ms: float, recall: float, baseline_ms: float):
+    """Print one result row."""
+    print(
+        f"{label:<24} | build {build_s:7.2f} s | {latency_ms:8.3f} ms/query "
+        f"({baseline_ms / latency_ms:5.1f}x) | recall@k {recall:6.3f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Corpus size")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension")
+    parser.add_argument("--clusters", type=int, default=500, help="Synthetic topic clusters")
+    parser.add_argument("--queries", type=int, default=200, help="Queries to evaluate")
+    parser.add_argument("--k", type=int, default=5, help="Results per query")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16, 32], help="IVF nprobe values")
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[32, 64, 128], help="HNSW efSearch values")
+    parser.add_argument("--topics", type=int, default=30, help="Synthetic topics for the partitioned index")
+    parser.add_argument("--route", type=int, nargs="+", default=[1, 2, 4], help="Partitions searched per query")
+    args = parser.parse_args()
+    
+    corpus, queries, clusters = make_corpus(args.rows, args.dim, args.clusters, args.queries)
+    
+    print("=" * 90)
+    print(f"Retrieval backends: {args.rows:,} rows, dim={args.dim}, k={args.k}, {args.queries} queries")
+    print("=" * 90)
+    
+    start = time.perf_counter()
+    exact = create_vector_index("exact").build(corpus)
+    build_s = time.perf_counter() - start
+    truth = np.stack([exact.search(q, args.k)[0] for q in queries])
+    baseline_ms, recall = evaluate(exact, queries, truth, args.k)
+    report("exact", build_s, baseline_ms, recall, baseline_ms)
+    
+    start = time.perf_counter()
+    ivf = create_vector_index("ivf").build(corpus)
+    build_s = time.perf_counter() - start
+    for nprobe in args.nprobe:
+        ivf.nprobe = nprobe
+        latency_ms, recall = evaluate(ivf, queries, truth, args.k)
+        report(f"ivf nprobe={nprobe}", build_s, latency_ms, recall, baseline_ms)
+    
+    # Each topic is a fixed group of clusters, like CounselChat topics spanning several themes
+    labels = [[f"topic-{c % args.topics}"] for c in clusters.tolist()]
+    start = time.perf_counter()
+    partitioned = PartitionedIndex(labels).build(corpus)
+    build_s = time.perf_counter() - start
+    for route in args.route:
+        partitioned.max_partitions = route
+        latency_ms, recall = evaluate(partitioned, queries, truth, args.k)
+        report(f"topics route={route}", build_s, latency_ms, recall, baseline_ms)
+    
+    try:
+        start = time.perf_counter()
+        hnsw = create_vector_index("hnsw").build(corpus)
+        build_s = time.perf_counter() - start
+    except ImportError as e:
+        print(f"hnsw skipped: {e}")
+        return
+    for ef_search in args.ef_search:
+        hnsw.index.hnsw.efSearch = ef_search
+        latency_ms, recall = evaluate(hnsw, queries, truth, args.k)
+        report(f"hnsw efSearch={ef_search}", build_s, latency_ms, recall, baseline_ms)
+
+
+if __name__ == "__main__":
+    main()
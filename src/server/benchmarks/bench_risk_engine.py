@@ -0,0 +1,68 @@
+"""Throughput of the vectorized survey risk engine on historical check-ins.
+
+Scores a synthetic table of daily surveys with ``score_survey_frame`` and
+compares it with calling the single-survey rules once per row.
+
+Usage:
+    cd src/server
+    python3 benchmarks/bench_risk_engine.py
+    python3 benchmarks/bench_risk_engine.py --rows 1000000 --scalar-rows 20000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))  # Add server directory to path
+
+from utils.risk_engine import assess_survey, score_survey_frame
+
+
+def make_surveys(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Generate random daily check-ins."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "medication_taken": rng.random(rows) < 0.85,
+        "mood_rating": rng.integers(1, 11, rows),
+        "sleep_quality": rng.integers(1, 11, rows),
+        "physical_activity": rng.integers(1, 11, rows),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Surveys scored by the vectorized engine")
+    parser.add_argument("--scalar-rows", type=int, default=20_000, help="Surveys scored one at a time")
+    args = parser.parse_args()
+    
+    surveys = make_surveys(args.rows)
+    
+    print("=" * 80)
+    print(f"Survey risk engine: {args.rows:,} surveys")
+    print("=" * 80)
+    
+    start = time.perf_counter()
+    scored = score_survey_frame(surveys)
+    vector_s = time.perf_counter() - start
+    
+    sample = surveys.head(args.scalar_rows)
+    start = time.perf_counter()
+    scalar = [assess_survey(*row) for row in sample.itertuples(index=False)]
+    scalar_s = (time.perf_counter() - start) * args.rows / len(sample)
+    
+    assert [r[0] for r in scalar] == scored["risk_level"].head(len(sample)).astype(str).tolist()
+    
+    print(f"vectorized  {vector_s:8.2f} s  ({args.rows / vector_s:12,.0f} surveys/s)")
+    print(f"per-row     {scalar_s:8.2f} s  ({args.rows / scalar_s:12,.0f} surveys/s, extrapolated)")
+    print(f"speedup     {scalar_s / vector_s:8.1f}x")
+    print()
+    print(scored["risk_level"].value_counts().to_string())
+    print(f"provider alerts: {int(scored['provider_alert'].sum()):,}")
+
+
+if __name__ == "__main__":
+    main()
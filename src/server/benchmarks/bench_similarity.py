@@ -0,0 +1,86 @@
+"""Micro-benchmark for per-query cost of counseling similarity search.
+
+Compares the original scoring (per-query row norms + full argsort) with the
+pre-normalized matrix-vector product + argpartition top-k used by
+CounselingDataLoader.search_by_similarity.
+
+Usage:
+    cd src/server
+    python3 benchmarks/bench_similarity.py
+    python3 benchmarks/bench_similarity.py --rows 7500 100000 --dim 384 --k 5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))  # Add server directory to path
+
+from retrieval import normalize_rows, top_k_indices
+
+
+def legacy_search(embeddings: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+    """Original implementation: recompute norms and fully sort every query."""
+    similarities = np.dot(embeddings, query) / (
+        np.linalg.norm(embeddings, axis=1) * np.linalg.norm(query)
+    )
+    return np.argsort(similarities)[::-1][:k]
+
+
+def normalized_search(normalized: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+    """Current implementation: one matvec over normalized rows + argpartition."""
+    return top_k_indices(normalized @ normalize_rows(query), k)
+
+
+def time_per_query(fn, repeats: int) -> float:
+    """Return the median wall time of ``fn`` in milliseconds."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def run(rows: int, dim: int, k: int, repeats: int, seed: int = 0):
+    """Benchmark both implementations on a synthetic corpus of ``rows`` embeddings."""
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((rows, dim), dtype=np.float32)
+    normalized = normalize_rows(embeddings)
+    query = rng.standard_normal(dim, dtype=np.float32)
+    
+    legacy = legacy_search(embeddings, query, k)
+    current = normalized_search(normalized, query, k)
+    assert np.array_equal(legacy, current), "implementations disagree on top-k"
+    
+    legacy_ms = time_per_query(lambda: legacy_search(embeddings, query, k), repeats)
+    current_ms = time_per_query(lambda: normalized_search(normalized, query, k), repeats)
+    
+    print(
+        f"{rows:>10,} rows | legacy {legacy_ms:9.3f} ms | "
+        f"normalized+argpartition {current_ms:9.3f} ms | "
+        f"speedup {legacy_ms / current_ms:5.1f}x"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[7500, 1_000_000],
+                        help="Corpus sizes to benchmark (default: counsel chat size and 1M)")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension (all-MiniLM-L6-v2 = 384)")
+    parser.add_argument("--k", type=int, default=5, help="Results per query")
+    parser.add_argument("--repeats", type=int, default=20, help="Queries timed per corpus size")
+    args = parser.parse_args()
+    
+    print("=" * 80)
+    print(f"Similarity search per-query cost (dim={args.dim}, k={args.k})")
+    print("=" * 80)
+    for rows in args.rows:
+        run(rows, args.dim, args.k, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Startup-time benchmark: parsing dataset text files vs loading columnar snapshots.
+
+Times what the loaders do at startup - reading the counseling JSON lines and
+the diagnosis CSV - against reading the snapshots written by
+``python -m data_loaders.snapshot``. Synthetic datasets are generated at each
+requested size; the bundled diagnosis CSV is included when present.
+
+Usage:
+    cd src/server
+    python3 benchmarks/bench_snapshots.py
+    python3 benchmarks/bench_snapshots.py --rows 3500 100000 --repeats 5
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))  # Add server directory to path
+
+from config import settings
+from data_loaders.counseling_loader import read_conversations
+from data_loaders.snapshot import build_snapshot, read_snapshot, read_snapshot_records
+
+WORDS = (
+    "i feel anxious tired sad overwhelmed work sleep family partner therapy "
+    "try breathing routine support talk counselor help week night stress"
+).split()
+
+
+def time_load(fn, repeats: int) -> float:
+    """Return the median wall time of ``fn`` in milliseconds."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def write_conversations(path: Path, rows: int, rng: np.random.Generator):
+    """Write ``rows`` synthetic counseling conversations as JSON lines."""
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(rows):
+            context = " ".join(rng.choice(WORDS, 60))
+            response = " ".join(rng.choice(WORDS, 200))
+            f.write(json.dumps({"Context": context, "Response": response}) + "\n")
+
+
+def write_diagnosis(path: Path, rows: int, rng: np.random.Generator):
+    """Write ``rows`` synthetic diagnosis records as CSV."""
+    pd.DataFrame({
+        "Patient ID": np.arange(rows),
+        "Age": rng.integers(18, 80, rows),
+        "Gender": rng.choice(["Male", "Female"], rows),
+        "Diagnosis": rng.choice(["Generalized Anxiety", "Major Depressive Disorder", "Bipolar Disorder"], rows),
+        "Symptom Severity (1-10)": rng.integers(1, 11, rows),
+        "Mood Score (1-10)": rng.integers(1, 11, rows),
+        "Physical Activity (hrs/week)": rng.uniform(0, 10, rows).round(1),
+        "Medication": rng.choice(["SSRIs", "Antidepressants", "Mood Stabilizers"], rows),
+    }).to_csv(path, index=False)
+
+
+def compare(label: str, source: Path, reader, snapshot_reader, snapshot_dir: Path, repeats: int):
+    """Time one dataset both ways and check that the results agree."""
+    snapshot = build_snapshot(source, reader, snapshot_dir)
+    parsed = reader(source)
+    restored = snapshot_reader(snapshot)
+    same = parsed.equals(restored) if isinstance(parsed, pd.DataFrame) else parsed == restored
+    assert same, f"{label}: snapshot does not match the parsed source"
+    
+    parse_ms = time_load(lambda: reader(source), repeats)
+    snapshot_ms = time_load(lambda: snapshot_reader(snapshot), repeats)
+    print(
+        f"{label:<34} | parse {parse_ms:9.1f} ms | snapshot {snapshot_ms:9.1f} ms | "
+        f"speedup {parse_ms / snapshot_ms:5.1f}x"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[3500, 100_000],
+                        help="Synthetic dataset sizes (default: counsel chat size and 100k)")
+    parser.add_argument("--repeats", type=int, default=5, help="Loads timed per dataset")
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(0)
+    print("=" * 80)
+    print("Dataset load time: text parse vs columnar snapshot")
+    print("=" * 80)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        snapshot_dir = tmp / "snapshots"
+        for rows in args.rows:
+            conversations = tmp / f"conversations_{rows}.json"
+            write_conversations(conversations, rows, rng)
+            compare(f"counseling JSON, {rows:,} rows", conversations,
+                    read_conversations, read_snapshot_records, snapshot_dir, args.repeats)
+            
+            diagnosis = tmp / f"diagnosis_{rows}.csv"
+            write_diagnosis(diagnosis, rows, rng)
+            compare(f"diagnosis CSV, {rows:,} rows", diagnosis,
+                    pd.read_csv, read_snapshot, snapshot_dir, args.repeats)
+        
+        bundled = next(iter(settings.diagnosis_data_path.glob("*.csv")), None)
+        if bundled is not None:
+            compare(f"bundled {bundled.name[:24]}", bundled, pd.read_csv, read_snapshot, snapshot_dir, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@
 
 import os
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
 from dotenv import load_dotenv
@@ -38,12 +38,58 @@ class Settings(BaseSettings):
     claude_model: str = "claude-3-5-sonnet-20241022"
     max_tokens: int = 2048
     temperature: float = 0.7
+    enable_prompt_caching: bool = True
+    sentiment_cache_size: int = 2048  # 0 disables the sentiment response cache
+    sentiment_cache_path: str = ""  # optional SQLite file to persist it
+    
+    # Local Sentiment Classifier (first pass before Claude)
+    local_sentiment_enabled: bool = True
+    local_sentiment_min_confidence: float = 0.8
+    local_sentiment_model_path: Path = BASE_DIR / ".cache" / "sentiment_classifier.pkl"
     
     # Embedding Model
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    embedding_cache_dir: Path = BASE_DIR / ".cache" / "embeddings"
+    
+    # Retrieval Backend (exact, ivf or hnsw)
+    retrieval_backend: str = "exact"
+    ivf_nlist: int = 0  # 0 = 4 * sqrt(corpus size)
+    ivf_nprobe: int = 8
+    hnsw_m: int = 32
+    hnsw_ef_search: int = 64
+    
+    # Retrieval Mode (dense, lexical or hybrid BM25 + embeddings)
+    retrieval_mode: str = "dense"
+    rrf_k: int = 60
+    hybrid_candidates: int = 20
+    
+    # Topic-partitioned retrieval (one index per CounselChat topic, queries routed to a few)
+    topic_partitions: bool = False
+    topic_route_partitions: int = 2
+    topic_min_partition_size: int = 20
     
     # Session Configuration
     session_timeout_minutes: int = 30
+    max_sessions: int = 10000
+    session_max_messages: int = 10
+    session_sweep_interval_seconds: int = 60
+    session_backend: str = "memory"  # memory, sqlite or redis
+    session_sqlite_path: Path = BASE_DIR / ".cache" / "sessions.db"
+    redis_url: str = "redis://localhost:6379/0"
+    
+    # Batch Survey Analysis
+    survey_batch_max_items: int = 500
+    survey_batch_concurrency: int = 8  # concurrent Claude calls per batch
+    
+    # Survey Fast Mode (templated replies for clearly low-risk check-ins)
+    survey_fast_mode: bool = False
+    survey_fast_max_thoughts_chars: int = 280
+    
+    # Health Probes (/livez, /readyz and the background Claude probe)
+    upstream_window_seconds: float = 300.0  # rolling window of Claude call outcomes
+    upstream_probe_interval_seconds: float = 60.0  # background deep Claude probe interval (0 = no probe)
+    readiness_max_error_rate: float = 0.5
+    readiness_min_calls: int = 10  # calls in the window before the error rate counts
     
     # SMS Configuration (Twilio)
     twilio_account_sid: str = ""
@@ -51,13 +97,28 @@ class Settings(BaseSettings):
     twilio_phone_number: str = ""
     provider_phone_number: str = ""
     enable_sms_alerts: bool = False
+    # Report provider_contacted for alert-worthy surveys even when no SMS was queued (UI demos)
+    demo_report_provider_contacted: bool = False
+    
+    # Provider Alert Dispatch (durable outbox drained in the background)
+    alert_transport: str = "twilio"  # twilio | fake
+    alert_max_retries: int = 3
+    alert_retry_backoff_seconds: float = 2.0
+    alert_dedupe_window_seconds: float = 900.0
+    alert_outbox_path: Path = BASE_DIR / ".cache" / "alert_outbox.db"
+    alert_outbox_retention_hours: int = 168  # keep delivered alerts for a week
     
     # Dataset Paths (relative to project root)
     dataset_dir: Path = PROJECT_ROOT / "dataset"
-    counseling_data_path: Path = dataset_dir / "mentalHealthCounselingConversations" / "combined_dataset.json"
+    # A conversations file or a directory of them (JSON lines and CounselChat CSVs, deduplicated)
+    counseling_data_path: Path = dataset_dir / "mentalHealthCounselingConversations"
     sentiment_data_path: Path = dataset_dir / "sentiment_analysis"
     diagnosis_data_path: Path = dataset_dir / "diagnosis_treatment"
     
+    # Columnar dataset snapshots (built with `python -m data_loaders.snapshot`)
+    snapshot_dir: Path = BASE_DIR / ".cache" / "snapshots"
+    use_dataset_snapshots: bool = True
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -65,6 +126,40 @@ class Settings(BaseSettings):
     def get_allowed_origins_list(self) -> List[str]:
         """Get allowed origins as a list."""
         return [origin.strip() for origin in self.allowed_origins.split(",")]
+    
+    def get_index_options(self) -> Dict[str, Any]:
+        """Get constructor options for the configured retrieval backend."""
+        backend = self.retrieval_backend.lower()
+        if backend == "ivf":
+            return {"nlist": self.ivf_nlist, "nprobe": self.ivf_nprobe}
+        if backend == "hnsw":
+            return {"m": self.hnsw_m, "ef_search": self.hnsw_ef_search}
+        return {}
+    
+    def get_session_options(self) -> Dict[str, Any]:
+        """Get constructor options for the configured session backend."""
+        options = {
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.session_timeout_minutes * 60,
+            "max_messages": self.session_max_messages
+        }
+        backend = self.session_backend.lower()
+        if backend == "sqlite":
+            options["path"] = self.session_sqlite_path
+        elif backend == "redis":
+            options["url"] = self.redis_url
+        return options
+    
+    def get_alert_transport_options(self) -> Dict[str, Any]:
+        """Get constructor options for the configured alert transport."""
+        if self.alert_transport.lower() == "twilio":
+            return {
+                "account_sid": self.twilio_account_sid,
+                "auth_token": self.twilio_auth_token,
+                "from_number": self.twilio_phone_number,
+                "to_number": self.provider_phone_number
+            }
+        return {}
 
 
 # Global settings instance
@@ -0,0 +1,120 @@
+"""Streaming ingestion of the CounselChat CSV exports.
+
+The repo ships two scrapes of counselchat.com with different layouts:
+
+- ``counsel_chat2.csv``: questionTitle, questionText, topic (slug), answerText
+  (plain text), upvotes, views
+- ``counselchat-data.csv``: questionTitle, questionText, topics (comma-separated
+  display names), answerText (HTML), upvotes
+
+Rows from either are normalized to the conversation record used by
+``CounselingDataLoader`` (``Context`` / ``Response``) plus the filterable
+``topic`` and ``upvotes`` fields (and ``views`` when the file has them). The
+two scrapes overlap, so records are deduplicated by ``conversation_key``.
+"""
+
+import csv
+import hashlib
+import html
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Union
+
+
+# Some answers are long HTML documents (over the csv module's 128 KiB default)
+CSV_FIELD_LIMIT = 16 * 1024 * 1024
+
+_TAG = re.compile(r'<[^>]+>')
+_BLOCK_TAG = re.compile(r'</p>|<br\s*/?>', re.IGNORECASE)
+_SPACE = re.compile(r'\s+')
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def clean_text(text: str) -> str:
+    """Strip HTML markup and entities and collapse whitespace."""
+    if "<" in text:
+        text = _TAG.sub("", _BLOCK_TAG.sub(" ", text))
+    return _SPACE.sub(" ", html.unescape(text)).strip()
+
+
+def topic_slug(topic: str) -> str:
+    """Normalize a topic name to the slug form, e.g. ``Family Conflict`` -> ``family-conflict``."""
+    return _NON_ALNUM.sub("-", topic.lower()).strip("-")
+
+
+def conversation_topics(conversation: Dict) -> List[str]:
+    """Topic slugs of a conversation (``topic`` holds them comma-separated)."""
+    return [t for t in conversation.get("topic", "").split(",") if t]
+
+
+def conversation_key(conversation: Dict) -> str:
+    """
+    Content hash identifying a question/answer pair across scrapes.
+    
+    Only letters and digits are hashed, so the same pair matches whether it was
+    exported as HTML or as plain text with paragraph breaks dropped.
+    """
+    digest = hashlib.sha1()
+    for field in ("Context", "Response"):
+        digest.update(_NON_ALNUM.sub("", conversation.get(field, "").lower()).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def merge_duplicate(kept: Dict, duplicate: Dict):
+    """
+    Fold a duplicate of ``kept`` from another scrape into it, in place.
+    
+    Topics are unioned, the higher upvote count wins and fields only the
+    duplicate has (e.g. ``views``) are copied over.
+    """
+    for field, value in duplicate.items():
+        kept.setdefault(field, value)
+    topics = conversation_topics(kept)
+    topics += [t for t in conversation_topics(duplicate) if t not in topics]
+    if topics:
+        kept["topic"] = ",".join(topics)
+    if "upvotes" in duplicate:
+        kept["upvotes"] = max(kept["upvotes"], duplicate["upvotes"])
+
+
+def _to_int(value: str) -> int:
+    """Parse a count column, treating blanks and junk as 0."""
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def iter_counselchat_csv(path: Union[str, Path]) -> Iterator[Dict[str, Union[str, int]]]:
+    """
+    Stream conversations from a CounselChat CSV one row at a time.
+    
+    Rows without an answer, or without both question text and title, are skipped.
+    
+    Args:
+        path: Path to either CounselChat export
+    
+    Yields:
+        Conversation records with Context, Response, topic and upvotes (and views)
+    """
+    csv.field_size_limit(max(csv.field_size_limit(), CSV_FIELD_LIMIT))
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        has_views = "views" in (reader.fieldnames or [])
+        for row in reader:
+            context = clean_text(row.get("questionText") or "") or clean_text(row.get("questionTitle") or "")
+            response = clean_text(row.get("answerText") or "")
+            if not context or not response:
+                continue
+            
+            topics = (row.get("topic") or row.get("topics") or "").split(",")
+            conversation = {
+                "Context": context,
+                "Response": response,
+                "topic": ",".join(slug for slug in map(topic_slug, topics) if slug),
+                "upvotes": _to_int(row.get("upvotes")),
+            }
+            if has_views:
+                conversation["views"] = _to_int(row.get("views"))
+            yield conversation
@@ -1,45 +1,190 @@
 """Loader for Mental Health Counseling Conversations dataset."""
 
+import hashlib
 import json
+import os
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Callable, Iterable, List, Dict, Any, Optional
 import numpy as np
 from loguru import logger
 
+from retrieval import (
+    BM25Index,
+    PartitionedIndex,
+    VectorIndex,
+    create_vector_index,
+    normalize_rows,
+    reciprocal_rank_fusion,
+    top_k_indices
+)
+from .counselchat import conversation_key, conversation_topics, iter_counselchat_csv, merge_duplicate
+from .snapshot import load_cached, read_snapshot_records
+
+
+EMBEDDING_CACHE_NAME = "counseling_embeddings"
+
+RETRIEVAL_MODES = ("dense", "lexical", "hybrid")
+
+
+def read_conversations(path: Path) -> List[Dict[str, str]]:
+    """
+    Parse line-delimited JSON conversations, skipping malformed lines.
+    
+    Args:
+        path: Path to the combined_dataset.json file
+    
+    Returns:
+        Conversations in file order
+    """
+    conversations = []
+    with open(path, 'r', encoding='utf-8') as f:
+        # Each line is a separate JSON object
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    conversations.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    logger.warning(f"Failed to parse line: {e}")
+                    continue
+    return conversations
+
+
+# Parser for each supported counseling dataset file type
+COUNSELING_READERS: Dict[str, Callable[[Path], Iterable[Dict[str, Any]]]] = {
+    ".json": read_conversations,
+    ".jsonl": read_conversations,
+    ".csv": iter_counselchat_csv,
+}
+
+
+def counseling_sources(data_path: Path) -> List[Path]:
+    """
+    Dataset files behind a counseling data path.
+    
+    Args:
+        data_path: A dataset file, or a directory searched recursively for
+            supported files (loaded in sorted path order)
+    
+    Returns:
+        Files to load
+    """
+    data_path = Path(data_path)
+    if not data_path.is_dir():
+        return [data_path]
+    return sorted(p for p in data_path.rglob("*") if p.suffix in COUNSELING_READERS and p.is_file())
+
+
+@dataclass
+class ConversationStats:
+    """Running totals behind the dataset statistics, accumulated once at load time."""
+    
+    total: int = 0
+    context_chars: int = 0
+    response_chars: int = 0
+    
+    def add(self, conversation: Dict[str, str]):
+        """Count one conversation."""
+        self.total += 1
+        self.context_chars += len(conversation.get("Context", ""))
+        self.response_chars += len(conversation.get("Response", ""))
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Statistics in the ``get_statistics`` format."""
+        return {
+            "total_conversations": self.total,
+            "avg_context_length": self.context_chars / self.total if self.total else 0.0,
+            "avg_response_length": self.response_chars / self.total if self.total else 0.0,
+        }
+
 
 class CounselingDataLoader:
     """Loads and manages the counseling conversations dataset."""
     
-    def __init__(self, data_path: Path):
+    def __init__(
+        self,
+        data_path: Path,
+        cache_dir: Optional[Path] = None,
+        retrieval_backend: str = "exact",
+        index_options: Optional[Dict[str, Any]] = None,
+        rrf_k: int = 60,
+        hybrid_candidates: int = 20,
+        snapshot_dir: Optional[Path] = None,
+        topic_partitions: bool = False,
+        route_partitions: int = 2,
+        min_partition_size: int = 20
+    ):
         """
         Initialize the counseling data loader.
         
         Args:
-            data_path: Path to the combined_dataset.json file
+            data_path: Conversations file (line-delimited JSON or CounselChat CSV)
+                or a directory of them
+            cache_dir: Optional directory for the persistent embedding cache
+            retrieval_backend: Vector index backend (exact, ivf or hnsw)
+            index_options: Backend-specific index options
+            rrf_k: Reciprocal rank fusion constant for hybrid retrieval
+            hybrid_candidates: Results taken from each retriever before fusion
+            snapshot_dir: Optional directory of columnar dataset snapshots
+            topic_partitions: Build one vector index per topic and search only the
+                partitions each query is routed to (needs topic-tagged data)
+            route_partitions: Topic partitions searched per query
+            min_partition_size: Topics with fewer conversations share one partition
         """
         self.data_path = data_path
-        self.conversations: List[Dict[str, str]] = []
+        self.cache_dir = cache_dir
+        self.retrieval_backend = retrieval_backend
+        self.index_options = index_options or {}
+        self.rrf_k = rrf_k
+        self.hybrid_candidates = hybrid_candidates
+        self.snapshot_dir = snapshot_dir
+        self.topic_partitions = topic_partitions
+        self.route_partitions = route_partitions
+        self.min_partition_size = min_partition_size
+        self.conversations: List[Dict[str, Any]] = []
+        self.duplicates_skipped = 0
+        self.stats = ConversationStats()
         self.embeddings: np.ndarray = None
+        self.index: Optional[VectorIndex] = None
+        self.keyword_index: Optional[BM25Index] = None
+        self.topic_rows: Dict[str, np.ndarray] = {}
+        self.upvotes: np.ndarray = np.empty(0, dtype=np.int64)
         self._load_data()
+        self._build_filter_index()
+        self._build_keyword_index()
     
     def _load_data(self):
-        """Load conversations from JSON file."""
+        """Load conversations from every source file (or its snapshot, when fresh), dropping duplicates."""
         try:
             logger.info(f"Loading counseling data from {self.data_path}")
             
-            with open(self.data_path, 'r', encoding='utf-8') as f:
-                # Each line is a separate JSON object
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            conversation = json.loads(line)
-                            self.conversations.append(conversation)
-                        except json.JSONDecodeError as e:
-                            logger.warning(f"Failed to parse line: {e}")
-                            continue
+            sources = counseling_sources(self.data_path)
+            if not sources:
+                raise FileNotFoundError(f"No counseling data files in {self.data_path}")
+            
+            seen: Dict[str, Dict[str, Any]] = {}
+            for source in sources:
+                reader = COUNSELING_READERS.get(source.suffix, read_conversations)
+                for conversation in load_cached(source, reader, read_snapshot_records, self.snapshot_dir):
+                    key = conversation_key(conversation)
+                    kept = seen.get(key)
+                    if kept is not None:
+                        # Same pair from another scrape (or repeated within one): keep the first
+                        merge_duplicate(kept, conversation)
+                        self.duplicates_skipped += 1
+                        continue
+                    seen[key] = conversation
+                    self.conversations.append(conversation)
             
-            logger.info(f"✅ Loaded {len(self.conversations)} counseling conversations")
+            # Counted after deduplication, so fields folded in from duplicates are reflected
+            for conversation in self.conversations:
+                self.stats.add(conversation)
+            
+            logger.info(
+                f"✅ Loaded {len(self.conversations)} counseling conversations from {len(sources)} file(s) "
+                f"({self.duplicates_skipped} duplicates skipped)"
+            )
             
         except FileNotFoundError:
             logger.error(f"❌ Counseling data file not found: {self.data_path}")
@@ -52,31 +197,78 @@ class CounselingDataLoader:
         """Get all conversations."""
         return self.conversations
     
-    def search_by_keywords(self, keywords: List[str], max_results: int = 5) -> List[Dict[str, str]]:
+    def filter_conversations(self, topic: Optional[str] = None, min_upvotes: int = 0) -> List[Dict[str, Any]]:
         """
-        Search conversations by keywords.
+        Get the conversations tagged with a topic and/or with enough upvotes.
+        
+        Args:
+            topic: Topic slug (e.g. ``depression``, ``family-conflict``)
+            min_upvotes: Minimum therapist-answer upvotes
+        
+        Returns:
+            Matching conversations in dataset order
+        """
+        allowed = self._filter_indices(topic, min_upvotes)
+        if allowed is None:
+            return self.conversations
+        return [self.conversations[i] for i in allowed]
+    
+    def _filter_indices(self, topic: Optional[str], min_upvotes: int) -> Optional[np.ndarray]:
+        """Indices of conversations passing the filters, or None when no filter is set."""
+        if topic is None and min_upvotes <= 0:
+            return None
+        if topic is None:
+            rows = np.arange(len(self.upvotes), dtype=np.int64)
+        else:
+            rows = self.topic_rows.get(topic, np.empty(0, dtype=np.int64))
+        if min_upvotes > 0:
+            rows = rows[self.upvotes[rows] >= min_upvotes]
+        return rows
+    
+    def _build_filter_index(self):
+        """Group conversation indices by topic and collect upvotes into an array, for filtered search."""
+        # Built after loading, since merging duplicates can still change topics and upvotes
+        members: Dict[str, List[int]] = {}
+        for i, conv in enumerate(self.conversations):
+            for topic in conversation_topics(conv):
+                members.setdefault(topic, []).append(i)
+        self.topic_rows = {topic: np.array(rows, dtype=np.int64) for topic, rows in members.items()}
+        self.upvotes = np.array([conv.get("upvotes", 0) for conv in self.conversations], dtype=np.int64)
+    
+    def _build_keyword_index(self):
+        """Tokenize every conversation once into the BM25 inverted index."""
+        self.keyword_index = BM25Index().build(self._document_texts())
+    
+    def search_by_keywords(
+        self,
+        keywords: List[str],
+        max_results: int = 5,
+        topic: Optional[str] = None,
+        min_upvotes: int = 0
+    ) -> List[Dict[str, str]]:
+        """
+        Search conversations by keywords, ranked by BM25 relevance.
         
         Args:
             keywords: List of keywords to search for
             max_results: Maximum number of results to return
+            topic: Only return conversations tagged with this topic slug
+            min_upvotes: Only return conversations with at least this many upvotes
             
         Returns:
-            List of matching conversations
+            List of matching conversations, most relevant first
         """
-        results = []
-        keywords_lower = [k.lower() for k in keywords]
-        
-        for conv in self.conversations:
-            context = conv.get("Context", "").lower()
-            response = conv.get("Response", "").lower()
-            
-            # Check if any keyword appears in context or response
-            if any(kw in context or kw in response for kw in keywords_lower):
-                results.append(conv)
-                if len(results) >= max_results:
-                    break
-        
-        return results
+        indices = self._lexical_search(" ".join(keywords), max_results, self._filter_indices(topic, min_upvotes))
+        return [self.conversations[i] for i in indices]
+    
+    def _lexical_search(self, query: str, k: int, allowed: Optional[np.ndarray] = None) -> np.ndarray:
+        """Get the indices of the ``k`` best BM25 matches, restricted to ``allowed`` if given."""
+        if allowed is None:
+            indices, _ = self.keyword_index.search(query, k)
+            return indices
+        # Rank every matching document, then keep the allowed ones
+        indices, _ = self.keyword_index.search(query, len(self.keyword_index))
+        return indices[np.isin(indices, allowed)][:k]
     
     def get_random_sample(self, n: int = 5) -> List[Dict[str, str]]:
         """
@@ -94,11 +286,155 @@ class CounselingDataLoader:
         indices = np.random.choice(len(self.conversations), size=n, replace=False)
         return [self.conversations[i] for i in indices]
     
+    def _document_texts(self) -> List[str]:
+        """Get the searchable text of each conversation."""
+        return [
+            f"{conv.get('Context', '')} {conv.get('Response', '')}"
+            for conv in self.conversations
+        ]
+    
+    def build_embeddings(self, embeddings_model, model_name: Optional[str] = None) -> np.ndarray:
+        """
+        Load conversation embeddings from the on-disk cache, computing them if needed.
+        
+        Embeddings are kept as L2-normalized float32 rows. The cache is a
+        ``.npy`` matrix plus a JSON manifest recording the model name and a
+        hash of the embedded texts. It is memory-mapped when both still match,
+        and rebuilt automatically when the dataset or model changes.
+        
+        Args:
+            embeddings_model: Sentence transformer model for embeddings
+            model_name: Name of the embedding model; caching is skipped if omitted
+            
+        Returns:
+            Embedding matrix with one row per conversation
+        """
+        texts = self._document_texts()
+        
+        if model_name and self.cache_dir:
+            content_hash = self._content_hash(texts, model_name)
+            cached = self._load_cached_embeddings(model_name, content_hash)
+            if cached is not None:
+                self.embeddings = cached
+                self._build_index()
+                return self.embeddings
+        
+        logger.info("Computing embeddings for counseling conversations...")
+        # Stored L2-normalized so each query is a single matrix-vector product
+        self.embeddings = normalize_rows(
+            embeddings_model.encode(texts, show_progress_bar=True)
+        )
+        logger.info("✅ Embeddings computed")
+        
+        if model_name and self.cache_dir:
+            self._save_cached_embeddings(model_name, content_hash)
+        
+        self._build_index()
+        return self.embeddings
+    
+    def _build_index(self):
+        """Build the configured vector index, falling back to exact search on failure."""
+        try:
+            labels = [conversation_topics(conv) for conv in self.conversations]
+            if self.topic_partitions and any(labels):
+                self.index = PartitionedIndex(
+                    labels,
+                    backend=self.retrieval_backend,
+                    index_options=self.index_options,
+                    max_partitions=self.route_partitions,
+                    min_partition_size=self.min_partition_size
+                )
+            else:
+                self.index = create_vector_index(self.retrieval_backend, **self.index_options)
+            self.index.build(self.embeddings)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not build '{self.retrieval_backend}' index ({e}), using exact search")
+            self.index = create_vector_index("exact").build(self.embeddings)
+    
+    @staticmethod
+    def _content_hash(texts: List[str], model_name: str) -> str:
+        """Hash the embedded texts together with the model that embeds them."""
+        digest = hashlib.sha256(model_name.encode("utf-8"))
+        for text in texts:
+            digest.update(text.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+    
+    def _cache_paths(self):
+        """Get the (matrix, manifest) paths of the embedding cache."""
+        return (
+            self.cache_dir / f"{EMBEDDING_CACHE_NAME}.npy",
+            self.cache_dir / f"{EMBEDDING_CACHE_NAME}.json",
+        )
+    
+    def _load_cached_embeddings(self, model_name: str, content_hash: str) -> Optional[np.ndarray]:
+        """Memory-map cached embeddings if the manifest matches the current data and model."""
+        matrix_path, manifest_path = self._cache_paths()
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable embedding cache manifest: {e}")
+            return None
+        
+        if (
+            manifest.get("model_name") != model_name
+            or manifest.get("content_hash") != content_hash
+            or not manifest.get("normalized")
+        ):
+            logger.info("Embedding cache is stale (dataset or model changed), rebuilding")
+            return None
+        
+        try:
+            embeddings = np.load(matrix_path, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable embedding cache: {e}")
+            return None
+        
+        if embeddings.shape[0] != len(self.conversations):
+            logger.warning("Embedding cache row count does not match dataset, rebuilding")
+            return None
+        
+        logger.info(f"✅ Loaded cached embeddings from {matrix_path}")
+        return embeddings
+    
+    def _save_cached_embeddings(self, model_name: str, content_hash: str):
+        """Persist embeddings and their manifest, replacing any previous cache atomically."""
+        matrix_path, manifest_path = self._cache_paths()
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            
+            # Write to temp files first so concurrent workers never read a partial cache
+            tmp_matrix = matrix_path.with_suffix(f".{os.getpid()}.tmp.npy")
+            np.save(tmp_matrix, self.embeddings)
+            os.replace(tmp_matrix, matrix_path)
+            
+            tmp_manifest = manifest_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_manifest, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "model_name": model_name,
+                    "content_hash": content_hash,
+                    "rows": int(self.embeddings.shape[0]),
+                    "dim": int(self.embeddings.shape[1]),
+                    "dtype": str(self.embeddings.dtype),
+                    "normalized": True,
+                }, f, indent=2)
+            os.replace(tmp_manifest, manifest_path)
+            
+            logger.info(f"✅ Saved embedding cache to {matrix_path}")
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write embedding cache: {e}")
+    
     def search_by_similarity(
         self, 
         query: str, 
         embeddings_model=None, 
-        max_results: int = 5
+        max_results: int = 5,
+        mode: str = "dense",
+        topic: Optional[str] = None,
+        min_upvotes: int = 0
     ) -> List[Dict[str, str]]:
         """
         Search conversations by semantic similarity using embeddings.
@@ -107,37 +443,38 @@ class CounselingDataLoader:
             query: Query string
             embeddings_model: Sentence transformer model for embeddings
             max_results: Maximum number of results
+            mode: ``dense`` (embeddings), ``lexical`` (BM25) or ``hybrid``
+                (both, fused with reciprocal rank fusion)
+            topic: Only return conversations tagged with this topic slug
+            min_upvotes: Only return conversations with at least this many upvotes
             
         Returns:
             List of most similar conversations
         """
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode '{mode}'. Choose from: {', '.join(RETRIEVAL_MODES)}")
+        
+        if mode == "lexical":
+            return self.search_by_keywords(query.lower().split(), max_results, topic, min_upvotes)
+        
         if not embeddings_model:
             # Fallback to keyword search
             logger.warning("No embeddings model provided, using keyword search")
             words = query.lower().split()
-            return self.search_by_keywords(words, max_results)
+            return self.search_by_keywords(words, max_results, topic, min_upvotes)
         
         try:
-            # Compute query embedding
-            query_embedding = embeddings_model.encode([query])[0]
-            
-            # Compute conversation embeddings if not cached
-            if self.embeddings is None:
-                logger.info("Computing embeddings for counseling conversations...")
-                texts = [
-                    f"{conv.get('Context', '')} {conv.get('Response', '')}"
-                    for conv in self.conversations
-                ]
-                self.embeddings = embeddings_model.encode(texts, show_progress_bar=True)
-                logger.info("✅ Embeddings computed")
-            
-            # Compute cosine similarities
-            similarities = np.dot(self.embeddings, query_embedding) / (
-                np.linalg.norm(self.embeddings, axis=1) * np.linalg.norm(query_embedding)
-            )
-            
-            # Get top k indices
-            top_indices = np.argsort(similarities)[::-1][:max_results]
+            allowed = self._filter_indices(topic, min_upvotes)
+            if mode == "hybrid":
+                # Rank both ways deeper than needed, then fuse the two rankings
+                depth = max(max_results, self.hybrid_candidates)
+                dense_indices = self._dense_search(query, embeddings_model, depth, allowed)
+                lexical_indices = self._lexical_search(query, depth, allowed)
+                top_indices, _ = reciprocal_rank_fusion(
+                    [dense_indices, lexical_indices], max_results, rrf_k=self.rrf_k
+                )
+            else:
+                top_indices = self._dense_search(query, embeddings_model, max_results, allowed)
             
             # Return top conversations
             return [self.conversations[i] for i in top_indices]
@@ -146,17 +483,34 @@ class CounselingDataLoader:
             logger.error(f"Error in similarity search: {e}")
             # Fallback to keyword search
             words = query.lower().split()
-            return self.search_by_keywords(words, max_results)
+            return self.search_by_keywords(words, max_results, topic, min_upvotes)
+    
+    def _dense_search(
+        self, query: str, embeddings_model, k: int, allowed: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Get the indices of the ``k`` conversations closest to the query embedding (within ``allowed``)."""
+        # Compute query embedding
+        query_embedding = normalize_rows(embeddings_model.encode([query])[0])
+        
+        # Compute conversation embeddings if not built at startup
+        if self.index is None:
+            self.build_embeddings(embeddings_model)
+        
+        if allowed is not None:
+            # Filtered searches score just the allowed rows exactly
+            return allowed[top_k_indices(self.embeddings[allowed] @ query_embedding, k)]
+        
+        if isinstance(self.index, PartitionedIndex):
+            # Search only the topics the query is routed to (by name, then by centroid)
+            topics = self.index.route(query_embedding, query)
+            top_indices, _ = self.index.search(query_embedding, k, topics)
+            return top_indices
+        
+        # Rows are pre-normalized, so the index scores cosine similarity by inner product
+        top_indices, _ = self.index.search(query_embedding, k)
+        return top_indices
     
     def get_statistics(self) -> Dict[str, Any]:
-        """Get statistics about the dataset."""
-        return {
-            "total_conversations": len(self.conversations),
-            "avg_context_length": np.mean([
-                len(conv.get("Context", "")) for conv in self.conversations
-            ]),
-            "avg_response_length": np.mean([
-                len(conv.get("Response", "")) for conv in self.conversations
-            ]),
-        }
+        """Get statistics about the dataset (kept up to date at load time, O(1) to read)."""
+        return self.stats.as_dict()
 
@@ -6,20 +6,30 @@ from typing import List, Dict, Any, Optional
 import numpy as np
 from loguru import logger
 
+from .schema import DIAGNOSIS_SCHEMA, apply_schema, derive_symptoms
+from .snapshot import load_cached, read_snapshot
+
 
 class DiagnosisDataLoader:
     """Loads and manages the diagnosis and treatment dataset."""
     
-    def __init__(self, data_path: Path):
+    def __init__(self, data_path: Path, snapshot_dir: Optional[Path] = None):
         """
         Initialize the diagnosis data loader.
         
         Args:
             data_path: Path to the diagnosis dataset directory
+            snapshot_dir: Optional directory of columnar dataset snapshots
         """
         self.data_path = data_path
+        self.snapshot_dir = snapshot_dir
         self.data: pd.DataFrame = None
+        self._symptom_codes: Optional[np.ndarray] = None
+        self._symptom_vocab: Optional[pd.Series] = None
+        self._condition_rows: Dict[str, np.ndarray] = {}
         self._load_data()
+        self._build_indexes()
+        self._statistics = self._compute_statistics()
     
     def _load_data(self):
         """Load diagnosis data from CSV/JSON files."""
@@ -34,7 +44,7 @@ class DiagnosisDataLoader:
             csv_files = list(self.data_path.glob("*.csv"))
             if csv_files:
                 logger.info(f"Loading diagnosis data from {csv_files[0]}")
-                self.data = pd.read_csv(csv_files[0])
+                self.data = load_cached(csv_files[0], pd.read_csv, read_snapshot, self.snapshot_dir)
                 logger.info(f"✅ Loaded {len(self.data)} diagnosis records")
             else:
                 logger.warning("⚠️ No CSV files found in diagnosis data directory")
@@ -91,10 +101,54 @@ class DiagnosisDataLoader:
         """Get all diagnosis data."""
         return self.data if self.data is not None else pd.DataFrame()
     
+    def _build_indexes(self):
+        """
+        Resolve the raw columns against ``DIAGNOSIS_SCHEMA`` and build lookup indexes.
+        
+        Runs once at load time, so lookups use canonical column names
+        (``condition``, ``symptoms``, ``treatment``, ...) regardless of how the
+        source CSV spells its headers.
+        """
+        if self.data is None or self.data.empty:
+            return
+        
+        self.data = apply_schema(self.data, DIAGNOSIS_SCHEMA)
+        if "symptoms" not in self.data.columns:
+            # Score-only datasets (like the bundled CSV) get a derived symptom description
+            self.data["symptoms"] = derive_symptoms(self.data)
+        
+        self._build_symptom_index()
+        
+        if "condition" in self.data.columns:
+            self._condition_rows = {
+                str(name): rows
+                for name, rows in self.data.groupby("condition", observed=True).indices.items()
+            }
+    
+    def _build_symptom_index(self):
+        """
+        Dictionary-encode the lowercase symptom text.
+        
+        Rows share a small set of distinct symptom strings, so matching runs
+        over the distinct strings and is broadcast back to rows via integer codes.
+        """
+        self._symptom_codes = None
+        self._symptom_vocab = None
+        if self.data is None or self.data.empty or "symptoms" not in self.data.columns:
+            return
+        
+        codes, vocab = pd.factorize(self.data["symptoms"].fillna("").astype(str).str.lower())
+        self._symptom_codes = codes
+        self._symptom_vocab = pd.Series(vocab, dtype=object)
+    
     def search_by_symptoms(self, symptoms: List[str], max_results: int = 5) -> List[Dict[str, Any]]:
         """
         Search for similar cases based on symptoms.
         
+        All rows are scored at once: each symptom is a vectorized substring
+        test over the distinct lowercase symptom strings, and the per-string
+        match counts are gathered back to rows.
+        
         Args:
             symptoms: List of symptoms to search for
             max_results: Maximum results to return
@@ -102,65 +156,56 @@ class DiagnosisDataLoader:
         Returns:
             List of similar cases
         """
-        if self.data is None or self.data.empty:
+        if self._symptom_codes is None or not symptoms:
             return []
         
-        # Find symptoms column
-        symptoms_col = None
-        for col in ['symptoms', 'symptom', 'complaints', 'presenting_issues']:
-            if col in self.data.columns:
-                symptoms_col = col
-                break
-        
-        if not symptoms_col:
-            return []
-        
-        # Search for matching symptoms
-        results = []
+        # Count matching symptoms per distinct string, then per row
         symptoms_lower = [s.lower() for s in symptoms]
+        vocab_counts = np.zeros(len(self._symptom_vocab), dtype=np.int32)
+        for sym in symptoms_lower:
+            vocab_counts += self._symptom_vocab.str.contains(sym, regex=False).to_numpy(dtype=bool)
+        match_counts = vocab_counts[self._symptom_codes]
+        
+        # Highest match count first, file order within a count (stable, like the old sort)
+        selected = []
+        for count in range(len(symptoms_lower), 0, -1):
+            rows = np.flatnonzero(match_counts == count)
+            selected.extend(rows[:max_results - len(selected)].tolist())
+            if len(selected) >= max_results:
+                break
         
-        for idx, row in self.data.iterrows():
-            row_symptoms = str(row[symptoms_col]).lower()
-            match_count = sum(1 for sym in symptoms_lower if sym in row_symptoms)
-            
-            if match_count > 0:
-                result = row.to_dict()
-                result['match_score'] = match_count / len(symptoms_lower)
-                results.append(result)
-        
-        # Sort by match score
-        results.sort(key=lambda x: x['match_score'], reverse=True)
+        # Only materialize dicts for the returned rows
+        results = self.data.iloc[selected].to_dict('records')
+        for result, row in zip(results, selected):
+            result['match_score'] = float(match_counts[row]) / len(symptoms_lower)
         
-        return results[:max_results]
+        return results
     
     def get_by_condition(self, condition: str) -> pd.DataFrame:
         """
         Get records by condition/diagnosis.
         
+        Matches the (few) distinct condition names by substring and returns
+        their precomputed rows, without scanning the table.
+        
         Args:
             condition: Condition name
             
         Returns:
             Filtered dataframe
         """
-        if self.data is None or self.data.empty:
+        if not self._condition_rows:
             return pd.DataFrame()
         
-        # Find condition column
-        condition_col = None
-        for col in ['condition', 'diagnosis', 'disorder', 'mental_health_condition']:
-            if col in self.data.columns:
-                condition_col = col
-                break
-        
-        if condition_col:
-            return self.data[
-                self.data[condition_col].str.lower().str.contains(
-                    condition.lower(), na=False
-                )
-            ]
+        condition_lower = condition.lower()
+        matched = [
+            rows for name, rows in self._condition_rows.items()
+            if condition_lower in name.lower()
+        ]
+        if not matched:
+            return self.data.iloc[0:0]
         
-        return pd.DataFrame()
+        return self.data.iloc[np.sort(np.concatenate(matched))]
     
     def get_treatment_approaches(self, condition: str = None) -> List[str]:
         """
@@ -172,28 +217,22 @@ class DiagnosisDataLoader:
         Returns:
             List of treatment approaches
         """
-        if self.data is None or self.data.empty:
-            return []
-        
-        # Find treatment column
-        treatment_col = None
-        for col in ['treatment', 'treatment_approach', 'intervention', 'therapy']:
-            if col in self.data.columns:
-                treatment_col = col
-                break
-        
-        if not treatment_col:
+        if self.data is None or self.data.empty or "treatment" not in self.data.columns:
             return []
         
         if condition:
             filtered = self.get_by_condition(condition)
             if not filtered.empty:
-                return filtered[treatment_col].dropna().tolist()
+                return filtered["treatment"].dropna().astype(str).tolist()
         
-        return self.data[treatment_col].dropna().unique().tolist()
+        return self.data["treatment"].dropna().astype(str).unique().tolist()
     
     def get_statistics(self) -> Dict[str, Any]:
-        """Get statistics about the dataset."""
+        """Get statistics about the dataset (computed once at load, O(1) to read)."""
+        return self._statistics
+    
+    def _compute_statistics(self) -> Dict[str, Any]:
+        """Summarize the loaded data for ``get_statistics``."""
         if self.data is None or self.data.empty:
             return {
                 "total_records": 0,
@@ -201,20 +240,13 @@ class DiagnosisDataLoader:
                 "available_columns": []
             }
         
-        # Find condition column
-        condition_col = None
-        for col in ['condition', 'diagnosis', 'disorder']:
-            if col in self.data.columns:
-                condition_col = col
-                break
-        
-        conditions = []
-        if condition_col:
-            conditions = self.data[condition_col].value_counts().to_dict()
+        conditions = {}
+        if "condition" in self.data.columns:
+            counts = self.data["condition"].value_counts()
+            conditions = {str(name): int(count) for name, count in counts.items() if count > 0}
         
         return {
             "total_records": len(self.data),
             "conditions": conditions,
             "available_columns": list(self.data.columns)
         }
-
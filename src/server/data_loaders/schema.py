@@ -0,0 +1,163 @@
+"""Declarative column schemas that map raw dataset headers onto typed, canonical columns."""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """A canonical column, the raw headers it may appear under, and its type."""
+    
+    name: str
+    aliases: Tuple[str, ...]
+    dtype: str  # category | text | int | float | date
+
+
+@dataclass(frozen=True)
+class SymptomRule:
+    """Emit symptom terms for rows where ``column <op> threshold`` holds."""
+    
+    column: str
+    op: str  # <= | >=
+    threshold: float
+    terms: str
+
+
+DIAGNOSIS_SCHEMA: Tuple[ColumnSpec, ...] = (
+    ColumnSpec("patient_id", ("patient_id", "patient"), "int"),
+    ColumnSpec("age", ("age",), "int"),
+    ColumnSpec("gender", ("gender", "sex"), "category"),
+    ColumnSpec("condition", ("condition", "diagnosis", "disorder", "mental_health_condition"), "category"),
+    ColumnSpec("symptoms", ("symptoms", "symptom", "complaints", "presenting_issues"), "text"),
+    ColumnSpec("symptom_severity", ("symptom_severity_1_10", "symptom_severity"), "int"),
+    ColumnSpec("severity", ("severity",), "category"),
+    ColumnSpec("duration", ("duration",), "text"),
+    ColumnSpec("mood_score", ("mood_score_1_10", "mood_score"), "int"),
+    ColumnSpec("sleep_quality", ("sleep_quality_1_10", "sleep_quality"), "int"),
+    ColumnSpec("physical_activity_hours", ("physical_activity_hrs_week", "physical_activity"), "float"),
+    ColumnSpec("medication", ("medication", "medications"), "category"),
+    ColumnSpec(
+        "treatment",
+        ("therapy_type", "treatment", "treatment_approach", "intervention", "therapy"),
+        "category"
+    ),
+    ColumnSpec("treatment_start_date", ("treatment_start_date",), "date"),
+    ColumnSpec("treatment_duration_weeks", ("treatment_duration_weeks",), "int"),
+    ColumnSpec("stress_level", ("stress_level_1_10", "stress_level"), "int"),
+    ColumnSpec("outcome", ("outcome",), "category"),
+    ColumnSpec("treatment_progress", ("treatment_progress_1_10", "treatment_progress"), "int"),
+    ColumnSpec("emotional_state", ("ai_detected_emotional_state", "emotional_state"), "category"),
+    ColumnSpec("adherence_pct", ("adherence_to_treatment", "adherence"), "float"),
+)
+
+# Used to derive a searchable symptoms column for datasets that only carry scores
+DIAGNOSIS_SYMPTOM_RULES: Tuple[SymptomRule, ...] = (
+    SymptomRule("mood_score", "<=", 4, "low mood, sadness, hopelessness"),
+    SymptomRule("sleep_quality", "<=", 5, "poor sleep, insomnia"),
+    SymptomRule("physical_activity_hours", "<=", 3, "low energy, fatigue, inactivity"),
+    SymptomRule("stress_level", ">=", 8, "stress, excessive worry, muscle tension"),
+)
+
+EMOTIONAL_STATE_SYMPTOMS: Dict[str, str] = {
+    "anxious": "anxiety, restlessness, racing thoughts",
+    "depressed": "depression, sadness, lack of motivation",
+    "stressed": "stress, irritability, overwhelm",
+}
+
+
+def normalize_header(header: str) -> str:
+    """Normalize a raw header: lowercase, non-alphanumerics collapsed to ``_``."""
+    return re.sub(r'[^a-z0-9]+', '_', str(header).lower()).strip('_')
+
+
+def _coerce(series: pd.Series, dtype: str) -> pd.Series:
+    """Convert a raw column to its schema type."""
+    if dtype == "category":
+        return series.astype("category")
+    if dtype == "int":
+        return pd.to_numeric(series, errors="coerce").round().astype("Int64")
+    if dtype == "float":
+        return pd.to_numeric(series, errors="coerce").astype("float64")
+    if dtype == "date":
+        return pd.to_datetime(series, errors="coerce")
+    return series.fillna("").astype(str)
+
+
+def apply_schema(raw: pd.DataFrame, schema: Sequence[ColumnSpec]) -> pd.DataFrame:
+    """
+    Rename and type a raw DataFrame according to a schema.
+    
+    Each spec claims the first raw column whose normalized header is one of
+    its aliases (alias order is priority order). Unclaimed raw columns are
+    kept under their normalized header.
+    
+    Args:
+        raw: DataFrame as read from disk
+        schema: Column specs to resolve
+    
+    Returns:
+        New DataFrame with canonical column names and types
+    """
+    by_header = {}
+    for col in raw.columns:
+        by_header.setdefault(normalize_header(col), col)
+    
+    columns = {}
+    claimed = set()
+    for spec in schema:
+        source: Optional[str] = next(
+            (by_header[a] for a in spec.aliases if a in by_header and by_header[a] not in claimed),
+            None
+        )
+        if source is None:
+            continue
+        claimed.add(source)
+        columns[spec.name] = _coerce(raw[source], spec.dtype)
+    
+    for col in raw.columns:
+        if col not in claimed:
+            columns.setdefault(normalize_header(col), raw[col])
+    
+    mapped = {spec.name for spec in schema} & set(columns)
+    logger.info(f"Resolved schema columns: {sorted(mapped)}")
+    return pd.DataFrame(columns, index=raw.index)
+
+
+def derive_symptoms(
+    data: pd.DataFrame,
+    rules: Sequence[SymptomRule] = DIAGNOSIS_SYMPTOM_RULES,
+    state_terms: Dict[str, str] = EMOTIONAL_STATE_SYMPTOMS
+) -> pd.Series:
+    """
+    Build a comma-separated symptom description per row from scores and labels.
+    
+    Args:
+        data: DataFrame with canonical columns
+        rules: Threshold rules over numeric columns
+        state_terms: Symptom terms for ``emotional_state`` values (others are ignored)
+    
+    Returns:
+        Lowercase symptom text per row (condition name included)
+    """
+    parts = []
+    if "condition" in data.columns:
+        parts.append(data["condition"].astype(str).str.lower().to_numpy(dtype=object))
+    if "emotional_state" in data.columns:
+        states = data["emotional_state"].astype(str).str.lower()
+        parts.append(states.map(lambda s: state_terms.get(s, "")).to_numpy(dtype=object))
+    for rule in rules:
+        if rule.column not in data.columns:
+            continue
+        values = data[rule.column].astype("float64").to_numpy()
+        hit = values <= rule.threshold if rule.op == "<=" else values >= rule.threshold
+        parts.append(np.where(hit, rule.terms, ""))
+    
+    if not parts:
+        return pd.Series("", index=data.index)
+    
+    joined = [", ".join(p for p in row if p) for row in zip(*parts)]
+    return pd.Series(joined, index=data.index)
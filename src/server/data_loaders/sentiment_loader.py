@@ -2,24 +2,29 @@
 
 import pandas as pd
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 from loguru import logger
 
+from .snapshot import load_cached, read_snapshot
+
 
 class SentimentDataLoader:
     """Loads and manages the sentiment analysis dataset."""
     
-    def __init__(self, data_path: Path):
+    def __init__(self, data_path: Path, snapshot_dir: Optional[Path] = None):
         """
         Initialize the sentiment data loader.
         
         Args:
             data_path: Path to the sentiment analysis dataset directory
+            snapshot_dir: Optional directory of columnar dataset snapshots
         """
         self.data_path = data_path
+        self.snapshot_dir = snapshot_dir
         self.data: pd.DataFrame = None
         self._load_data()
+        self._statistics = self._compute_statistics()
     
     def _load_data(self):
         """Load sentiment data from CSV/JSON files."""
@@ -35,7 +40,7 @@ class SentimentDataLoader:
             csv_files = list(self.data_path.glob("*.csv"))
             if csv_files:
                 logger.info(f"Loading sentiment data from {csv_files[0]}")
-                self.data = pd.read_csv(csv_files[0])
+                self.data = load_cached(csv_files[0], pd.read_csv, read_snapshot, self.snapshot_dir)
                 logger.info(f"✅ Loaded {len(self.data)} sentiment records")
             else:
                 logger.warning("⚠️ No CSV files found in sentiment data directory")
@@ -136,6 +141,31 @@ class SentimentDataLoader:
         
         return results.to_dict('records')
     
+    def get_labeled_texts(self) -> Tuple[List[str], List[str]]:
+        """
+        Get text/label pairs for training a classifier.
+        
+        Returns:
+            Tuple of (texts, labels); both empty if either column is missing
+        """
+        if self.data is None or self.data.empty:
+            return [], []
+        
+        text_col = next(
+            (c for c in ['text', 'statement', 'message', 'content'] if c in self.data.columns), None
+        )
+        label_col = next(
+            (c for c in ['sentiment', 'status', 'label', 'emotion'] if c in self.data.columns), None
+        )
+        if not text_col or not label_col:
+            return [], []
+        
+        labeled = self.data[[text_col, label_col]].dropna()
+        return (
+            labeled[text_col].astype(str).tolist(),
+            labeled[label_col].astype(str).str.strip().str.lower().tolist()
+        )
+    
     def get_sentiment_distribution(self) -> Dict[str, int]:
         """Get distribution of sentiment labels."""
         if self.data is None or self.data.empty:
@@ -154,7 +184,11 @@ class SentimentDataLoader:
         return {}
     
     def get_statistics(self) -> Dict[str, Any]:
-        """Get statistics about the dataset."""
+        """Get statistics about the dataset (computed once at load, O(1) to read)."""
+        return self._statistics
+    
+    def _compute_statistics(self) -> Dict[str, Any]:
+        """Summarize the loaded data for ``get_statistics``."""
         if self.data is None or self.data.empty:
             return {
                 "total_records": 0,
@@ -0,0 +1,257 @@
+"""Columnar binary snapshots of the text datasets, for fast startup.
+
+A snapshot is a directory holding one file per column plus a JSON manifest:
+
+- numeric and boolean columns are ``.npy`` arrays
+- string columns are the UTF-8 text of every value concatenated into one
+  ``.utf8`` file, with ``.offsets.npy`` (int64 character offsets, ``n + 1``
+  entries) and, if any value is missing, a ``.nulls.npy`` mask
+- low-cardinality string columns (labels such as diagnosis or gender) store
+  their distinct values that way plus ``.codes.npy`` (int32, -1 = missing)
+
+Loading is one file read and one decode per column instead of a JSON or CSV
+parse per row. Loaders prefer a snapshot when it is newer than its source
+file; build them with::
+    
+    cd src/server
+    python -m data_loaders.snapshot
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+
+SNAPSHOT_VERSION = 1
+
+# String columns with at most this many distinct values per row are dictionary-encoded
+DICTIONARY_MAX_RATIO = 0.5
+
+
+def snapshot_path(source: Path, snapshot_dir: Path) -> Path:
+    """Snapshot directory for a source file (unique per absolute source path)."""
+    source = Path(source)
+    digest = hashlib.sha1(str(source.resolve()).encode("utf-8")).hexdigest()[:10]
+    return Path(snapshot_dir) / f"{source.stem}-{digest}.snapshot"
+
+
+def is_fresh(snapshot: Path, source: Path) -> bool:
+    """Whether ``snapshot`` was written after ``source`` last changed, from a source of the same size."""
+    manifest_path = Path(snapshot) / "manifest.json"
+    if not manifest_path.exists() or not Path(source).exists():
+        return False
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    source_stat = Path(source).stat()
+    return (
+        manifest.get("version") == SNAPSHOT_VERSION
+        and manifest.get("source_size") == source_stat.st_size
+        and manifest_path.stat().st_mtime >= source_stat.st_mtime
+    )
+
+
+def write_snapshot(frame: pd.DataFrame, snapshot: Path, source: Optional[Path] = None) -> Path:
+    """
+    Write a DataFrame as a columnar snapshot (atomically replacing any old one).
+    
+    Args:
+        frame: Data to store; object columns must hold only strings and nulls
+        snapshot: Snapshot directory to create
+        source: File the data was read from (recorded for freshness checks)
+    
+    Returns:
+        The snapshot directory
+    """
+    snapshot = Path(snapshot)
+    staging = snapshot.with_name(snapshot.name + ".tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    
+    try:
+        columns = [_write_column(staging, f"c{i}", name, frame[name]) for i, name in enumerate(frame.columns)]
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "rows": len(frame),
+        "columns": columns,
+        "source": str(source) if source else None,
+        "source_size": Path(source).stat().st_size if source else None,
+    }
+    (staging / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+    
+    shutil.rmtree(snapshot, ignore_errors=True)
+    os.replace(staging, snapshot)
+    return snapshot
+
+
+def _write_column(directory: Path, stem: str, name: str, series: pd.Series) -> Dict[str, str]:
+    """Write one column and return its manifest entry."""
+    if series.dtype.kind in "biuf":
+        np.save(directory / f"{stem}.npy", series.to_numpy())
+        kind = "array"
+    elif series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+        codes, uniques = pd.factorize(series)
+        if len(uniques) <= len(series) * DICTIONARY_MAX_RATIO:
+            _write_strings(directory, stem, pd.Series(uniques, dtype=object))
+            np.save(directory / f"{stem}.codes.npy", codes.astype(np.int32))
+            kind = "dictionary"
+        else:
+            _write_strings(directory, stem, series)
+            kind = "string"
+    else:
+        raise TypeError(f"Column '{name}' has unsupported dtype {series.dtype} for snapshots")
+    return {"name": name, "file": stem, "kind": kind, "dtype": str(series.dtype)}
+
+
+def _write_strings(directory: Path, stem: str, series: pd.Series):
+    """Store a string column as concatenated UTF-8 text plus character offsets."""
+    nulls = series.isna().to_numpy()
+    values = series.to_numpy(dtype=object)
+    texts = []
+    for value, missing in zip(values, nulls):
+        if missing:
+            texts.append("")
+        elif isinstance(value, str):
+            texts.append(value)
+        else:
+            raise TypeError(f"Non-string value {value!r} in a string column")
+    
+    offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+    np.cumsum([len(t) for t in texts], out=offsets[1:])
+    (directory / f"{stem}.utf8").write_bytes("".join(texts).encode("utf-8"))
+    np.save(directory / f"{stem}.offsets.npy", offsets)
+    if nulls.any():
+        np.save(directory / f"{stem}.nulls.npy", nulls)
+
+
+def read_snapshot_columns(snapshot: Path, missing: Any = None) -> Dict[str, Any]:
+    """
+    Read every column of a snapshot.
+    
+    Args:
+        snapshot: Snapshot directory
+        missing: Value substituted for missing strings
+    
+    Returns:
+        Column name -> NumPy array (numeric) or list of strings (text), in order
+    """
+    snapshot = Path(snapshot)
+    manifest = json.loads((snapshot / "manifest.json").read_text(encoding="utf-8"))
+    columns = {}
+    for column in manifest["columns"]:
+        stem = snapshot / column["file"]
+        if column["kind"] == "array":
+            columns[column["name"]] = np.load(f"{stem}.npy")
+            continue
+        
+        text = Path(f"{stem}.utf8").read_bytes().decode("utf-8")
+        bounds = np.load(f"{stem}.offsets.npy").tolist()
+        values = [text[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+        nulls_path = Path(f"{stem}.nulls.npy")
+        if nulls_path.exists():
+            for i in np.flatnonzero(np.load(nulls_path)).tolist():
+                values[i] = missing
+        if column["kind"] == "dictionary":
+            # Code -1 (missing) picks the trailing ``missing`` entry
+            values = np.array(values + [missing], dtype=object)[np.load(f"{stem}.codes.npy")].tolist()
+        columns[column["name"]] = values
+    return columns
+
+
+def read_snapshot(snapshot: Path) -> pd.DataFrame:
+    """Read a snapshot back into a DataFrame (missing strings are NaN, as from ``pd.read_csv``)."""
+    columns = read_snapshot_columns(snapshot, missing=np.nan)
+    dtypes = {
+        column["name"]: column["dtype"]
+        for column in json.loads((Path(snapshot) / "manifest.json").read_text(encoding="utf-8"))["columns"]
+    }
+    return pd.DataFrame({
+        name: values if isinstance(values, np.ndarray) else pd.Series(values, dtype=dtypes[name])
+        for name, values in columns.items()
+    })
+
+
+def read_snapshot_records(snapshot: Path) -> List[Dict[str, Any]]:
+    """Read a snapshot as one dict per row, omitting missing values."""
+    columns = read_snapshot_columns(snapshot)
+    names = list(columns)
+    rows = zip(*(v.tolist() if isinstance(v, np.ndarray) else v for v in columns.values()))
+    if any(None in v for v in columns.values() if not isinstance(v, np.ndarray)):
+        return [{k: v for k, v in zip(names, row) if v is not None} for row in rows]
+    return [dict(zip(names, row)) for row in rows]
+
+
+def load_cached(
+    source: Path,
+    reader: Callable[[Path], Any],
+    snapshot_reader: Callable[[Path], Any],
+    snapshot_dir: Optional[Path]
+) -> Any:
+    """
+    Load a dataset from its snapshot when fresh, otherwise from the source file.
+    
+    Args:
+        source: Dataset file
+        reader: Parses the source file
+        snapshot_reader: Reads the snapshot (``read_snapshot`` or ``read_snapshot_records``)
+        snapshot_dir: Snapshot directory (None disables snapshots)
+    
+    Returns:
+        Whatever ``reader`` / ``snapshot_reader`` return
+    """
+    if snapshot_dir is not None:
+        snapshot = snapshot_path(source, snapshot_dir)
+        if is_fresh(snapshot, source):
+            try:
+                data = snapshot_reader(snapshot)
+                logger.info(f"Loaded {source.name} from snapshot {snapshot}")
+                return data
+            except Exception as e:
+                logger.warning(f"⚠️ Could not read snapshot {snapshot}, parsing source instead: {e}")
+    return reader(source)
+
+
+def build_snapshot(source: Path, reader: Callable[[Path], Any], snapshot_dir: Path) -> Path:
+    """Parse ``source`` with ``reader`` (a DataFrame or iterable of records) and write its snapshot."""
+    data = reader(source)
+    frame = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+    snapshot = write_snapshot(frame, snapshot_path(source, snapshot_dir), source)
+    logger.info(f"✅ Wrote snapshot of {source} to {snapshot}")
+    return snapshot
+
+
+def main():
+    """Build snapshots of every configured dataset."""
+    from config import settings
+    from .counseling_loader import COUNSELING_READERS, counseling_sources
+    
+    sources = [
+        (source, COUNSELING_READERS.get(source.suffix, COUNSELING_READERS[".json"]))
+        for source in counseling_sources(settings.counseling_data_path)
+    ]
+    for directory in (settings.sentiment_data_path, settings.diagnosis_data_path):
+        # Same file the loaders pick: the first CSV in the dataset directory
+        csv_file = next(iter(directory.glob("*.csv")), None) if directory.exists() else None
+        if csv_file is not None:
+            sources.append((csv_file, pd.read_csv))
+    
+    for source, reader in sources:
+        if not Path(source).exists():
+            logger.warning(f"⚠️ Skipping missing dataset {source}")
+            continue
+        build_snapshot(Path(source), reader, settings.snapshot_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ from .system_prompts import (
 )
 from .templates import (
     create_chat_prompt,
+    create_chat_context,
     create_sentiment_prompt,
     create_diagnosis_prompt,
     create_rag_context
@@ -17,6 +18,7 @@ __all__ = [
     "SENTIMENT_ANALYZER_PROMPT",
     "DIAGNOSIS_ASSISTANT_PROMPT",
     "create_chat_prompt",
+    "create_chat_context",
     "create_sentiment_prompt",
     "create_diagnosis_prompt",
     "create_rag_context",
@@ -273,42 +273,84 @@ def get_fallback_recommendations(risk_level: str, concerns: list, mood: int = 5,
         }
     else:
         # LOW RISK - but differentiate between "doing great" vs "just okay"
-        if "missed_medication" in concerns:
-            return {
-                "message": "You're doing great with your mood, sleep, and activity! However, I want to gently remind you about your medication. Even when we're feeling good, consistent medication helps maintain that stability long-term.",
-                "recommendations": [
-                    "Set up a daily medication reminder to help with consistency",
-                    "Consider pairing medication with a daily habit (morning coffee, brushing teeth)",
-                    "Keep up your excellent self-care - you're doing wonderfully!"
-                ]
-            }
-        # Check if things are "just okay" (6 range)
-        elif mood == 6 or "okay_mood" in concerns:
-            return {
-                "message": f"You're feeling 'okay' (mood: {mood}/10), which is valid - but I wonder if there's room to feel better. You're maintaining stability, and that's worth acknowledging. Let's explore some gentle ways to move from 'okay' to 'good.'",
-                "recommendations": [
-                    "Reflect on what might help shift from 'okay' to 'good' - sometimes small changes make a difference",
-                    "Consider whether 'okay' is a plateau or a subtle decline - trust your instincts",
-                    "You deserve to feel better than just 'okay' - explore what that might look like for you"
-                ]
-            }
-        # Check if things are mediocre (5/10 range)
-        elif any(c in concerns for c in ["mediocre_mood", "mediocre_sleep", "low_activity"]) or (mood <= 5 and sleep <= 5):
-            return {
-                "message": "I hear you - things feel kind of middle-of-the-road right now. You're maintaining stability, which is good, but there's room to feel better. Let's look at some gentle ways to boost your wellbeing.",
-                "recommendations": [
-                    "Try adding one small positive activity today - a short walk, calling a friend, or a hobby you enjoy",
-                    "Focus on improving sleep quality - a consistent bedtime routine can make a big difference",
-                    "Consider what might help lift your mood slightly - even small changes can help"
-                ]
-            }
-        # Actually doing well (7+ across the board)
-        else:
-            return {
-                "message": "It's wonderful that you're doing so well! Your mood, sleep, and activity levels show you're taking great care of yourself. Keep up this positive momentum!",
-                "recommendations": [
-                    "Continue your current healthy routines - consistency is key",
-                    "Consider what's working well and how to maintain it",
-                    "Stay connected with your support system"
-                ]
-            }
+        return get_templated_response(concerns, mood, sleep)
+
+
+# Pre-rendered responses for well-understood low-risk check-ins ({mood} is filled in)
+LOW_RISK_TEMPLATES = {
+    "missed_medication": {
+        "message": "You're doing great with your mood, sleep, and activity! However, I want to gently remind you about your medication. Even when we're feeling good, consistent medication helps maintain that stability long-term.",
+        "recommendations": [
+            "Set up a daily medication reminder to help with consistency",
+            "Consider pairing medication with a daily habit (morning coffee, brushing teeth)",
+            "Keep up your excellent self-care - you're doing wonderfully!"
+        ]
+    },
+    "okay_mood": {
+        "message": "You're feeling 'okay' (mood: {mood}/10), which is valid - but I wonder if there's room to feel better. You're maintaining stability, and that's worth acknowledging. Let's explore some gentle ways to move from 'okay' to 'good.'",
+        "recommendations": [
+            "Reflect on what might help shift from 'okay' to 'good' - sometimes small changes make a difference",
+            "Consider whether 'okay' is a plateau or a subtle decline - trust your instincts",
+            "You deserve to feel better than just 'okay' - explore what that might look like for you"
+        ]
+    },
+    "mediocre": {
+        "message": "I hear you - things feel kind of middle-of-the-road right now. You're maintaining stability, which is good, but there's room to feel better. Let's look at some gentle ways to boost your wellbeing.",
+        "recommendations": [
+            "Try adding one small positive activity today - a short walk, calling a friend, or a hobby you enjoy",
+            "Focus on improving sleep quality - a consistent bedtime routine can make a big difference",
+            "Consider what might help lift your mood slightly - even small changes can help"
+        ]
+    },
+    "doing_well": {
+        "message": "It's wonderful that you're doing so well! Your mood, sleep, and activity levels show you're taking great care of yourself. Keep up this positive momentum!",
+        "recommendations": [
+            "Continue your current healthy routines - consistency is key",
+            "Consider what's working well and how to maintain it",
+            "Stay connected with your support system"
+        ]
+    },
+}
+
+
+def get_low_risk_pattern(concerns: list, mood: int = 5, sleep: int = 5) -> str:
+    """
+    Classify a low-risk check-in into one of the LOW_RISK_TEMPLATES patterns.
+    
+    Args:
+        concerns: List of identified concerns
+        mood: Mood rating
+        sleep: Sleep quality
+    
+    Returns:
+        Template key
+    """
+    if "missed_medication" in concerns:
+        return "missed_medication"
+    # Check if things are "just okay" (6 range)
+    if mood == 6 or "okay_mood" in concerns:
+        return "okay_mood"
+    # Check if things are mediocre (5/10 range)
+    if any(c in concerns for c in ["mediocre_mood", "mediocre_sleep", "low_activity"]) or (mood <= 5 and sleep <= 5):
+        return "mediocre"
+    # Actually doing well (7+ across the board)
+    return "doing_well"
+
+
+def get_templated_response(concerns: list, mood: int = 5, sleep: int = 5) -> dict:
+    """
+    Get the pre-rendered response for a low-risk check-in.
+    
+    Args:
+        concerns: List of identified concerns
+        mood: Mood rating
+        sleep: Sleep quality
+    
+    Returns:
+        Dictionary with message and recommendations (a copy, safe to modify)
+    """
+    template = LOW_RISK_TEMPLATES[get_low_risk_pattern(concerns, mood, sleep)]
+    return {
+        "message": template["message"].format(mood=mood),
+        "recommendations": list(template["recommendations"])
+    }
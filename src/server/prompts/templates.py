@@ -6,7 +6,8 @@ from typing import List, Dict, Any
 def create_chat_prompt(
     user_message: str, 
     context_examples: List[Dict[str, str]], 
-    conversation_history: List[Dict[str, str]] = None
+    conversation_history: List[Dict[str, str]] = None,
+    include_context: bool = True
 ) -> str:
     """
     Create a chat prompt with context from counseling dataset.
@@ -15,7 +16,9 @@ def create_chat_prompt(
         user_message: The user's current message
         context_examples: Relevant examples from counseling dataset
         conversation_history: Previous messages in this session
-        
+        include_context: Whether to inline the context examples; pass False
+            when they are sent as a separate block (see create_chat_context)
+    
     Returns:
         Formatted prompt string
     """
@@ -31,14 +34,8 @@ def create_chat_prompt(
         prompt_parts.append("")
     
     # Add relevant context examples
-    if context_examples:
-        prompt_parts.append("**Relevant Context from Counseling Data:**")
-        for i, example in enumerate(context_examples[:3], 1):  # Top 3 examples
-            context = example.get("Context", "")
-            response = example.get("Response", "")
-            prompt_parts.append(f"\nExample {i}:")
-            prompt_parts.append(f"User: {context[:200]}...")
-            prompt_parts.append(f"Counselor: {response[:200]}...")
+    if context_examples and include_context:
+        prompt_parts.append(create_chat_context(context_examples))
         prompt_parts.append("")
     
     # Add current user message
@@ -55,6 +52,26 @@ def create_chat_prompt(
     return "\n".join(prompt_parts)
 
 
+def create_chat_context(context_examples: List[Dict[str, str]]) -> str:
+    """
+    Format retrieved counseling examples for a chat prompt.
+    
+    Args:
+        context_examples: Relevant examples from counseling dataset
+    
+    Returns:
+        Formatted context section
+    """
+    context_parts = ["**Relevant Context from Counseling Data:**"]
+    for i, example in enumerate(context_examples[:3], 1):  # Top 3 examples
+        context = example.get("Context", "")
+        response = example.get("Response", "")
+        context_parts.append(f"\nExample {i}:")
+        context_parts.append(f"User: {context[:200]}...")
+        context_parts.append(f"Counselor: {response[:200]}...")
+    return "\n".join(context_parts)
+
+
 def create_sentiment_prompt(text: str, context: str = None) -> str:
     """
     Create a sentiment analysis prompt.
@@ -126,9 +143,15 @@ def create_diagnosis_prompt(
     
     if similar_cases:
         for i, case in enumerate(similar_cases[:3], 1):
+            approaches = ", ".join(
+                str(case[key]) for key in ("treatment", "medication") if case.get(key)
+            )
             prompt_parts.append(f"\nCase {i}:")
-            prompt_parts.append(f"  Pattern: {case.get('pattern', 'N/A')}")
-            prompt_parts.append(f"  Common Approaches: {case.get('approaches', 'N/A')}")
+            prompt_parts.append(f"  Condition: {case.get('condition', 'N/A')}")
+            prompt_parts.append(f"  Pattern: {case.get('symptoms', 'N/A')}")
+            prompt_parts.append(f"  Common Approaches: {approaches or 'N/A'}")
+            if case.get("outcome"):
+                prompt_parts.append(f"  Outcome: {case['outcome']}")
     else:
         prompt_parts.append("(No directly similar cases found in dataset)")
     
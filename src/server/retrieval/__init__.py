@@ -0,0 +1,53 @@
+"""Retrieval backends for MindPulse RAG."""
+
+from typing import Any
+from .base import VectorIndex, normalize_rows, top_k_indices
+from .exact import ExactIndex
+from .ivf import IVFIndex
+from .hnsw import HNSWIndex
+from .bm25 import BM25Index
+from .fusion import reciprocal_rank_fusion
+from .partitioned import PartitionedIndex
+
+VECTOR_INDEXES = {
+    ExactIndex.name: ExactIndex,
+    IVFIndex.name: IVFIndex,
+    HNSWIndex.name: HNSWIndex,
+}
+
+
+def create_vector_index(backend: str = "exact", **options: Any) -> VectorIndex:
+    """
+    Create a vector index by backend name.
+    
+    Args:
+        backend: One of ``exact``, ``ivf`` or ``hnsw``
+        **options: Backend-specific constructor arguments
+        
+    Returns:
+        Unbuilt vector index
+        
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    try:
+        index_cls = VECTOR_INDEXES[backend.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown retrieval backend '{backend}'. Choose from: {', '.join(VECTOR_INDEXES)}"
+        )
+    return index_cls(**options)
+
+
+__all__ = [
+    "VectorIndex",
+    "ExactIndex",
+    "IVFIndex",
+    "HNSWIndex",
+    "PartitionedIndex",
+    "BM25Index",
+    "create_vector_index",
+    "reciprocal_rank_fusion",
+    "normalize_rows",
+    "top_k_indices",
+]
@@ -0,0 +1,84 @@
+"""Vector index interface shared by the retrieval backends."""
+
+from abc import ABC, abstractmethod
+from typing import Tuple
+import numpy as np
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize the rows of a matrix as float32 so cosine similarity is a dot product.
+    
+    Args:
+        matrix: 2-D array (or 1-D vector) of embeddings
+        
+    Returns:
+        Normalized float32 copy; all-zero rows stay zero
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Get the indices of the ``k`` highest scores, best first.
+    
+    Uses ``argpartition`` so only the selected ``k`` scores are sorted.
+    
+    Args:
+        scores: 1-D array of scores
+        k: Number of indices to return
+        
+    Returns:
+        Indices of the top scores in descending score order
+    """
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < scores.shape[0]:
+        candidates = np.argpartition(scores, -k)[-k:]
+    else:
+        candidates = np.arange(scores.shape[0])
+    return candidates[np.argsort(scores[candidates])[::-1]]
+
+
+class VectorIndex(ABC):
+    """
+    Nearest-neighbour index over L2-normalized embeddings (inner product = cosine).
+    
+    Backends are built once from the corpus matrix and then answer top-k
+    queries; row indices returned by ``search`` refer to the build matrix.
+    """
+    
+    name: str = "base"
+    
+    @abstractmethod
+    def build(self, vectors: np.ndarray) -> "VectorIndex":
+        """
+        Index a corpus of normalized embeddings.
+        
+        Args:
+            vectors: Matrix with one L2-normalized float32 row per document
+            
+        Returns:
+            The index itself, for chaining
+        """
+    
+    @abstractmethod
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the rows most similar to a normalized query vector.
+        
+        Args:
+            query: L2-normalized query embedding
+            k: Number of results
+            
+        Returns:
+            Tuple of (row indices, cosine scores), best first
+        """
+    
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of indexed rows."""
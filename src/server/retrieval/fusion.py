@@ -0,0 +1,44 @@
+"""Rank fusion for combining lexical and dense retrieval results."""
+
+from typing import Optional, Sequence, Tuple
+import numpy as np
+
+from .base import top_k_indices
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[np.ndarray],
+    k: int,
+    rrf_k: int = 60,
+    weights: Optional[Sequence[float]] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fuse ranked result lists with (weighted) reciprocal rank fusion.
+    
+    Each document scores ``sum(weight / (rrf_k + rank))`` over the lists it
+    appears in (rank starting at 1). RRF only uses ranks, so BM25 scores and
+    cosine similarities never need to be put on a common scale.
+    
+    Args:
+        rankings: Document id arrays, each ordered best first
+        k: Number of fused results to return
+        rrf_k: Rank smoothing constant (60 in the original RRF paper)
+        weights: Optional per-list weights (default 1.0 each)
+        
+    Returns:
+        Tuple of (document ids, fused scores), best first
+    """
+    weights = weights if weights is not None else [1.0] * len(rankings)
+    ids = [np.asarray(r, dtype=np.int64) for r in rankings if len(r)]
+    if not ids:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    
+    contributions = np.concatenate([
+        w / (rrf_k + np.arange(1, len(r) + 1, dtype=np.float64))
+        for r, w in zip(rankings, weights) if len(r)
+    ])
+    candidates, inverse = np.unique(np.concatenate(ids), return_inverse=True)
+    scores = np.bincount(inverse, weights=contributions)
+    
+    best = top_k_indices(scores, k)
+    return candidates[best], scores[best]
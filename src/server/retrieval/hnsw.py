@@ -0,0 +1,62 @@
+"""HNSW approximate nearest-neighbour backend (optional, requires faiss-cpu)."""
+
+from typing import Tuple
+import numpy as np
+from loguru import logger
+
+from .base import VectorIndex
+
+
+class HNSWIndex(VectorIndex):
+    """Hierarchical navigable small-world graph index backed by ``faiss``."""
+    
+    name = "hnsw"
+    
+    def __init__(self, m: int = 32, ef_construction: int = 200, ef_search: int = 64):
+        """
+        Initialize the HNSW index.
+        
+        Args:
+            m: Graph neighbours per node
+            ef_construction: Candidate list size while building
+            ef_search: Candidate list size while searching (recall/latency trade-off)
+            
+        Raises:
+            ImportError: If faiss is not installed
+        """
+        try:
+            import faiss
+        except ImportError as e:
+            raise ImportError(
+                "The 'hnsw' retrieval backend requires faiss-cpu. Install it with: pip install faiss-cpu"
+            ) from e
+        
+        self._faiss = faiss
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.index = None
+    
+    def build(self, vectors: np.ndarray) -> "HNSWIndex":
+        """Insert every row into a new inner-product HNSW graph."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.index = self._faiss.IndexHNSWFlat(
+            vectors.shape[1], self.m, self._faiss.METRIC_INNER_PRODUCT
+        )
+        self.index.hnsw.efConstruction = self.ef_construction
+        self.index.hnsw.efSearch = self.ef_search
+        self.index.add(vectors)
+        logger.info(f"✅ Built HNSW index: {vectors.shape[0]} rows (M={self.m}, efSearch={self.ef_search})")
+        return self
+    
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Walk the graph from the entry point to the ``k`` closest rows."""
+        k = min(k, len(self))
+        scores, indices = self.index.search(
+            np.ascontiguousarray(query.reshape(1, -1), dtype=np.float32), k
+        )
+        valid = indices[0] >= 0
+        return indices[0][valid].astype(np.int64), scores[0][valid]
+    
+    def __len__(self) -> int:
+        return 0 if self.index is None else int(self.index.ntotal)
@@ -0,0 +1,162 @@
+"""Topic-partitioned vector index with a keyword + centroid query router."""
+
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from loguru import logger
+
+from .base import VectorIndex, normalize_rows, top_k_indices
+
+
+OTHER_PARTITION = "other"
+
+
+class PartitionedIndex(VectorIndex):
+    """
+    One sub-index per topic, searched only for the topics a query is routed to.
+    
+    Rows are grouped by their topic labels (a row with several topics sits in
+    each of their partitions). Topics with fewer than ``min_partition_size``
+    rows, and unlabelled rows, share the ``other`` partition. A query is routed
+    to the topics it names (keyword routing on word stems) and then to the
+    partitions whose centroids are closest to its embedding, up to
+    ``max_partitions``. The closest partition always gets a slot, so with
+    ``max_partitions=1`` keyword routing never overrides it. Query cost is ``partitions + rows in routed partitions``
+    dot products (less with an approximate sub-index backend), so it grows
+    with partition size rather than corpus size.
+    """
+    
+    name = "partitioned"
+    
+    def __init__(
+        self,
+        labels: Sequence[Sequence[str]],
+        backend: str = "exact",
+        index_options: Optional[Dict[str, Any]] = None,
+        max_partitions: int = 2,
+        min_partition_size: int = 20
+    ):
+        """
+        Initialize the partitioned index.
+        
+        Args:
+            labels: Topic labels of each corpus row, in row order
+            backend: Vector index backend used for every partition
+            index_options: Backend-specific index options
+            max_partitions: Partitions searched per query
+            min_partition_size: Smaller topics are merged into ``other``
+        """
+        self.labels = [list(row_labels) for row_labels in labels]
+        self.backend = backend
+        self.index_options = index_options or {}
+        self.max_partitions = max_partitions
+        self.min_partition_size = min_partition_size
+        self.topics: List[str] = []
+        self.rows: Dict[str, np.ndarray] = {}
+        self.partitions: Dict[str, VectorIndex] = {}
+        self.centroids: Optional[np.ndarray] = None
+        self._topic_patterns: Dict[str, re.Pattern] = {}
+        self._size = 0
+    
+    def build(self, vectors: np.ndarray) -> "PartitionedIndex":
+        """Group rows by topic, then build each partition's sub-index and centroid."""
+        from . import create_vector_index
+        
+        if len(self.labels) != vectors.shape[0]:
+            raise ValueError(f"Got {len(self.labels)} label rows for {vectors.shape[0]} vectors")
+        
+        counts: Dict[str, int] = {}
+        for row_labels in self.labels:
+            for topic in row_labels:
+                counts[topic] = counts.get(topic, 0) + 1
+        
+        members: Dict[str, List[int]] = {}
+        for i, row_labels in enumerate(self.labels):
+            topics = [t for t in row_labels if counts[t] >= self.min_partition_size] or [OTHER_PARTITION]
+            for topic in topics:
+                members.setdefault(topic, []).append(i)
+        
+        self.topics = sorted(members)
+        self.rows = {topic: np.array(members[topic], dtype=np.int64) for topic in self.topics}
+        self.partitions = {
+            topic: create_vector_index(self.backend, **self.index_options).build(vectors[rows])
+            for topic, rows in self.rows.items()
+        }
+        self.centroids = normalize_rows(np.stack([
+            np.asarray(vectors[self.rows[topic]]).mean(axis=0) for topic in self.topics
+        ]))
+        self._topic_patterns = {
+            topic: self._topic_pattern(topic) for topic in self.topics if topic != OTHER_PARTITION
+        }
+        self._size = vectors.shape[0]
+        
+        largest = max(len(rows) for rows in self.rows.values())
+        logger.info(
+            f"✅ Built topic-partitioned index: {self._size} rows in {len(self.topics)} partitions "
+            f"(largest {largest}, {self.max_partitions} searched per query)"
+        )
+        return self
+    
+    @staticmethod
+    def _topic_pattern(topic: str) -> re.Pattern:
+        """Match text naming every word of a topic slug (``grief-and-loss`` -> grief ... loss)."""
+        # Word stems, so "anxious" routes to anxiety and "parents" to parenting
+        stems = [word[:4] for word in topic.split("-") if len(word) > 3] or [topic]
+        return re.compile("".join(rf"(?=.*\b{re.escape(stem)})" for stem in stems), re.IGNORECASE | re.DOTALL)
+    
+    def route(self, query: np.ndarray, text: Optional[str] = None) -> List[str]:
+        """
+        Pick the partitions to search for a query.
+        
+        Args:
+            query: L2-normalized query embedding
+            text: Query text; topics it names are searched first
+        
+        Returns:
+            Up to ``max_partitions`` topics (named topics first), always
+            including the partition with the closest centroid
+        """
+        named = [t for t, pattern in self._topic_patterns.items() if text and pattern.match(text)]
+        closest = [self.topics[i] for i in top_k_indices(self.centroids @ query, len(self.topics))]
+        # Stem matches can misfire, so the closest centroid always keeps a slot
+        routed = named[:max(0, self.max_partitions - 1)]
+        routed += [t for t in closest if t not in routed][:self.max_partitions - len(routed)]
+        return routed
+    
+    def search(
+        self, query: np.ndarray, k: int, topics: Optional[Sequence[str]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Search the routed partitions and merge their results.
+        
+        Args:
+            query: L2-normalized query embedding
+            k: Number of results
+            topics: Partitions to search (default: ``route(query)``)
+        
+        Returns:
+            Tuple of (corpus row indices, cosine scores), best first
+        """
+        if topics is None:
+            topics = self.route(query)
+        
+        candidate_rows = []
+        candidate_scores = []
+        for topic in topics:
+            if topic not in self.partitions:
+                continue
+            local, scores = self.partitions[topic].search(query, k)
+            candidate_rows.append(self.rows[topic][local])
+            candidate_scores.append(scores)
+        
+        if not candidate_rows:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        
+        # A row in several searched partitions is found once per partition
+        rows, first = np.unique(np.concatenate(candidate_rows), return_index=True)
+        scores = np.concatenate(candidate_scores)[first]
+        best = top_k_indices(scores, k)
+        return rows[best], scores[best]
+    
+    def __len__(self) -> int:
+        return self._size
@@ -0,0 +1,45 @@
+"""Conversation session storage for MindPulse."""
+
+from typing import Any
+from .base import SessionStore
+from .memory import InMemorySessionStore
+from .sqlite import SQLiteSessionStore
+from .redis import RedisSessionStore
+
+SESSION_STORES = {
+    InMemorySessionStore.name: InMemorySessionStore,
+    SQLiteSessionStore.name: SQLiteSessionStore,
+    RedisSessionStore.name: RedisSessionStore,
+}
+
+
+def create_session_store(backend: str = "memory", **options: Any) -> SessionStore:
+    """
+    Create a session store by backend name.
+    
+    Args:
+        backend: One of ``memory``, ``sqlite`` or ``redis``
+        **options: Backend-specific constructor arguments
+    
+    Returns:
+        Session store
+    
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    try:
+        store_cls = SESSION_STORES[backend.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown session backend '{backend}'. Choose from: {', '.join(SESSION_STORES)}"
+        )
+    return store_cls(**options)
+
+
+__all__ = [
+    "SessionStore",
+    "InMemorySessionStore",
+    "SQLiteSessionStore",
+    "RedisSessionStore",
+    "create_session_store",
+]
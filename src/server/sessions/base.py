@@ -0,0 +1,78 @@
+"""Session store interface shared by the session backends."""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+
+
+Message = Dict[str, str]
+
+
+class SessionStore(ABC):
+    """
+    Mapping of session ID to the most recent conversation messages.
+    
+    Implementations bound each history to ``max_messages``, expire sessions
+    idle for longer than ``ttl_seconds`` and may cap the number of live
+    sessions, evicting the least recently used.
+    """
+    
+    name: str = "base"
+    
+    @abstractmethod
+    def get(self, session_id: str) -> List[Message]:
+        """
+        Get a session's messages, refreshing its idle timer.
+        
+        Args:
+            session_id: Session ID
+        
+        Returns:
+            The session's messages (empty if unknown or expired)
+        """
+    
+    @abstractmethod
+    def append(self, session_id: str, messages: List[Message]):
+        """
+        Append messages to a session, creating it if needed.
+        
+        Args:
+            session_id: Session ID
+            messages: Messages to add, oldest first
+        """
+    
+    @abstractmethod
+    def delete(self, session_id: str) -> bool:
+        """
+        Remove a session.
+        
+        Args:
+            session_id: Session ID
+        
+        Returns:
+            True if the session existed
+        """
+    
+    @abstractmethod
+    def sweep(self) -> int:
+        """
+        Remove every expired session.
+        
+        Returns:
+            Number of sessions removed
+        """
+    
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of live sessions."""
+    
+    def __contains__(self, session_id: str) -> bool:
+        return bool(self.get(session_id))
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get store counters.
+        
+        Returns:
+            Backend name and live session count
+        """
+        return {"backend": self.name, "active_sessions": len(self)}
@@ -0,0 +1,192 @@
+"""In-process conversation session store with LRU capacity and idle-TTL eviction."""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from loguru import logger
+
+from .base import Message, SessionStore
+
+
+def _content_bytes(messages: List[Message]) -> int:
+    """Approximate memory held by the messages' text."""
+    return sum(sys.getsizeof(m["content"]) for m in messages)
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Bounded per-process mapping of session ID to recent conversation messages.
+    
+    Sessions are kept in least-recently-used order. Adding a session beyond
+    ``max_sessions`` evicts the least recently used one, and a session idle for
+    longer than ``ttl_seconds`` expires, either lazily when it is next accessed
+    or during :meth:`sweep`.
+    """
+    
+    name = "memory"
+    
+    def __init__(
+        self,
+        max_sessions: int = 10000,
+        ttl_seconds: float = 1800,
+        max_messages: int = 10,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the store.
+        
+        Args:
+            max_sessions: Maximum number of live sessions (0 = unbounded)
+            ttl_seconds: Idle time after which a session expires (0 = never)
+            max_messages: Messages retained per session (oldest dropped first)
+            clock: Monotonic time source, injectable for tests
+        """
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_messages = max_messages
+        self._clock = clock
+        self._lock = threading.Lock()
+        # session_id -> (last access time, messages)
+        self._sessions: "OrderedDict[str, Tuple[float, List[Message]]]" = OrderedDict()
+        self.evicted = 0
+        self.expired = 0
+        # Running totals over every live session, so stats() never walks the store
+        self._message_count = 0
+        self._memory_bytes = 0
+    
+    def _is_expired(self, last_access: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - last_access > self.ttl_seconds
+    
+    def _release(self, history: List[Message]):
+        """Subtract a removed session's messages from the running totals (lock held)."""
+        self._message_count -= len(history)
+        self._memory_bytes -= _content_bytes(history)
+    
+    def _touch(self, session_id: str, now: float) -> Optional[List[Message]]:
+        """Return a live session's messages and mark it most recently used (lock held)."""
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        if self._is_expired(entry[0], now):
+            del self._sessions[session_id]
+            self._release(entry[1])
+            self.expired += 1
+            return None
+        self._sessions[session_id] = (now, entry[1])
+        self._sessions.move_to_end(session_id)
+        return entry[1]
+    
+    def get(self, session_id: str) -> List[Message]:
+        """
+        Get a session's messages.
+        
+        Args:
+            session_id: Session ID
+        
+        Returns:
+            Copy of the session's messages (empty if unknown or expired)
+        """
+        with self._lock:
+            messages = self._touch(session_id, self._clock())
+            return list(messages) if messages else []
+    
+    def append(self, session_id: str, messages: List[Message]):
+        """
+        Append messages to a session, creating it if needed.
+        
+        Args:
+            session_id: Session ID
+            messages: Messages to add, oldest first
+        """
+        with self._lock:
+            now = self._clock()
+            history = self._touch(session_id, now)
+            if history is None:
+                history = []
+                self._sessions[session_id] = (now, history)
+                self._evict_over_capacity()
+            history.extend(messages)
+            self._message_count += len(messages)
+            self._memory_bytes += _content_bytes(messages)
+            if self.max_messages and len(history) > self.max_messages:
+                self._release(history[:-self.max_messages])
+                del history[:-self.max_messages]
+    
+    def _evict_over_capacity(self):
+        """Drop least recently used sessions beyond ``max_sessions`` (lock held)."""
+        while self.max_sessions and len(self._sessions) > self.max_sessions:
+            session_id, (_, history) = self._sessions.popitem(last=False)
+            self._release(history)
+            self.evicted += 1
+            logger.debug(f"Evicted least recently used session: {session_id}")
+    
+    def delete(self, session_id: str) -> bool:
+        """
+        Remove a session.
+        
+        Args:
+            session_id: Session ID
+        
+        Returns:
+            True if the session existed
+        """
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is None:
+                return False
+            self._release(entry[1])
+            return True
+    
+    def sweep(self) -> int:
+        """
+        Remove every expired session.
+        
+        Returns:
+            Number of sessions removed
+        """
+        if self.ttl_seconds <= 0:
+            return 0
+        with self._lock:
+            now = self._clock()
+            removed = 0
+            # Oldest access first, so stop at the first live session
+            while self._sessions:
+                session_id, (last_access, history) = next(iter(self._sessions.items()))
+                if not self._is_expired(last_access, now):
+                    break
+                del self._sessions[session_id]
+                self._release(history)
+                removed += 1
+            self.expired += removed
+        if removed:
+            logger.info(f"Expired {removed} idle sessions")
+        return removed
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
+    
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return self._touch(session_id, self._clock()) is not None
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get store counters.
+        
+        Returns:
+            Live session count, limits, eviction counters and approximate
+            memory held by message text
+        """
+        with self._lock:
+            return {
+                "backend": self.name,
+                "active_sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "ttl_seconds": self.ttl_seconds,
+                "messages": self._message_count,
+                "approx_memory_bytes": self._memory_bytes,
+                "evicted_lru": self.evicted,
+                "expired_ttl": self.expired,
+            }
@@ -0,0 +1,159 @@
+"""Redis session store shared across hosts (optional, requires redis)."""
+
+import json
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional
+from loguru import logger
+
+from .base import Message, SessionStore
+
+
+# Read a session and, only if it still exists, refresh its expiry and recency
+# atomically (an expired session must not be re-added to the index)
+GET_SCRIPT = """
+local messages = redis.call('LRANGE', KEYS[1], 0, -1)
+if #messages == 0 then
+    redis.call('ZREM', KEYS[2], ARGV[3])
+    return messages
+end
+if tonumber(ARGV[1]) > 0 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[3])
+return messages
+"""
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Session store on a Redis (or Redis-protocol compatible) server.
+    
+    Each session is a Redis list of JSON messages whose key expiry enforces
+    the idle TTL natively. A sorted set of session IDs scored by last access
+    time tracks recency so the least recently used sessions can be evicted
+    beyond ``max_sessions`` and expired IDs swept from the set.
+    """
+    
+    name = "redis"
+    
+    def __init__(
+        self,
+        client: Optional[Any] = None,
+        url: str = "redis://localhost:6379/0",
+        prefix: str = "mindpulse:session:",
+        max_sessions: int = 10000,
+        ttl_seconds: float = 1800,
+        max_messages: int = 10,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Connect to the session server.
+        
+        Args:
+            client: Existing redis-py compatible client; created from ``url`` if omitted
+            url: Server URL used when no client is given
+            prefix: Key prefix for session lists (the recency set is ``<prefix>index``)
+            max_sessions: Maximum number of live sessions (0 = unbounded)
+            ttl_seconds: Idle time after which a session expires (0 = never)
+            max_messages: Messages retained per session (oldest dropped first)
+            clock: Wall-clock time source, injectable for tests
+        
+        Raises:
+            ImportError: If no client is given and redis is not installed
+        """
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise ImportError(
+                    "The 'redis' session backend requires redis. Install it with: pip install redis"
+                ) from e
+            client = redis.Redis.from_url(url, decode_responses=True)
+        
+        self.client = client
+        self.prefix = prefix
+        self.index_key = f"{prefix}index"
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_messages = max_messages
+        self._clock = clock
+        self.evicted = 0
+        self.expired = 0
+        self._get_script = client.register_script(GET_SCRIPT)
+        logger.info(f"✅ Redis session store ({prefix}*)")
+    
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}"
+    
+    @staticmethod
+    def _decode(value: Any) -> str:
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+    
+    def _refresh(self, pipe, session_id: str, now: float):
+        """Queue the idle-timer refresh for a session on a pipeline."""
+        if self.ttl_seconds > 0:
+            pipe.expire(self._key(session_id), math.ceil(self.ttl_seconds))
+        pipe.zadd(self.index_key, {session_id: now})
+    
+    def get(self, session_id: str) -> List[Message]:
+        """Read the session list and refresh its expiry in one atomic round trip."""
+        raw = self._get_script(
+            keys=[self._key(session_id), self.index_key],
+            args=[math.ceil(self.ttl_seconds) if self.ttl_seconds > 0 else 0, self._clock(), session_id]
+        )
+        return [json.loads(self._decode(m)) for m in raw]
+    
+    def append(self, session_id: str, messages: List[Message]):
+        """Push, trim, refresh and count in a single pipeline, then evict if over capacity."""
+        key = self._key(session_id)
+        pipe = self.client.pipeline()
+        pipe.rpush(key, *[json.dumps(m) for m in messages])
+        if self.max_messages:
+            pipe.ltrim(key, -self.max_messages, -1)
+        self._refresh(pipe, session_id, self._clock())
+        pipe.zcard(self.index_key)
+        live = pipe.execute()[-1]
+        
+        excess = live - self.max_sessions if self.max_sessions else 0
+        if excess > 0:
+            oldest = [self._decode(m) for m, _ in self.client.zpopmin(self.index_key, excess)]
+            self.client.delete(*[self._key(s) for s in oldest])
+            self.evicted += len(oldest)
+    
+    def delete(self, session_id: str) -> bool:
+        """Delete the session list and its recency entry."""
+        pipe = self.client.pipeline()
+        pipe.delete(self._key(session_id))
+        pipe.zrem(self.index_key, session_id)
+        return pipe.execute()[0] > 0
+    
+    def sweep(self) -> int:
+        """Drop recency entries for sessions whose keys have expired."""
+        if self.ttl_seconds <= 0:
+            return 0
+        stale = self.client.zrangebyscore(self.index_key, "-inf", self._clock() - self.ttl_seconds)
+        if not stale:
+            return 0
+        stale = [self._decode(s) for s in stale]
+        pipe = self.client.pipeline()
+        pipe.zrem(self.index_key, *stale)
+        pipe.delete(*[self._key(s) for s in stale])
+        pipe.execute()
+        self.expired += len(stale)
+        logger.info(f"Expired {len(stale)} idle sessions")
+        return len(stale)
+    
+    def __len__(self) -> int:
+        return self.client.zcard(self.index_key)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Add limits and this process's eviction counters to the base stats."""
+        stats = super().stats()
+        stats.update({
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl_seconds,
+            "evicted_lru": self.evicted,
+            "expired_ttl": self.expired,
+        })
+        return stats
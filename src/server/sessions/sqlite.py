@@ -0,0 +1,164 @@
+"""SQLite session store shared by every worker process on one host."""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Union
+from loguru import logger
+
+from .base import Message, SessionStore
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Session store in a SQLite database file opened in WAL mode.
+    
+    WAL lets every uvicorn worker read concurrently while one writes, so
+    workers on the same host share sessions without sticky routing. Each
+    session is one row holding its messages as JSON and its last access time
+    (wall clock, so it is comparable across processes).
+    """
+    
+    name = "sqlite"
+    
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_sessions: int = 10000,
+        ttl_seconds: float = 1800,
+        max_messages: int = 10,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Open (creating if needed) the session database.
+        
+        Args:
+            path: Database file path
+            max_sessions: Maximum number of live sessions (0 = unbounded)
+            ttl_seconds: Idle time after which a session expires (0 = never)
+            max_messages: Messages retained per session (oldest dropped first)
+            clock: Wall-clock time source, injectable for tests
+        """
+        self.path = Path(path)
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_messages = max_messages
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.evicted = 0
+        self.expired = 0
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, messages TEXT NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_last_access ON sessions (last_access)")
+        logger.info(f"✅ SQLite session store at {self.path}")
+    
+    def _cutoff(self, now: float) -> float:
+        """Last-access time at or before which a session has expired."""
+        return now - self.ttl_seconds if self.ttl_seconds > 0 else float("-inf")
+    
+    def get(self, session_id: str) -> List[Message]:
+        """Read the row, deleting it if expired, and bump its last access time."""
+        with self._lock:
+            now = self._clock()
+            row = self._conn.execute(
+                "SELECT messages, last_access FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                return []
+            if row[1] < self._cutoff(now):
+                self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+                self.expired += 1
+                return []
+            self._conn.execute(
+                "UPDATE sessions SET last_access = ? WHERE session_id = ?", (now, session_id)
+            )
+            return json.loads(row[0])
+    
+    def append(self, session_id: str, messages: List[Message]):
+        """Read-modify-write the row in one write transaction, then evict if over capacity."""
+        with self._lock:
+            now = self._clock()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT messages, last_access FROM sessions WHERE session_id = ?", (session_id,)
+                ).fetchone()
+                is_new = row is None or row[1] < self._cutoff(now)
+                history = [] if is_new else json.loads(row[0])
+                history.extend(messages)
+                if self.max_messages:
+                    history = history[-self.max_messages:]
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sessions (session_id, messages, last_access) VALUES (?, ?, ?)",
+                    (session_id, json.dumps(history), now)
+                )
+                if is_new and self.max_sessions:
+                    self._evict_over_capacity()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+    
+    def _evict_over_capacity(self):
+        """Drop least recently used sessions beyond ``max_sessions`` (in a transaction)."""
+        count = self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        excess = count - self.max_sessions
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM sessions WHERE session_id IN "
+                "(SELECT session_id FROM sessions ORDER BY last_access LIMIT ?)",
+                (excess,)
+            )
+            self.evicted += excess
+    
+    def delete(self, session_id: str) -> bool:
+        """Delete the session row."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            return cursor.rowcount > 0
+    
+    def sweep(self) -> int:
+        """Delete every row idle beyond the TTL."""
+        if self.ttl_seconds <= 0:
+            return 0
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM sessions WHERE last_access < ?", (self._cutoff(self._clock()),)
+            )
+            removed = cursor.rowcount
+            self.expired += removed
+        if removed:
+            logger.info(f"Expired {removed} idle sessions")
+        return removed
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+    
+    def stats(self) -> Dict[str, Any]:
+        """Add limits, file size and this process's eviction counters to the base stats."""
+        stats = super().stats()
+        stats.update({
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl_seconds,
+            "database_bytes": self.path.stat().st_size if self.path.exists() else 0,
+            "evicted_lru": self.evicted,
+            "expired_ttl": self.expired,
+        })
+        return stats
+    
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -3,8 +3,17 @@ Test suite for MindPulse backend.
 
 Contains tests for:
 - API endpoints (test_api.py)
-- Survey analysis (test_survey.py, test_all_scenarios.py, test_critical_survey.py)
-- SMS/Provider alerts (test_sms_detection.py)
+- Survey analysis (test_survey.py, test_all_scenarios.py, test_critical_survey.py, test_survey_batch.py)
+- SMS/Provider alerts (test_sms_detection.py, test_alerts.py)
+- Survey risk engine (test_risk_engine.py)
+- Counseling retrieval and embedding cache (test_counseling_loader.py)
+- Columnar dataset snapshots (test_snapshot.py)
+- Conversation session stores (test_sessions.py)
+- Claude usage metrics (test_metrics.py)
+- Sentiment response cache (test_response_cache.py)
+- Local sentiment classifier (test_local_sentiment.py)
+- Liveness/readiness probes (test_health_probes.py)
+- Async Claude agent and chat streaming (test_async_agent.py)
 - Server startup (test_startup.py)
 - Live server testing (test_live.py)
 """
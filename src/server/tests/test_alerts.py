@@ -0,0 +1,136 @@
+"""Tests for the provider alert outbox and background dispatcher."""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))  # Add server directory to path
+
+from utils import alerts
+from utils.alert_outbox import AlertOutbox, ProviderAlert
+from utils.alerts import AlertDispatcher, FakeTransport, create_alert_transport
+
+
+def test_enqueue_returns_before_slow_send_completes():
+    """Surveys do not wait on the SMS gateway."""
+    transport = FakeTransport(delay=0.3)
+    dispatcher = AlertDispatcher(transport)
+    
+    start = time.perf_counter()
+    assert dispatcher.enqueue("patient-1", "high", ["missed_medication"])
+    assert time.perf_counter() - start < 0.1
+    
+    assert dispatcher.flush(timeout=5)
+    assert len(transport.sent) == 1
+    assert "HIGH Risk" in transport.sent[0] and "missed_medication" in transport.sent[0]
+    dispatcher.close()
+
+
+def test_failed_sends_are_retried_with_backoff():
+    """Transient failures retry; exhausting retries counts a failure."""
+    transport = FakeTransport(fail_times=2)
+    dispatcher = AlertDispatcher(transport, max_retries=3, backoff_seconds=0.01)
+    dispatcher.enqueue("patient-1", "high", [])
+    dispatcher.flush(timeout=5)
+    assert transport.attempts == 3 and len(transport.sent) == 1
+    assert dispatcher.stats()["retried"] == 2
+    
+    failing = AlertDispatcher(FakeTransport(fail_times=10), max_retries=1, backoff_seconds=0.01)
+    failing.enqueue("patient-2", "high", [])
+    failing.flush(timeout=5)
+    assert failing.stats()["failed"] == 1 and failing.transport.attempts == 2
+    dispatcher.close()
+    failing.close()
+
+
+def test_repeat_alerts_for_a_patient_are_deduplicated():
+    """One alert per patient and risk level inside the window; anonymous alerts always go out."""
+    transport = FakeTransport()
+    dispatcher = AlertDispatcher(transport, dedupe_window_seconds=60)
+    
+    assert dispatcher.enqueue("patient-1", "high", [], patient_id="patient-1")
+    assert not dispatcher.enqueue("patient-1", "high", [], patient_id="patient-1")
+    assert dispatcher.enqueue("patient-1", "moderate", [], patient_id="patient-1")
+    assert dispatcher.enqueue("Survey respondent", "high", [])
+    assert dispatcher.enqueue("Survey respondent", "high", [])
+    
+    dispatcher.flush(timeout=5)
+    assert len(transport.sent) == 4
+    assert dispatcher.stats()["deduplicated"] == 1
+    dispatcher.close()
+
+
+def test_failed_alert_does_not_suppress_the_next_one():
+    """An alert that exhausted its retries does not dedupe later alerts for the patient."""
+    transport = FakeTransport(fail_times=2)
+    dispatcher = AlertDispatcher(transport, max_retries=1, backoff_seconds=0.01, dedupe_window_seconds=60)
+    
+    assert dispatcher.enqueue("patient-1", "high", [], patient_id="patient-1")
+    dispatcher.flush(timeout=5)
+    assert dispatcher.stats()["failed"] == 1 and not transport.sent
+    
+    assert dispatcher.enqueue("patient-1", "high", [], patient_id="patient-1")
+    dispatcher.flush(timeout=5)
+    assert len(transport.sent) == 1
+    assert not dispatcher.enqueue("patient-1", "high", [], patient_id="patient-1")  # delivered one dedupes
+    dispatcher.close()
+
+
+def test_pending_alerts_survive_a_restart(tmp_path):
+    """Alerts recorded by a process that stopped before sending go out from the next one."""
+    path = tmp_path / "outbox.db"
+    crashed = AlertOutbox(path, lease_seconds=30)
+    crashed.add(ProviderAlert("patient-1", "high", ["low_mood"]))
+    assert crashed.claim() and not crashed.claim()  # leased mid-send, then the process died
+    crashed.close()
+    
+    clock = [0.0]
+    restarted = AlertOutbox(path, lease_seconds=30, clock=lambda: time.time() + clock[0])
+    assert restarted.pending() == 1 and not restarted.claim()
+    clock[0] = 31  # lease expired
+    transport = FakeTransport()
+    dispatcher = AlertDispatcher(transport, outbox=restarted)
+    dispatcher.start()
+    assert dispatcher.flush(timeout=5)
+    assert len(transport.sent) == 1
+    
+    stats = dispatcher.stats()["outbox"]
+    assert stats["pending"] == 0 and stats["sent_in_window"] == 1
+    dispatcher.close()
+
+
+def test_send_provider_alert_uses_configured_dispatcher(monkeypatch, tmp_path):
+    """send_provider_alert queues through the process-wide dispatcher."""
+    from config import settings
+    from utils.sms import send_provider_alert
+    
+    monkeypatch.setattr(settings, "enable_sms_alerts", True)
+    monkeypatch.setattr(settings, "alert_transport", "fake")
+    monkeypatch.setattr(settings, "alert_outbox_path", tmp_path / "outbox.db")
+    monkeypatch.setattr(alerts, "_dispatcher", None)
+    
+    assert send_provider_alert("patient-9", "high", ["low_mood"], patient_id="patient-9")
+    dispatcher = alerts.get_alert_dispatcher()
+    assert isinstance(dispatcher.transport, FakeTransport)
+    assert dispatcher.flush(timeout=5)
+    assert len(dispatcher.transport.sent) == 1
+    alerts.shutdown_alert_dispatcher()
+    
+    with pytest.raises(ValueError):
+        create_alert_transport("pager")
+
+
+def test_metrics_do_not_create_a_dispatcher(monkeypatch, tmp_path):
+    """/api/metrics reports no alert stats, and opens no outbox, while SMS is disabled."""
+    from fastapi.testclient import TestClient
+    from config import settings
+    from tests.test_async_agent import make_app
+    
+    monkeypatch.setattr(settings, "alert_outbox_path", tmp_path / "alerts" / "outbox.db")
+    monkeypatch.setattr(alerts, "_dispatcher", None)
+    with TestClient(make_app(tmp_path, monkeypatch)) as client:
+        assert client.get("/api/metrics").json()["provider_alerts"] == {}
+    assert alerts.current_alert_dispatcher() is None
+    assert not (tmp_path / "alerts").exists()
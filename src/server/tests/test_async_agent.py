@@ -0,0 +1,216 @@
+"""Tests for AsyncClaudeAgent (chat, concurrent sentiment, streaming) against a fake async Claude client."""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent))  # Add server directory to path
+
+from agents import AsyncClaudeAgent
+from config import settings
+from prompts.system_prompts import SENTIMENT_ANALYZER_PROMPT
+
+SENTIMENT_JSON = (
+    '{"sentiment": "negative", "primary_emotions": ["worry"], "risk_level": "low", '
+    '"confidence": 0.9, "explanation": "worried about work"}'
+)
+DELTAS = ["I hear ", "that work ", "feels heavy."]
+REPLY = "".join(DELTAS)
+
+
+class FakeStream:
+    """Async context manager mimicking ``messages.stream``; records session state per delta."""
+    
+    def __init__(self, messages):
+        self.messages = messages
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+    
+    @property
+    async def text_stream(self):
+        for text in DELTAS:
+            await asyncio.sleep(0.01)
+            self.messages.history_during_stream.append(session_history(self.messages.agent))
+            yield text
+    
+    async def get_final_message(self):
+        return SimpleNamespace(usage=None)
+
+
+class FakeMessages:
+    """Async messages API answering chat and sentiment requests with fixed delays."""
+    
+    def __init__(self, agent=None, chat_delay: float = 0.0, sentiment_delay: float = 0.0):
+        self.agent = agent
+        self.chat_delay = chat_delay
+        self.sentiment_delay = sentiment_delay
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+        self.sentiment_cancelled = False
+        self.history_during_stream = []
+    
+    async def create(self, **request):
+        is_sentiment = request["system"][0]["text"] == SENTIMENT_ANALYZER_PROMPT
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.sentiment_delay if is_sentiment else self.chat_delay)
+        except asyncio.CancelledError:
+            self.sentiment_cancelled = is_sentiment
+            raise
+        finally:
+            self.in_flight -= 1
+        text = SENTIMENT_JSON if is_sentiment else REPLY
+        return SimpleNamespace(content=[SimpleNamespace(text=text)], usage=None)
+    
+    def stream(self, **request):
+        return FakeStream(self)
+
+
+def session_history(agent, session_id: str = "s1"):
+    """Copy of a session's recorded messages (empty if it has none)."""
+    return list(agent.sessions.get(session_id) or [])
+
+
+def make_agent(monkeypatch, **delays):
+    """AsyncClaudeAgent wired to a fake Claude client."""
+    monkeypatch.setattr(settings, "anthropic_api_key", "test-key")
+    agent = AsyncClaudeAgent()
+    agent.client = None  # the blocking client must not be used
+    agent.async_client = SimpleNamespace(messages=FakeMessages(agent, **delays))
+    return agent
+
+
+def make_app(tmp_path, monkeypatch):
+    """Create the app over a tiny dataset with no network access and no background Claude calls."""
+    from api.routes import create_app
+    from tests.test_counseling_loader import write_dataset
+    
+    monkeypatch.setattr(settings, "anthropic_api_key", "test-key")
+    monkeypatch.setattr(settings, "counseling_data_path", write_dataset(tmp_path / "combined_dataset.json"))
+    monkeypatch.setattr(settings, "sentiment_data_path", tmp_path / "no-sentiment")
+    monkeypatch.setattr(settings, "diagnosis_data_path", tmp_path / "no-diagnosis")
+    monkeypatch.setattr(settings, "embedding_cache_dir", tmp_path / "embeddings")
+    monkeypatch.setattr(settings, "use_dataset_snapshots", False)
+    monkeypatch.setattr(settings, "upstream_probe_interval_seconds", 0)
+    monkeypatch.setitem(sys.modules, "sentence_transformers", None)  # keyword-search fallback, no download
+    return create_app()
+
+
+def collect(agent, **options):
+    """Run ``chat_stream`` to completion and return its events."""
+    async def run():
+        return [event async for event in agent.chat_stream("work stresses me out", session_id="s1", **options)]
+    
+    return asyncio.run(run())
+
+
+def test_chat_awaits_async_client_and_records_session(monkeypatch):
+    """chat() replies through the async client, parses sentiment and records the turn."""
+    agent = make_agent(monkeypatch)
+    
+    result = asyncio.run(agent.chat("work stresses me out", session_id="s1", use_rag=False))
+    
+    assert result["response"] == REPLY
+    assert result["session_id"] == "s1"
+    assert result["sentiment"]["primary_emotions"] == ["worry"]
+    assert agent.async_client.messages.calls == 2
+    assert [m["role"] for m in session_history(agent)] == ["user", "assistant"]
+
+
+def test_chat_runs_reply_and_sentiment_concurrently(monkeypatch):
+    """The reply and sentiment round trips overlap instead of running back to back."""
+    agent = make_agent(monkeypatch, chat_delay=0.2, sentiment_delay=0.2)
+    
+    start = time.perf_counter()
+    result = asyncio.run(agent.chat("work stresses me out", session_id="s1", use_rag=False))
+    elapsed = time.perf_counter() - start
+    
+    assert agent.async_client.messages.peak == 2
+    assert elapsed < 0.35  # back to back would take 0.4s
+    assert result["sentiment"]["primary_emotions"] == ["worry"]
+
+
+def test_chat_can_skip_sentiment(monkeypatch):
+    """include_sentiment=False makes a single Claude call."""
+    agent = make_agent(monkeypatch)
+    
+    result = asyncio.run(agent.chat("hello", session_id="s1", use_rag=False, include_sentiment=False))
+    
+    assert result["response"] == REPLY
+    assert agent.async_client.messages.calls == 1
+
+
+def test_chat_error_is_reported_not_raised(monkeypatch):
+    """A failed Claude call yields the error reply instead of propagating."""
+    agent = make_agent(monkeypatch)
+    
+    async def fail(**request):
+        raise RuntimeError("upstream unavailable")
+    
+    agent.async_client.messages.create = fail
+    result = asyncio.run(agent.chat("hello", session_id="s1", use_rag=False))
+    
+    assert result["session_id"] == "s1"
+    assert "error" in result
+
+
+def test_stream_events_in_order_and_session_written_after_stream(monkeypatch):
+    """start, one token per delta, sentiment, done; history is recorded only at the end."""
+    agent = make_agent(monkeypatch, sentiment_delay=0.05)
+    
+    events = collect(agent, use_rag=False)
+    
+    assert [e["event"] for e in events] == ["start", "token", "token", "token", "sentiment", "done"]
+    assert [e["data"]["text"] for e in events[1:4]] == DELTAS
+    assert events[4]["data"]["sentiment"] == "negative"
+    assert events[5]["data"]["session_id"] == "s1"
+    assert agent.async_client.messages.history_during_stream == [[], [], []]
+    assert session_history(agent)[-1] == {"role": "assistant", "content": REPLY}
+    
+    without_sentiment = collect(make_agent(monkeypatch), use_rag=False, include_sentiment=False)
+    assert [e["event"] for e in without_sentiment] == ["start", "token", "token", "token", "done"]
+
+
+def test_client_disconnect_cancels_sentiment_and_skips_session(monkeypatch):
+    """Closing the stream mid-reply cancels the pending sentiment call and records nothing."""
+    agent = make_agent(monkeypatch, sentiment_delay=10)
+    
+    async def run():
+        stream = agent.chat_stream("work stresses me out", session_id="s1", use_rag=False)
+        first = [await stream.__anext__(), await stream.__anext__()]
+        await stream.aclose()  # what the server does when the client goes away
+        await asyncio.sleep(0)
+        return first
+    
+    first = asyncio.run(run())
+    assert [e["event"] for e in first] == ["start", "token"]
+    assert agent.async_client.messages.sentiment_cancelled
+    assert session_history(agent) == []
+
+
+def test_stream_endpoint_emits_server_sent_events(tmp_path, monkeypatch):
+    """/api/chat/stream frames each event as SSE with a JSON data line."""
+    app = make_app(tmp_path, monkeypatch)
+    with TestClient(app) as client:
+        agent = app.state.agent
+        agent.async_client = SimpleNamespace(messages=FakeMessages(agent, sentiment_delay=0.01))
+        response = client.post("/api/chat/stream", json={"message": "work stresses me out", "session_id": "s1"})
+    
+    assert response.headers["content-type"].startswith("text/event-stream")
+    frames = [frame for frame in response.text.split("\n\n") if frame]
+    names = [frame.split("\n")[0].removeprefix("event: ") for frame in frames]
+    assert names == ["start", "token", "token", "token", "sentiment", "done"]
+    data = [json.loads(frame.split("\n")[1].removeprefix("data: ")) for frame in frames]
+    assert data[0]["session_id"] == "s1" and data[-1]["session_id"] == "s1"
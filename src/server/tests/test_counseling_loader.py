@@ -0,0 +1,220 @@
+"""Tests for CounselingDataLoader retrieval and embedding cache."""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))  # Add server directory to path
+
+from data_loaders import CounselingDataLoader
+
+
+CONVERSATIONS = [
+    {"Context": "I can't sleep at night and feel exhausted", "Response": "Try a consistent bedtime routine."},
+    {"Context": "My anxiety gets worse before work meetings", "Response": "Breathing exercises can help with anxiety."},
+    {"Context": "I argue with my partner every day", "Response": "Couples counseling may help you communicate."},
+    {"Context": "I feel worthless and sad most days", "Response": "A therapist can help you work through depression."},
+]
+
+
+class FakeEmbeddingModel:
+    """Deterministic bag-of-characters encoder that counts encode calls."""
+    
+    def __init__(self, dim: int = 16):
+        self.dim = dim
+        self.calls = 0
+    
+    def encode(self, texts, show_progress_bar=False):
+        self.calls += 1
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for ch in text.lower():
+                vectors[i, ord(ch) % self.dim] += 1.0
+        return vectors
+
+
+def write_dataset(path: Path, conversations=CONVERSATIONS) -> Path:
+    """Write conversations as line-delimited JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        for conv in conversations:
+            f.write(json.dumps(conv) + "\n")
+    return path
+
+
+def test_embedding_cache_is_reused_across_loaders(tmp_path):
+    """A second loader memory-maps the cache instead of re-encoding."""
+    data_path = write_dataset(tmp_path / "combined_dataset.json")
+    cache_dir = tmp_path / "cache"
+    model = FakeEmbeddingModel()
+    
+    first = CounselingDataLoader(data_path, cache_dir=cache_dir)
+    first.build_embeddings(model, "fake-model")
+    assert model.calls == 1
+    
+    second = CounselingDataLoader(data_path, cache_dir=cache_dir)
+    second.build_embeddings(model, "fake-model")
+    assert model.calls == 1
+    assert isinstance(second.embeddings, np.memmap)
+    np.testing.assert_allclose(first.embeddings, second.embeddings)
+
+
+def test_embedding_cache_invalidated_by_model_or_data_change(tmp_path):
+    """Changing the model name or the dataset rebuilds the cache."""
+    data_path = write_dataset(tmp_path / "combined_dataset.json")
+    cache_dir = tmp_path / "cache"
+    model = FakeEmbeddingModel()
+    
+    CounselingDataLoader(data_path, cache_dir=cache_dir).build_embeddings(model, "fake-model")
+    CounselingDataLoader(data_path, cache_dir=cache_dir).build_embeddings(model, "other-model")
+    assert model.calls == 2
+    
+    write_dataset(data_path, CONVERSATIONS[:3])
+    loader = CounselingDataLoader(data_path, cache_dir=cache_dir)
+    loader.build_embeddings(model, "other-model")
+    assert model.calls == 3
+    assert loader.embeddings.shape[0] == 3
+
+
+def test_search_by_similarity_returns_best_matches_first(tmp_path):
+    """Top-k selection over normalized rows matches a full cosine sort."""
+    data_path = write_dataset(tmp_path / "combined_dataset.json")
+    model = FakeEmbeddingModel()
+    loader = CounselingDataLoader(data_path)
+    loader.build_embeddings(model)
+    
+    query = "anxiety before work meetings"
+    raw = model.encode([f"{c['Context']} {c['Response']}" for c in CONVERSATIONS])
+    q = model.encode([query])[0]
+    expected = np.argsort(raw @ q / (np.linalg.norm(raw, axis=1) * np.linalg.norm(q)))[::-1][:2]
+    
+    results = loader.search_by_similarity(query, embeddings_model=model, max_results=2)
+    assert results == [CONVERSATIONS[i] for i in expected]
+    assert loader.embeddings.dtype == np.float32
+    np.testing.assert_allclose(np.linalg.norm(loader.embeddings, axis=1), 1.0, rtol=1e-5)
+
+
+def test_search_by_keywords_uses_ranked_index(tmp_path):
+    """Keyword fallback returns the most relevant conversation first."""
+    loader = CounselingDataLoader(write_dataset(tmp_path / "combined_dataset.json"))
+    
+    results = loader.search_by_keywords(["anxiety", "meetings"], max_results=2)
+    assert results[0] == CONVERSATIONS[1]
+    assert loader.search_by_similarity("couples counseling partner", max_results=1) == [CONVERSATIONS[2]]
+
+
+def test_hybrid_search_fuses_dense_and_lexical(tmp_path):
+    """Hybrid mode returns results and rejects unknown modes."""
+    import pytest
+    
+    loader = CounselingDataLoader(write_dataset(tmp_path / "combined_dataset.json"))
+    model = FakeEmbeddingModel()
+    
+    results = loader.search_by_similarity(
+        "sleep bedtime routine", embeddings_model=model, max_results=2, mode="hybrid"
+    )
+    assert results[0] == CONVERSATIONS[0]
+    assert len(results) == 2
+    with pytest.raises(ValueError):
+        loader.search_by_similarity("sleep", embeddings_model=model, mode="sparse")
+
+
+def test_statistics_are_maintained_at_load_time(tmp_path):
+    """Statistics match a full recomputation and are served without rescanning."""
+    loader = CounselingDataLoader(write_dataset(tmp_path / "combined_dataset.json"))
+    
+    stats = loader.get_statistics()
+    assert stats["total_conversations"] == len(CONVERSATIONS)
+    assert stats["avg_context_length"] == np.mean([len(c["Context"]) for c in CONVERSATIONS])
+    assert stats["avg_response_length"] == np.mean([len(c["Response"]) for c in CONVERSATIONS])
+    
+    loader.conversations = []  # get_statistics must not iterate the conversations
+    assert loader.get_statistics() == stats
+
+
+def test_filters_use_load_time_topic_and_upvote_arrays(tmp_path):
+    """Topic and upvote filters are answered from arrays built at load time."""
+    conversations = [
+        {"Context": "a", "Response": "x", "topic": "anxiety,stress", "upvotes": 3},
+        {"Context": "b", "Response": "y", "topic": "stress", "upvotes": 0},
+        {"Context": "c", "Response": "z", "topic": "", "upvotes": 7},
+    ]
+    loader = CounselingDataLoader(write_dataset(tmp_path / "combined_dataset.json", conversations))
+    
+    assert loader._filter_indices(None, 0) is None
+    assert loader._filter_indices("stress", 0).tolist() == [0, 1]
+    assert loader._filter_indices("stress", 1).tolist() == [0]
+    assert loader._filter_indices(None, 1).tolist() == [0, 2]
+    assert loader._filter_indices("grief", 0).tolist() == []
+    
+    loader.conversations = []  # filtering must not iterate the conversations
+    assert loader._filter_indices("anxiety", 3).tolist() == [0]
+
+
+def test_counselchat_csvs_are_merged_and_deduplicated(tmp_path):
+    """Both CounselChat layouts load from a directory, overlapping pairs once."""
+    import pandas as pd
+    
+    pd.DataFrame({
+        "questionTitle": ["Can't sleep", "Work anxiety"],
+        "questionText": ["I can't sleep at night.", "My anxiety spikes before meetings."],
+        "topic": ["sleep-improvement", "anxiety"],
+        "answerText": ["Keep a routine.Avoid screens.", "Try slow breathing."],
+        "upvotes": [2, 0],
+        "views": [120, 45],
+    }).to_csv(tmp_path / "counsel_chat2.csv")
+    pd.DataFrame({
+        "questionTitle": ["Can't sleep", "Fighting at home", "No question text"],
+        "questionText": ["I can&#39;t sleep at night.", "My wife and mother argue.", None],
+        "topics": ["Sleep Improvement,Stress", "Family Conflict", "Depression"],
+        "answerText": ["<p>Keep a routine.</p><p>Avoid screens.</p>", "<p>Talk to each of them.</p>", "<p>Reach out.</p>"],
+        "upvotes": [5, 1, 0],
+    }).to_csv(tmp_path / "counselchat-data.csv", index=False)
+    
+    loader = CounselingDataLoader(tmp_path)
+    assert loader.duplicates_skipped == 1
+    assert [c["Context"] for c in loader.conversations] == [
+        "I can't sleep at night.",
+        "My anxiety spikes before meetings.",
+        "My wife and mother argue.",
+        "No question text",
+    ]
+    assert loader.conversations[0] == {
+        "Context": "I can't sleep at night.",
+        "Response": "Keep a routine.Avoid screens.",
+        "topic": "sleep-improvement,stress",
+        "upvotes": 5,
+        "views": 120,
+    }
+    assert loader.conversations[2]["Response"] == "Talk to each of them."
+    
+    assert [c["Context"] for c in loader.filter_conversations(topic="stress")] == ["I can't sleep at night."]
+    assert len(loader.filter_conversations(min_upvotes=1)) == 2
+    results = loader.search_by_similarity("talk about anxiety", max_results=3, topic="family-conflict")
+    assert results == [loader.conversations[2]]
+    
+    model = FakeEmbeddingModel()
+    dense = loader.search_by_similarity("sleep routine", embeddings_model=model, max_results=5, min_upvotes=1)
+    assert sorted(c["Context"] for c in dense) == ["I can't sleep at night.", "My wife and mother argue."]
+
+
+def test_topic_partitions_search_routed_topics_only(tmp_path):
+    """With topic partitions, dense search only returns conversations from routed topics."""
+    conversations = [
+        {"Context": f"{word} question {i}", "Response": f"{word} answer {i}", "topic": topic}
+        for i in range(10)
+        for word, topic in (("sleep", "sleep-improvement"), ("parents", "parenting"), ("work", "workplace-relationships"))
+    ]
+    loader = CounselingDataLoader(
+        write_dataset(tmp_path / "combined_dataset.json", conversations),
+        topic_partitions=True,
+        route_partitions=1,
+        min_partition_size=5
+    )
+    loader.build_embeddings(FakeEmbeddingModel())
+    assert loader.index.topics == ["parenting", "sleep-improvement", "workplace-relationships"]
+    
+    results = loader.search_by_similarity("my parents", embeddings_model=FakeEmbeddingModel(), max_results=5)
+    assert len(results) == 5
+    assert {c["topic"] for c in results} == {"parenting"}
@@ -0,0 +1,52 @@
+"""Tests for DiagnosisDataLoader lookups."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))  # Add server directory to path
+
+from data_loaders import DiagnosisDataLoader
+
+
+def test_search_by_symptoms_orders_by_match_score():
+    """Rows matching more symptoms come first, file order breaks ties."""
+    loader = DiagnosisDataLoader(Path("/nonexistent"))  # placeholder data
+    
+    results = loader.search_by_symptoms(["Anxiety", "medication"], max_results=3)
+    assert [r["condition"] for r in results] == ["Anxiety Disorder"]
+    assert results[0]["match_score"] == 0.5
+    
+    results = loader.search_by_symptoms(["worry", "muscle tension", "insomnia"], max_results=2)
+    assert results[0]["condition"] == "Generalized Anxiety"
+    assert results[0]["match_score"] == 2 / 3
+    assert results[1]["condition"] == "Depression"
+    assert loader.search_by_symptoms(["nothing like this"]) == []
+
+
+def test_bundled_csv_is_mapped_to_canonical_columns():
+    """The bundled CSV's headers resolve to typed, indexed canonical columns."""
+    loader = DiagnosisDataLoader(Path(__file__).parent.parent.parent / "dataset" / "diagnosis_treatment")
+    data = loader.get_all_data()
+    
+    assert len(data) == 500
+    for col in ["condition", "medication", "treatment"]:
+        assert str(data[col].dtype) == "category"
+    
+    anxiety = loader.get_by_condition("anxiety")
+    assert len(anxiety) > 0
+    assert set(anxiety["condition"].astype(str)) == {"Generalized Anxiety"}
+    assert loader.get_treatment_approaches("panic")
+    
+    results = loader.search_by_symptoms(["insomnia", "anxiety"], max_results=3)
+    assert len(results) == 3
+    assert all(r["match_score"] == 1.0 for r in results)
+
+
+def test_statistics_are_computed_once():
+    """get_statistics serves the summary computed at load."""
+    loader = DiagnosisDataLoader(Path("/nonexistent"))  # placeholder data
+    
+    stats = loader.get_statistics()
+    assert stats["total_records"] == len(loader.get_all_data())
+    assert sum(stats["conditions"].values()) == stats["total_records"]
+    assert loader.get_statistics() is stats
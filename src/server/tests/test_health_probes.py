@@ -0,0 +1,119 @@
+"""Tests for readiness state and the rate-limited upstream probe."""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+from anthropic import APIConnectionError
+
+sys.path.insert(0, str(Path(__file__).parent.parent))  # Add server directory to path
+
+from agents import AsyncClaudeAgent
+from config import settings
+from data_loaders import DiagnosisDataLoader, SentimentDataLoader
+from utils.metrics import UpstreamHealth
+
+
+class CountingMessages:
+    """Async messages API that counts calls and can be made to fail."""
+    
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+    
+    async def create(self, **request):
+        self.calls += 1
+        if self.fail:
+            raise APIConnectionError(request=httpx.Request("POST", "https://api.anthropic.com"))
+        return SimpleNamespace(content=[SimpleNamespace(text="ok")], usage=None)
+
+
+def make_agent(monkeypatch):
+    """AsyncClaudeAgent over placeholder datasets and a fake Claude client."""
+    monkeypatch.setattr(settings, "anthropic_api_key", "test-key")
+    agent = AsyncClaudeAgent(
+        counseling_loader=SimpleNamespace(
+            get_statistics=lambda: {"total_conversations": 3}, keyword_index=object(), index=None
+        ),
+        sentiment_loader=SentimentDataLoader(Path("/nonexistent")),
+        diagnosis_loader=DiagnosisDataLoader(Path("/nonexistent"))
+    )
+    agent.async_client = SimpleNamespace(messages=CountingMessages())
+    return agent
+
+
+def test_upstream_probe_is_rate_limited_and_cached(monkeypatch):
+    """Probes reuse the last result until the interval passes; health checks only read it."""
+    agent = make_agent(monkeypatch)
+    monkeypatch.setattr(settings, "upstream_probe_interval_seconds", 60)
+    
+    async def run():
+        unknown = await agent.health_check()
+        await asyncio.gather(*(agent.probe_upstream() for _ in range(5)))
+        healthy = await agent.health_check()
+        agent.async_client.messages.fail = True
+        forced = await agent.probe_upstream(force=True)
+        return unknown, healthy, forced
+    
+    unknown, healthy, forced = asyncio.run(run())
+    assert unknown["claude_available"] is None
+    assert healthy["claude_available"]
+    assert agent.async_client.messages.calls == 2
+    assert not forced["ok"] and forced["error"]
+    assert agent.readiness()["last_probe"] is forced
+
+
+def test_health_endpoint_never_calls_claude(tmp_path, monkeypatch):
+    """With the background probe disabled, /api/health reports Claude as unknown without calling it."""
+    from fastapi.testclient import TestClient
+    from tests.test_async_agent import make_app
+    
+    app = make_app(tmp_path, monkeypatch)  # upstream_probe_interval_seconds = 0
+    with TestClient(app) as client:
+        app.state.agent.async_client = SimpleNamespace(messages=CountingMessages())
+        for _ in range(3):
+            health = client.get("/api/health").json()
+        assert health["status"] == "unknown" and health["claude_available"] is None
+        
+        asyncio.run(app.state.agent.probe_upstream())
+        assert client.get("/api/health").json()["status"] == "healthy"
+    assert app.state.agent.async_client.messages.calls == 1
+
+
+def test_readiness_uses_only_in_process_state(monkeypatch):
+    """Readiness needs loaded data and an acceptable recent Claude error rate."""
+    agent = make_agent(monkeypatch)
+    monkeypatch.setattr(settings, "readiness_min_calls", 4)
+    monkeypatch.setattr(settings, "readiness_max_error_rate", 0.5)
+    
+    assert agent.readiness()["ready"]
+    for _ in range(3):
+        agent._record_upstream_error(APIConnectionError(request=httpx.Request("POST", "https://x")))
+    agent._record_upstream_error(ValueError("local bug"))  # not an upstream failure
+    assert agent.readiness()["ready"]  # too few calls to judge
+    
+    agent.upstream.record(True)
+    state = agent.readiness()
+    assert not state["ready"] and not state["checks"]["upstream_error_rate_ok"]
+    assert state["upstream"]["calls"] == 4 and state["upstream"]["error_rate"] == 0.75
+    assert agent.async_client.messages.calls == 0
+    
+    agent.embeddings_model = object()  # dense retrieval configured but index not built
+    assert not agent.readiness()["checks"]["retrieval_index_ready"]
+
+
+def test_upstream_window_expires_old_outcomes():
+    """Outcomes older than the window no longer count."""
+    now = [0.0]
+    health = UpstreamHealth(window_seconds=10, clock=lambda: now[0])
+    health.record(False, RuntimeError("timeout"))
+    health.record(True)
+    assert health.snapshot()["error_rate"] == 0.5
+    
+    now[0] = 11
+    health.record(True)
+    snapshot = health.snapshot()
+    assert (snapshot["calls"], snapshot["errors"]) == (1, 0)
+    assert snapshot["last_error"] == "timeout" and snapshot["last_error_seconds_ago"] == 11
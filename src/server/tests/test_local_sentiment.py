@@ -0,0 +1,95 @@
+"""Tests for the local sentiment classifier."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))  # Add server directory to path
+
+from agents import LocalSentimentClassifier
+
+
+POSITIVE = ["had a great day with friends", "feeling happy and grateful today", "therapy is really helping me"]
+NEGATIVE = ["i feel hopeless and empty", "so anxious i cannot focus", "everything feels overwhelming and sad"]
+SUICIDAL = ["i do not want to be here anymore", "nobody would miss me if i was gone"]
+
+
+class FakeSentimentLoader:
+    """Repeats a handful of labeled texts to form a training set."""
+    
+    def __init__(self, repeat: int = 30):
+        self.calls = 0
+        self.repeat = repeat
+    
+    def get_labeled_texts(self):
+        self.calls += 1
+        texts = (POSITIVE + NEGATIVE + SUICIDAL) * self.repeat
+        labels = (["positive"] * 3 + ["depression"] * 3 + ["suicidal"] * 2) * self.repeat
+        return texts, labels
+
+
+def test_confident_low_risk_texts_are_answered_locally():
+    """Clear positive texts are classified; clinical labels, risk phrases and risky labels escalate."""
+    classifier = LocalSentimentClassifier.from_loader(FakeSentimentLoader(), min_confidence=0.6)
+    
+    result = classifier.classify("had a great day with friends")
+    assert result["sentiment"] == "positive" and result["source"] == "local"
+    assert result["risk_level"] == "low"
+    assert classifier.classify("i feel hopeless and empty") is None
+    assert classifier.classify("nobody would miss me if i was gone") is None
+    assert classifier.classify("I keep thinking about suicide") is None
+    assert classifier.stats()["escalated"] == 3
+
+
+def test_confident_clinical_label_reaches_claude(monkeypatch):
+    """A confident 'depression' prediction is assessed by Claude, not reported as low risk."""
+    import asyncio
+    from types import SimpleNamespace
+    
+    from agents import AsyncClaudeAgent
+    from config import settings
+    
+    classifier = LocalSentimentClassifier.from_loader(FakeSentimentLoader(), min_confidence=0.6)
+    assert classifier.predict_proba("i feel hopeless and empty").max() >= 0.6
+    
+    class FakeMessages:
+        def __init__(self):
+            self.calls = 0
+        
+        async def create(self, **request):
+            self.calls += 1
+            text = '{"sentiment": "negative", "primary_emotions": ["hopelessness"], "risk_level": "moderate", "confidence": 0.9, "explanation": "x"}'
+            return SimpleNamespace(content=[SimpleNamespace(text=text)], usage=None)
+    
+    monkeypatch.setattr(settings, "anthropic_api_key", "test-key")
+    monkeypatch.setattr(settings, "sentiment_cache_size", 0)
+    agent = AsyncClaudeAgent(local_sentiment=classifier)
+    agent.async_client = SimpleNamespace(messages=FakeMessages())
+    
+    result = asyncio.run(agent.analyze_sentiment("i feel hopeless and empty"))
+    assert agent.async_client.messages.calls == 1
+    assert result.get("source") != "local" and result["risk_level"] == "moderate"
+    
+    assert asyncio.run(agent.analyze_sentiment("had a great day with friends"))["source"] == "local"
+    assert agent.async_client.messages.calls == 1
+
+
+def test_classifier_is_cached_and_needs_enough_data(tmp_path):
+    """A second start loads the pickled model; tiny datasets disable the classifier."""
+    cache_path = tmp_path / "sentiment_classifier.pkl"
+    first = LocalSentimentClassifier.from_loader(FakeSentimentLoader(), cache_path=cache_path)
+    second = LocalSentimentClassifier.from_loader(FakeSentimentLoader(), cache_path=cache_path)
+    
+    assert cache_path.exists()
+    assert list(second.model.classes_) == list(first.model.classes_)
+    assert LocalSentimentClassifier.from_loader(FakeSentimentLoader(repeat=1)) is None
+
+
+def test_fast_scoring_matches_sklearn_pipeline():
+    """The array-based scorer reproduces the pipeline's probabilities."""
+    import numpy as np
+    
+    classifier = LocalSentimentClassifier.from_loader(FakeSentimentLoader())
+    for text in POSITIVE + NEGATIVE + ["completely unseen words", "sad but grateful"]:
+        np.testing.assert_allclose(
+            classifier.predict_proba(text), classifier.model.predict_proba([text])[0], rtol=1e-6
+        )
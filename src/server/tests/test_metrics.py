@@ -0,0 +1,27 @@
+"""Tests for Claude usage metrics."""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))  # Add server directory to path
+
+from utils.metrics import UsageMetrics
+
+
+def test_usage_metrics_totals_cache_tokens_per_endpoint():
+    """Cache reads and writes are summed per endpoint with a hit ratio."""
+    metrics = UsageMetrics()
+    metrics.record("chat", SimpleNamespace(
+        input_tokens=100, output_tokens=50, cache_creation_input_tokens=900, cache_read_input_tokens=0
+    ))
+    metrics.record("chat", SimpleNamespace(
+        input_tokens=100, output_tokens=40, cache_creation_input_tokens=0, cache_read_input_tokens=900
+    ))
+    metrics.record("sentiment", SimpleNamespace(input_tokens=10, output_tokens=5))
+    
+    snapshot = metrics.snapshot()
+    assert snapshot["chat"]["calls"] == 2
+    assert snapshot["chat"]["cache_read_input_tokens"] == 900
+    assert snapshot["chat"]["cache_hit_ratio"] == 0.45
+    assert snapshot["sentiment"]["cache_creation_input_tokens"] == 0
@@ -0,0 +1,58 @@
+"""Tests for the sentiment response cache."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))  # Add server directory to path
+
+from utils.response_cache import ResponseCache
+
+
+def test_lru_evicts_oldest_and_counts_hits():
+    """Capacity is bounded and hit rate reflects lookups."""
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", {"sentiment": "negative"})
+    cache.put("b", {"sentiment": "positive"})
+    assert cache.get("a") == {"sentiment": "negative"}
+    cache.put("c", {"sentiment": "neutral"})
+    
+    assert cache.get("b") is None
+    assert cache.get("c") == {"sentiment": "neutral"}
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"], stats["hit_rate"]) == (2, 2, 1, 0.6667)
+
+
+def test_persistent_entries_survive_restart(tmp_path):
+    """A new cache over the same file serves earlier results."""
+    path = tmp_path / "sentiment.db"
+    ResponseCache(max_entries=10, path=path).put("k", {"sentiment": "negative", "confidence": 0.9})
+    
+    reopened = ResponseCache(max_entries=10, path=path)
+    assert reopened.get("k") == {"sentiment": "negative", "confidence": 0.9}
+    assert reopened.stats()["entries"] == 1
+
+
+def test_persistent_file_is_bounded_like_memory(tmp_path):
+    """The SQLite file keeps only the newest ``max_entries`` rows."""
+    import sqlite3
+    
+    path = tmp_path / "sentiment.db"
+    cache = ResponseCache(max_entries=2, path=path)
+    for key in ("a", "b", "c"):
+        cache.put(key, {"sentiment": key})
+    cache.put("b", {"sentiment": "b2"})  # rewriting a key does not grow the file
+    
+    with sqlite3.connect(path) as conn:
+        assert sorted(row[0] for row in conn.execute("SELECT key FROM responses")) == ["b", "c"]
+    reopened = ResponseCache(max_entries=10, path=path)
+    assert reopened.get("a") is None and reopened.get("b") == {"sentiment": "b2"}
+
+
+def test_sentiment_key_ignores_case_and_whitespace():
+    """Trivially different check-in texts share a cache entry."""
+    from agents.claude_agent import ClaudeAgent
+    
+    key = ClaudeAgent._sentiment_cache_key
+    assert key("I feel  tired\n today") == key("i feel tired today ")
+    assert key("I feel tired today") != key("I feel rested today")
+    assert ResponseCache(max_entries=0).get(key("anything")) is None
@@ -0,0 +1,103 @@
+"""Tests for the retrieval backends."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))  # Add server directory to path
+
+from retrieval import PartitionedIndex, create_vector_index, normalize_rows, top_k_indices
+
+
+def make_vectors(rows: int = 500, dim: int = 32, seed: int = 0):
+    """Random normalized corpus plus one query."""
+    rng = np.random.default_rng(seed)
+    return normalize_rows(rng.standard_normal((rows, dim))), normalize_rows(rng.standard_normal(dim))
+
+
+def test_top_k_indices_matches_full_sort():
+    """argpartition top-k returns the same order as a full descending sort."""
+    scores = np.random.default_rng(1).standard_normal(1000)
+    assert np.array_equal(top_k_indices(scores, 10), np.argsort(scores)[::-1][:10])
+    assert len(top_k_indices(scores[:3], 10)) == 3
+
+
+def test_exact_index_is_brute_force():
+    """Exact backend returns the true nearest neighbours."""
+    corpus, query = make_vectors()
+    indices, scores = create_vector_index("exact").build(corpus).search(query, 5)
+    assert np.array_equal(indices, np.argsort(corpus @ query)[::-1][:5])
+    np.testing.assert_allclose(scores, (corpus @ query)[indices])
+
+
+def test_ivf_probing_every_list_is_exact():
+    """With nprobe == nlist the IVF index scans the whole corpus."""
+    corpus, query = make_vectors()
+    ivf = create_vector_index("ivf", nlist=8, nprobe=8).build(corpus)
+    assert len(ivf) == len(corpus)
+    indices, _ = ivf.search(query, 5)
+    assert np.array_equal(indices, np.argsort(corpus @ query)[::-1][:5])
+
+
+def test_partitioned_index_routes_to_topic_partitions():
+    """Queries go to the closest or named topics; searching every partition is exact."""
+    rng = np.random.default_rng(2)
+    centers = normalize_rows(rng.standard_normal((3, 32)))
+    topics = ["anxiety", "depression", "parenting"]
+    labels = [[topics[i % 3]] for i in range(300)] + [["rare-topic"]] * 5
+    corpus = normalize_rows(
+        np.concatenate([centers[[i % 3 for i in range(300)]], centers[[0] * 5]])
+        + 0.3 * rng.standard_normal((305, 32))
+    )
+    index = PartitionedIndex(labels, max_partitions=2, min_partition_size=10).build(corpus)
+    assert index.topics == ["anxiety", "depression", "other", "parenting"]
+    assert len(index) == 305
+    
+    query = normalize_rows(centers[1] + 0.1 * rng.standard_normal(32))
+    assert index.route(query)[0] == "depression"
+    assert index.route(query, "my parents argue") == ["parenting", "depression"]
+    
+    # With one partition per query the closest centroid wins over a stem match
+    single = PartitionedIndex(labels, max_partitions=1, min_partition_size=10).build(corpus)
+    assert single.route(query, "my parents argue") == ["depression"]
+    
+    indices, _ = index.search(query, 5, topics=["depression"])
+    assert all(labels[i] == ["depression"] for i in indices)
+    indices, _ = index.search(query, 5, topics=index.topics)
+    assert np.array_equal(indices, np.argsort(corpus @ query)[::-1][:5])
+
+
+def test_unknown_backend_raises():
+    """Backend names are validated."""
+    with pytest.raises(ValueError):
+        create_vector_index("annoy")
+
+
+def test_bm25_ranks_by_relevance_not_file_order():
+    """Documents with more (and rarer) query terms rank first."""
+    from retrieval import BM25Index
+    
+    docs = [
+        "work stress and deadlines",
+        "trouble sleeping",
+        "anxiety before meetings, anxiety at work, anxiety everywhere",
+        "family dinner",
+    ]
+    index = BM25Index().build(docs)
+    indices, scores = index.search("anxiety at work", 10)
+    assert indices.tolist() == [2, 0]
+    assert scores[0] > scores[1] > 0
+    assert len(index.search("unrelated words", 5)[0]) == 0
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    """A document ranked well by both retrievers beats one ranked first by only one."""
+    from retrieval import reciprocal_rank_fusion
+    
+    dense = np.array([7, 3, 5])
+    lexical = np.array([9, 3, 7])
+    indices, scores = reciprocal_rank_fusion([dense, lexical], k=3)
+    assert indices.tolist() == [7, 3, 9]
+    assert np.all(np.diff(scores) <= 0)
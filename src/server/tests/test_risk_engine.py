@@ -0,0 +1,43 @@
+"""Tests for the vectorized survey risk engine."""
+
+import itertools
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))  # Add server directory to path
+
+from utils.risk_engine import SURVEY_CONCERNS, assess_survey, deterioration_alert, score_survey_frame
+
+
+def test_known_surveys():
+    """Spot-check the clinical rules on representative surveys."""
+    assert assess_survey(True, 8, 8, 7) == ("low", [], False)
+    assert assess_survey(True, 6, 8, 8) == ("moderate", ["okay_mood", "mood_physical_discrepancy"], False)
+    assert assess_survey(True, 3, 8, 8) == (
+        "high", ["low_mood", "mood_physical_discrepancy", "severe_mood_discrepancy"], False
+    )
+    assert assess_survey(False, 2, 2, 1) == (
+        "high", ["missed_medication", "low_mood", "poor_sleep", "minimal_activity"], True
+    )
+
+
+def test_frame_scoring_matches_single_surveys():
+    """Scoring a DataFrame agrees with scoring every survey on its own."""
+    combos = list(itertools.product([True, False], range(1, 11), range(1, 11), range(1, 11)))
+    frame = pd.DataFrame(combos, columns=["medication_taken", "mood_rating", "sleep_quality", "physical_activity"])
+    
+    scored = score_survey_frame(frame)
+    for i, combo in enumerate(combos):
+        risk, concerns, alert = assess_survey(*combo)
+        assert scored["risk_level"].iloc[i] == risk
+        assert bool(scored["provider_alert"].iloc[i]) == alert
+        assert [c for c in SURVEY_CONCERNS if scored[c].iloc[i]] == concerns
+    
+    alerts = deterioration_alert(
+        frame["medication_taken"], frame["mood_rating"], frame["sleep_quality"],
+        frame["physical_activity"], scored["risk_level"].astype(str)
+    )
+    assert np.array_equal(alerts, scored["provider_alert"].to_numpy())
@@ -0,0 +1,226 @@
+"""Tests for the conversation session store."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))  # Add server directory to path
+
+import pytest
+
+from sessions import InMemorySessionStore, RedisSessionStore, SQLiteSessionStore, create_session_store
+
+
+class FakeClock:
+    """Manually advanced time source."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedis:
+    """In-process stand-in for the subset of redis-py used by RedisSessionStore."""
+    
+    def __init__(self, clock):
+        self.clock = clock
+        self.lists = {}
+        self.deadlines = {}
+        self.zsets = {}
+    
+    def _live(self, key):
+        if key in self.deadlines and self.clock() >= self.deadlines[key]:
+            self.lists.pop(key, None)
+            self.deadlines.pop(key)
+        return self.lists.get(key)
+    
+    def register_script(self, source):
+        """Run the session read script's logic in Python (the fake has no Lua)."""
+        client = self
+        
+        def get_script(keys, args):
+            key, index_key = keys
+            ttl, now, session_id = args
+            messages = client.lrange(key, 0, -1)
+            if not messages:
+                client.zrem(index_key, session_id)
+                return messages
+            if ttl > 0:
+                client.expire(key, ttl)
+            client.zadd(index_key, {session_id: now})
+            return messages
+        
+        return get_script
+    
+    def pipeline(self):
+        client = self
+        
+        class Pipeline:
+            def __init__(self):
+                self.calls = []
+            
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+            
+            def execute(self):
+                return [getattr(client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+        
+        return Pipeline()
+    
+    def rpush(self, key, *values):
+        self.lists[key] = (self._live(key) or []) + list(values)
+        return len(self.lists[key])
+    
+    def ltrim(self, key, start, end):
+        if self._live(key) is not None:
+            self.lists[key] = self.lists[key][start:] if end == -1 else self.lists[key][start:end + 1]
+    
+    def lrange(self, key, start, end):
+        return list(self._live(key) or [])
+    
+    def expire(self, key, seconds):
+        self.deadlines[key] = self.clock() + seconds
+    
+    def delete(self, *keys):
+        return sum(self.lists.pop(k, None) is not None for k in keys)
+    
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+    
+    def zrem(self, key, *members):
+        return sum(self.zsets.get(key, {}).pop(m, None) is not None for m in members)
+    
+    def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+    
+    def zpopmin(self, key, count):
+        popped = sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])[:count]
+        for member, _ in popped:
+            del self.zsets[key][member]
+        return popped
+    
+    def zrangebyscore(self, key, low, high):
+        return [m for m, score in self.zsets.get(key, {}).items() if score <= high]
+
+
+def exchange(n: int):
+    """A user/assistant message pair."""
+    return [{"role": "user", "content": f"q{n}"}, {"role": "assistant", "content": f"a{n}"}]
+
+
+def test_history_is_trimmed_to_max_messages():
+    """Only the most recent messages are retained per session."""
+    store = InMemorySessionStore(max_messages=4)
+    for n in range(3):
+        store.append("s", exchange(n))
+    assert [m["content"] for m in store.get("s")] == ["q1", "a1", "q2", "a2"]
+    assert store.get("unknown") == []
+
+
+def test_least_recently_used_session_is_evicted():
+    """Reading a session protects it from capacity eviction."""
+    store = InMemorySessionStore(max_sessions=2)
+    store.append("a", exchange(0))
+    store.append("b", exchange(0))
+    store.get("a")
+    store.append("c", exchange(0))
+    
+    assert "a" in store and "c" in store and "b" not in store
+    assert store.stats()["evicted_lru"] == 1
+
+
+def test_idle_sessions_expire_lazily_and_on_sweep():
+    """Sessions idle beyond the TTL disappear on access or sweep."""
+    clock = FakeClock()
+    store = InMemorySessionStore(ttl_seconds=60, clock=clock)
+    store.append("old", exchange(0))
+    store.append("lazy", exchange(0))
+    clock.now = 50
+    store.append("fresh", exchange(0))
+    
+    clock.now = 100
+    assert store.get("lazy") == []
+    assert store.sweep() == 1
+    assert len(store) == 1 and store.get("fresh")
+    assert store.stats()["expired_ttl"] == 2
+
+
+def test_memory_stats_are_kept_as_running_totals():
+    """Message and memory totals track appends, trims, evictions, expiry and deletes."""
+    clock = FakeClock()
+    store = InMemorySessionStore(max_sessions=2, ttl_seconds=60, max_messages=4, clock=clock)
+    
+    def totals():
+        stats = store.stats()
+        return stats["messages"], stats["approx_memory_bytes"]
+    
+    for n in range(3):
+        store.append("a", exchange(n))  # trimmed to the last 4 messages
+    store.append("b", exchange(10))
+    store.append("c", exchange(200))  # evicts "a"
+    live = store.get("b") + store.get("c")
+    assert totals() == (4, sum(sys.getsizeof(m["content"]) for m in live))
+    
+    store.delete("b")
+    clock.now = 100
+    store.sweep()
+    assert totals() == (0, 0)
+    
+    store.append("d", exchange(1))
+    clock.now = 200
+    assert store.get("d") == [] and totals() == (0, 0)
+
+
+def shared_stores(backend: str, tmp_path, clock):
+    """Two stores over the same backing storage, as two worker processes would see it."""
+    options = {"max_sessions": 2, "ttl_seconds": 60, "max_messages": 4, "clock": clock}
+    if backend == "sqlite":
+        path = tmp_path / "sessions.db"
+        return SQLiteSessionStore(path, **options), SQLiteSessionStore(path, **options)
+    server = FakeRedis(clock)
+    return RedisSessionStore(client=server, **options), RedisSessionStore(client=server, **options)
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "redis"])
+def test_shared_backends_share_sessions_between_workers(backend, tmp_path):
+    """A session written by one worker is visible to, and bounded for, another."""
+    clock = FakeClock()
+    worker_a, worker_b = shared_stores(backend, tmp_path, clock)
+    
+    for n in range(3):
+        (worker_a if n % 2 else worker_b).append("s", exchange(n))
+    assert [m["content"] for m in worker_a.get("s")] == ["q1", "a1", "q2", "a2"]
+    
+    clock.now = 1
+    worker_b.append("t", exchange(0))
+    clock.now = 2
+    worker_a.append("u", exchange(0))
+    assert len(worker_b) == 2 and worker_b.get("s") == []
+    
+    assert worker_b.delete("t") and worker_a.get("t") == []
+    clock.now = 100
+    assert worker_a.sweep() == 1 and len(worker_b) == 0
+
+
+def test_redis_reads_refresh_only_live_sessions():
+    """Reading a session extends its TTL; reading an expired one does not bring it back."""
+    clock = FakeClock()
+    server = FakeRedis(clock)
+    store = RedisSessionStore(client=server, ttl_seconds=60, clock=clock)
+    store.append("s", exchange(0))
+    
+    clock.now = 50
+    assert store.get("s")
+    clock.now = 100  # past the original expiry, within the refreshed one
+    assert store.get("s")
+    
+    clock.now = 200
+    assert store.get("s") == []
+    assert len(store) == 0
+
+
+def test_unknown_session_backend_raises():
+    """Backend names are validated."""
+    with pytest.raises(ValueError):
+        create_session_store("memcached")
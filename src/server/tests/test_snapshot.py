@@ -0,0 +1,90 @@
+"""Tests for columnar dataset snapshots."""
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))  # Add server directory to path
+
+from data_loaders import CounselingDataLoader, DiagnosisDataLoader
+from data_loaders.counseling_loader import read_conversations
+from data_loaders.snapshot import (
+    build_snapshot,
+    is_fresh,
+    read_snapshot,
+    read_snapshot_records,
+    snapshot_path,
+    write_snapshot
+)
+from tests.test_counseling_loader import CONVERSATIONS, write_dataset
+
+
+def test_round_trip_preserves_values_and_missing_strings(tmp_path):
+    """Numbers, unicode text and missing strings survive a snapshot."""
+    frame = pd.DataFrame({
+        "id": [1, 2, 3],
+        "score": [0.5, np.nan, 2.25],
+        "text": ["café ☕", None, ""],
+        "label": ["low", None, "low"],
+    })
+    snapshot = write_snapshot(frame, tmp_path / "frame.snapshot")
+    
+    restored = read_snapshot(snapshot)
+    assert list(restored.columns) == ["id", "score", "text", "label"]
+    np.testing.assert_array_equal(restored["id"].to_numpy(), [1, 2, 3])
+    np.testing.assert_array_equal(restored["score"].to_numpy(), frame["score"].to_numpy())
+    assert restored["text"].iloc[0] == "café ☕"
+    assert pd.isna(restored["text"].iloc[1])
+    assert restored["text"].iloc[2] == ""
+    assert restored["label"].tolist()[::2] == ["low", "low"]
+    assert pd.isna(restored["label"].iloc[1])
+    
+    records = read_snapshot_records(snapshot)
+    assert records[0] == {"id": 1, "score": 0.5, "text": "café ☕", "label": "low"}
+    assert "text" not in records[1] and "label" not in records[1]
+
+
+def test_snapshot_goes_stale_when_source_changes(tmp_path):
+    """A snapshot is only fresh while its source is unchanged."""
+    source = tmp_path / "data.csv"
+    pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}).to_csv(source, index=False)
+    snapshot = build_snapshot(source, pd.read_csv, tmp_path / "snapshots")
+    assert snapshot == snapshot_path(source, tmp_path / "snapshots")
+    assert is_fresh(snapshot, source)
+    
+    pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]}).to_csv(source, index=False)
+    future = (snapshot / "manifest.json").stat().st_mtime + 10
+    os.utime(source, (future, future))
+    assert not is_fresh(snapshot, source)
+
+
+def test_loaders_prefer_fresh_snapshots(tmp_path):
+    """Loaders read the snapshot when fresh and produce the same data as parsing."""
+    data_path = write_dataset(tmp_path / "combined_dataset.json")
+    snapshot_dir = tmp_path / "snapshots"
+    snapshot = build_snapshot(data_path, read_conversations, snapshot_dir)
+    
+    # Corrupt the text of the snapshot's first column to prove it is what gets loaded
+    (snapshot / "c0.utf8").write_bytes((snapshot / "c0.utf8").read_bytes().upper())
+    loader = CounselingDataLoader(data_path, snapshot_dir=snapshot_dir)
+    assert loader.conversations[0]["Context"] == CONVERSATIONS[0]["Context"].upper()
+    
+    build_snapshot(data_path, read_conversations, snapshot_dir)
+    assert CounselingDataLoader(data_path, snapshot_dir=snapshot_dir).conversations == CONVERSATIONS
+    
+    diagnosis_dir = tmp_path / "diagnosis"
+    diagnosis_dir.mkdir()
+    csv_file = diagnosis_dir / "diagnosis.csv"
+    pd.DataFrame({
+        "Patient ID": [1, 2],
+        "Age": [30, 41],
+        "Diagnosis": ["Anxiety", "Depression"],
+        "Mood Score (1-10)": [3, 6],
+    }).to_csv(csv_file, index=False)
+    build_snapshot(csv_file, pd.read_csv, snapshot_dir)
+    from_snapshot = DiagnosisDataLoader(diagnosis_dir, snapshot_dir=snapshot_dir)
+    from_csv = DiagnosisDataLoader(diagnosis_dir)
+    assert from_snapshot.data.equals(from_csv.data)
@@ -0,0 +1,21 @@
+"""Smoke test: the app is created and its lifespan starts and stops cleanly."""
+
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent))  # Add server directory to path
+
+from config import settings
+from tests.test_async_agent import make_app
+
+
+def test_create_app_and_lifespan(tmp_path, monkeypatch):
+    """create_app wires every component and the lifespan runs without calling Claude."""
+    monkeypatch.setattr(settings, "local_sentiment_enabled", True)
+    app = make_app(tmp_path, monkeypatch)
+    with TestClient(app) as client:
+        assert client.get("/livez").status_code == 200
+        assert "chat_stream" in client.get("/").json()["endpoints"]
+        assert app.state.agent.counseling_loader.get_statistics()["total_conversations"] == 4
@@ -0,0 +1,141 @@
+"""Tests for batch survey analysis."""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))  # Add server directory to path
+
+from agents import AsyncClaudeAgent
+from config import settings
+
+
+class FakeMessages:
+    """Async messages API that tracks concurrency and fails on request."""
+    
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+    
+    async def create(self, **request):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if "FAIL" in request["messages"][0]["content"]:
+                raise RuntimeError("model unavailable")
+            text = "MESSAGE: Thanks for checking in.\nRECOMMENDATIONS:\n- Take a short walk"
+            return SimpleNamespace(content=[SimpleNamespace(text=text)], usage=None)
+        finally:
+            self.in_flight -= 1
+
+
+def make_agent(monkeypatch):
+    """AsyncClaudeAgent wired to a fake Claude client."""
+    monkeypatch.setattr(settings, "anthropic_api_key", "test-key")
+    monkeypatch.setattr(settings, "local_sentiment_enabled", False)
+    agent = AsyncClaudeAgent()
+    agent.async_client = SimpleNamespace(messages=FakeMessages())
+    return agent
+
+
+def survey(mood: int, thoughts: str = "busy week", medication_taken: bool = True):
+    return {
+        "medication_taken": medication_taken,
+        "mood_rating": mood,
+        "sleep_quality": 6,
+        "physical_activity": 5,
+        "thoughts": thoughts,
+        "user_id": f"patient-{mood}",
+    }
+
+
+def test_batch_matches_single_scoring_and_isolates_failures(monkeypatch):
+    """Results keep input order, reuse the single-survey rules and report per-item errors."""
+    agent = make_agent(monkeypatch)
+    surveys = [survey(8), survey(2, medication_taken=False), survey(5, thoughts="FAIL"), survey(9)]
+    
+    results = asyncio.run(agent.analyze_survey_batch(surveys, max_concurrency=2))
+    
+    assert len(results) == 4
+    for item, result in zip(surveys, results):
+        _, concerns, contacted = agent._assess_survey(
+            item["medication_taken"], item["mood_rating"], item["sleep_quality"], item["physical_activity"]
+        )
+        assert (result["key_concerns"], result["provider_contacted"]) == (concerns, contacted)
+    assert not results[1]["provider_contacted"]  # alert-worthy, but SMS alerts are disabled
+    assert results[0]["message"] == "Thanks for checking in."
+    assert "error" in results[2] and results[2]["message"]
+    assert results[2]["risk_level"] == agent._assess_survey(True, 5, 6, 5)[0]
+    assert "error" not in results[0] and "error" not in results[3]
+    assert agent.async_client.messages.peak <= 2
+
+
+def test_fast_mode_answers_low_risk_surveys_from_templates(monkeypatch):
+    """Low-risk check-ins skip Claude; concerning thoughts or risk still use it."""
+    agent = make_agent(monkeypatch)
+    monkeypatch.setattr(settings, "survey_fast_mode", True)
+    calls = []
+    create = agent.async_client.messages.create
+    
+    async def counting_create(**request):
+        calls.append(request)
+        return await create(**request)
+    
+    agent.async_client.messages.create = counting_create
+    surveys = [survey(8), survey(8, thoughts="I want to hurt myself"), survey(2, medication_taken=False)]
+    
+    results = asyncio.run(agent.analyze_survey_batch(surveys))
+    
+    assert len(calls) == 2
+    assert results[0]["message"] != "Thanks for checking in."
+    assert results[0]["risk_level"] == "low" and not results[0]["provider_contacted"]
+    assert results[1]["message"] == "Thanks for checking in."
+    assert agent.survey_latency.snapshot()["template"]["count"] == 1
+    assert agent.survey_latency.snapshot()["claude"]["count"] == 2
+
+
+def test_provider_contacted_reflects_queued_alert(monkeypatch):
+    """provider_contacted follows send_provider_alert, not the rule flag alone."""
+    import utils.sms
+    
+    agent = make_agent(monkeypatch)
+    sent = []
+    
+    def fake_send(**alert):
+        sent.append(alert)
+        return len(sent) == 1  # the repeat alert is deduplicated
+    
+    monkeypatch.setattr(utils.sms, "send_provider_alert", fake_send)
+    alerting = [survey(2, medication_taken=False), survey(2, medication_taken=False), survey(8)]
+    
+    results = asyncio.run(agent.analyze_survey_batch(alerting))
+    assert [r["provider_contacted"] for r in results] == [True, False, False]
+    assert len(sent) == 2
+    
+    monkeypatch.setattr(settings, "demo_report_provider_contacted", True)
+    results = asyncio.run(agent.analyze_survey_batch(alerting))
+    assert [r["provider_contacted"] for r in results] == [True, True, False]
+
+
+def test_single_survey_fallback_reports_alert_actually_queued(monkeypatch):
+    """When Claude fails, a single survey still reports whether an alert was queued, not the rule flag."""
+    from agents import ClaudeAgent
+    
+    monkeypatch.setattr(settings, "enable_sms_alerts", False)
+    agent = make_agent(monkeypatch)
+    alerting = survey(2, thoughts="FAIL", medication_taken=False)
+    del alerting["user_id"]
+    
+    result = asyncio.run(agent.analyze_survey(**alerting))
+    assert "error" in result and result["risk_level"] == agent._assess_survey(False, 2, 6, 5)[0]
+    assert result["provider_contacted"] is False
+    
+    def fail(**request):
+        raise RuntimeError("model unavailable")
+    
+    sync_agent = ClaudeAgent()
+    sync_agent.client = SimpleNamespace(messages=SimpleNamespace(create=fail))
+    result = sync_agent.analyze_survey(**alerting)
+    assert "error" in result and result["provider_contacted"] is False
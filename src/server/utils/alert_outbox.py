@@ -0,0 +1,232 @@
+"""Durable SQLite outbox for provider alerts.
+
+Each alert is written as a row before the survey request returns and stays
+``pending`` until the transport confirms delivery. Claiming a row only leases
+it for a while, so an alert whose sender crashed mid-send is retried by the
+next worker (at-least-once delivery, across restarts and worker processes).
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+from loguru import logger
+
+
+@dataclass
+class ProviderAlert:
+    """One provider notification as stored in the outbox."""
+    
+    patient_info: str
+    concern_level: str
+    key_concerns: List[str] = field(default_factory=list)
+    patient_id: Optional[str] = None
+    id: Optional[int] = None
+    attempts: int = 0
+    created_at: float = 0.0
+
+
+class AlertOutbox:
+    """
+    Alert rows in a SQLite database opened in WAL mode.
+    
+    Status moves ``pending`` -> ``sent`` or ``failed``. ``next_attempt_at``
+    schedules both retries and claim leases; rows are claimed in insertion
+    order inside a write transaction, so concurrent workers never claim the
+    same row while its lease is live.
+    """
+    
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        lease_seconds: float = 60.0,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Open (creating if needed) the outbox database.
+        
+        Args:
+            path: Database file path (``:memory:`` for a process-local outbox)
+            lease_seconds: How long a claimed alert is hidden from other claims
+            clock: Wall-clock time source, injectable for tests
+        """
+        self.path = str(path)
+        self.lease_seconds = lease_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS alerts ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "patient_info TEXT NOT NULL, patient_id TEXT, concern_level TEXT NOT NULL, "
+            "key_concerns TEXT NOT NULL, status TEXT NOT NULL DEFAULT 'pending', "
+            "attempts INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL, "
+            "next_attempt_at REAL NOT NULL, sent_at REAL, last_error TEXT)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS alerts_due ON alerts (status, next_attempt_at)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS alerts_patient ON alerts (patient_id, concern_level, created_at)"
+        )
+        logger.info(f"✅ Provider alert outbox at {self.path}")
+    
+    def add(self, alert: ProviderAlert, dedupe_window_seconds: float = 0) -> Optional[int]:
+        """
+        Durably record an alert for delivery.
+        
+        Args:
+            alert: Alert to store
+            dedupe_window_seconds: Skip the alert if one for the same patient and
+                risk level was recorded this recently and is still pending or was
+                sent (failed alerts and anonymous alerts never cause a skip)
+        
+        Returns:
+            Row id, or None if deduplicated
+        """
+        with self._lock:
+            now = self._clock()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if alert.patient_id and dedupe_window_seconds > 0:
+                    recent = self._conn.execute(
+                        "SELECT 1 FROM alerts WHERE patient_id = ? AND concern_level = ? AND created_at >= ? "
+                        "AND status IN ('pending', 'sent') LIMIT 1",
+                        (alert.patient_id, alert.concern_level, now - dedupe_window_seconds)
+                    ).fetchone()
+                    if recent:
+                        self._conn.execute("COMMIT")
+                        return None
+                cursor = self._conn.execute(
+                    "INSERT INTO alerts (patient_info, patient_id, concern_level, key_concerns, created_at, next_attempt_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (alert.patient_info, alert.patient_id, alert.concern_level,
+                     json.dumps(alert.key_concerns), now, now)
+                )
+                self._conn.execute("COMMIT")
+                return cursor.lastrowid
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+    
+    def claim(self, limit: int = 50) -> List[ProviderAlert]:
+        """
+        Lease up to ``limit`` due alerts, oldest first.
+        
+        Returns:
+            Claimed alerts (``attempts`` counts previous delivery attempts)
+        """
+        with self._lock:
+            now = self._clock()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, patient_info, patient_id, concern_level, key_concerns, attempts, created_at "
+                    "FROM alerts WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+                    (now, limit)
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE alerts SET next_attempt_at = ? WHERE id = ?",
+                    [(now + self.lease_seconds, row[0]) for row in rows]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [
+            ProviderAlert(
+                patient_info=row[1], patient_id=row[2], concern_level=row[3],
+                key_concerns=json.loads(row[4]), id=row[0], attempts=row[5], created_at=row[6]
+            )
+            for row in rows
+        ]
+    
+    def mark_sent(self, alert_id: int):
+        """Record a confirmed delivery."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE alerts SET status = 'sent', attempts = attempts + 1, sent_at = ?, last_error = NULL "
+                "WHERE id = ?",
+                (self._clock(), alert_id)
+            )
+    
+    def mark_retry(self, alert_id: int, error: str, delay_seconds: float):
+        """Record a failed attempt and schedule the next one."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE alerts SET attempts = attempts + 1, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (self._clock() + delay_seconds, error, alert_id)
+            )
+    
+    def mark_failed(self, alert_id: int, error: str):
+        """Give up on an alert after its final attempt."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE alerts SET status = 'failed', attempts = attempts + 1, last_error = ? WHERE id = ?",
+                (error, alert_id)
+            )
+    
+    def pending(self) -> int:
+        """Number of alerts not yet sent or given up on."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM alerts WHERE status = 'pending'").fetchone()[0]
+    
+    def seconds_until_due(self) -> Optional[float]:
+        """Time until the next pending alert may be claimed, or None if nothing is pending."""
+        with self._lock:
+            next_at = self._conn.execute(
+                "SELECT MIN(next_attempt_at) FROM alerts WHERE status = 'pending'"
+            ).fetchone()[0]
+        return None if next_at is None else max(0.0, next_at - self._clock())
+    
+    def purge(self, older_than_seconds: float) -> int:
+        """Delete sent and failed alerts created more than ``older_than_seconds`` ago."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM alerts WHERE status != 'pending' AND created_at < ?",
+                (self._clock() - older_than_seconds,)
+            )
+        if cursor.rowcount:
+            logger.info(f"Purged {cursor.rowcount} delivered provider alerts from the outbox")
+        return cursor.rowcount
+    
+    def stats(self, window_seconds: float = 60.0) -> Dict[str, Any]:
+        """
+        Backlog and throughput over the last ``window_seconds``.
+        
+        Returns:
+            Pending/failed counts, oldest pending age, alerts sent in the window
+            (and per second) and their mean enqueue-to-send delay
+        """
+        with self._lock:
+            now = self._clock()
+            pending, oldest = self._conn.execute(
+                "SELECT COUNT(*), MIN(created_at) FROM alerts WHERE status = 'pending'"
+            ).fetchone()
+            failed = self._conn.execute("SELECT COUNT(*) FROM alerts WHERE status = 'failed'").fetchone()[0]
+            sent, mean_delay = self._conn.execute(
+                "SELECT COUNT(*), AVG(sent_at - created_at) FROM alerts WHERE status = 'sent' AND sent_at >= ?",
+                (now - window_seconds,)
+            ).fetchone()
+        return {
+            "pending": pending,
+            "failed": failed,
+            "oldest_pending_seconds": round(now - oldest, 3) if oldest is not None else 0.0,
+            "sent_in_window": sent,
+            "sent_per_second": round(sent / window_seconds, 3),
+            "mean_delivery_seconds": round(mean_delay, 3) if mean_delay is not None else None,
+            "window_seconds": window_seconds,
+        }
+    
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
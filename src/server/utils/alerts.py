@@ -0,0 +1,300 @@
+"""Background dispatch of provider SMS alerts.
+
+Survey requests only record an alert in the durable outbox
+(utils.alert_outbox); a worker thread drains it through a reused transport
+(one Twilio client for the process), retrying failures with exponential
+backoff. Alerts survive restarts and are delivered at least once. Repeat
+alerts for the same patient and risk level within a time window are dropped,
+so a patient re-submitting a check-in does not page the provider several times.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from loguru import logger
+from config import settings
+from utils.alert_outbox import AlertOutbox, ProviderAlert
+
+
+def format_alert_message(concern_level: str, key_concerns: List[str]) -> str:
+    """
+    Render the SMS body for a provider alert.
+    
+    Args:
+        concern_level: Risk level (moderate/high)
+        key_concerns: List of concerning factors
+    
+    Returns:
+        Message text
+    """
+    concerns_text = ", ".join(key_concerns) if key_concerns else "multiple factors"
+    
+    return f"""
+🚨 MindPulse Alert - {concern_level.upper()} Risk
+
+Patient check-in shows concerning patterns:
+• Risk Level: {concern_level}
+• Concerns: {concerns_text}
+• Time: Just now
+
+Please review patient status.
+- MindPulse System
+    """.strip()
+
+
+class TwilioTransport:
+    """Sends alerts through Twilio, creating the client once and reusing it."""
+    
+    def __init__(self, account_sid: str, auth_token: str, from_number: str, to_number: str):
+        self.account_sid = account_sid
+        self.auth_token = auth_token
+        self.from_number = from_number
+        self.to_number = to_number
+        self._client = None
+    
+    @property
+    def client(self):
+        if self._client is None:
+            from twilio.rest import Client
+            
+            self._client = Client(self.account_sid, self.auth_token)
+        return self._client
+    
+    def send(self, body: str) -> str:
+        """Send one SMS and return its message SID."""
+        message = self.client.messages.create(body=body, from_=self.from_number, to=self.to_number)
+        return message.sid
+
+
+class FakeTransport:
+    """
+    In-process transport for tests and local development.
+    
+    Records every message instead of sending it, and can simulate a slow
+    gateway (``delay``) or transient failures (the first ``fail_times`` sends).
+    """
+    
+    def __init__(self, delay: float = 0.0, fail_times: int = 0):
+        self.delay = delay
+        self.fail_times = fail_times
+        self.attempts = 0
+        self.sent: List[str] = []
+    
+    def send(self, body: str) -> str:
+        """Record one message (or raise while failures remain)."""
+        self.attempts += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if self.attempts <= self.fail_times:
+            raise ConnectionError("simulated SMS gateway failure")
+        self.sent.append(body)
+        return f"FAKE{len(self.sent):06d}"
+
+
+ALERT_TRANSPORTS = {
+    "twilio": TwilioTransport,
+    "fake": FakeTransport,
+}
+
+
+def create_alert_transport(backend: str = "twilio", **options):
+    """
+    Create an alert transport by name.
+    
+    Args:
+        backend: One of ``ALERT_TRANSPORTS``
+        **options: Transport constructor arguments
+    
+    Returns:
+        Transport with a ``send(body) -> sid`` method
+    """
+    if backend not in ALERT_TRANSPORTS:
+        raise ValueError(f"Unknown alert transport '{backend}'. Choose from: {sorted(ALERT_TRANSPORTS)}")
+    return ALERT_TRANSPORTS[backend](**options)
+
+
+class AlertDispatcher:
+    """
+    Delivers provider alerts from an outbox on one background worker thread.
+    
+    ``enqueue`` only writes the outbox row and wakes the worker, so it never
+    waits on the network. A failed send is rescheduled in the outbox
+    ``backoff_seconds * 2 ** attempt`` later (other alerts keep flowing
+    meanwhile) and given up on after ``max_retries`` retries.
+    """
+    
+    def __init__(
+        self,
+        transport,
+        outbox: Optional[AlertOutbox] = None,
+        max_retries: int = 3,
+        backoff_seconds: float = 2.0,
+        dedupe_window_seconds: float = 900.0,
+        retention_seconds: float = 7 * 24 * 3600,
+        batch_size: int = 50,
+        poll_seconds: float = 5.0
+    ):
+        self.transport = transport
+        self.outbox = outbox if outbox is not None else AlertOutbox()
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.dedupe_window_seconds = dedupe_window_seconds
+        self.retention_seconds = max(retention_seconds, dedupe_window_seconds)
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._last_purge = 0.0
+        self._stats = {"enqueued": 0, "sent": 0, "failed": 0, "retried": 0, "deduplicated": 0}
+    
+    def enqueue(
+        self,
+        patient_info: str,
+        concern_level: str,
+        key_concerns: List[str],
+        patient_id: Optional[str] = None
+    ) -> bool:
+        """
+        Durably record an alert for background delivery.
+        
+        Args:
+            patient_info: Patient identifier or info for the message
+            concern_level: Risk level (moderate/high)
+            key_concerns: List of concerning factors
+            patient_id: Stable patient identifier used for deduplication
+                (anonymous alerts are never deduplicated)
+        
+        Returns:
+            True if recorded, False if deduplicated
+        """
+        alert = ProviderAlert(patient_info, concern_level, list(key_concerns), patient_id)
+        alert_id = self.outbox.add(alert, self.dedupe_window_seconds)
+        with self._lock:
+            if alert_id is None:
+                self._stats["deduplicated"] += 1
+                logger.info(f"Provider alert for {patient_id} already sent recently - skipping")
+                return False
+            self._stats["enqueued"] += 1
+        self.start()
+        self._wake.set()
+        return True
+    
+    def start(self):
+        """Start the worker if it is not running (also delivers alerts left by a previous process)."""
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._stop.clear()
+                self._worker = threading.Thread(target=self._run, name="provider-alerts", daemon=True)
+                self._worker.start()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every pending alert has been delivered or given up on.
+        
+        Returns:
+            True if the outbox drained within ``timeout``
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.outbox.pending():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+    
+    def close(self, timeout: float = 5.0):
+        """Deliver what is pending (within ``timeout``) and stop the worker; the rest stays in the outbox."""
+        if self._worker is not None:
+            self.flush(timeout)
+        self._stop.set()
+        self._wake.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            if self._worker.is_alive():
+                return
+        self.outbox.close()
+    
+    def stats(self) -> Dict[str, Any]:
+        """This process's delivery counters plus outbox backlog and throughput."""
+        with self._lock:
+            counters = dict(self._stats)
+        return {**counters, "outbox": self.outbox.stats()}
+    
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            batch = self.outbox.claim(self.batch_size)
+            for alert in batch:
+                if self._stop.is_set():
+                    return
+                self._deliver(alert)
+            if not batch:
+                self._purge_delivered()
+                due = self.outbox.seconds_until_due()
+                self._wake.wait(self.poll_seconds if due is None else min(due, self.poll_seconds))
+    
+    def _deliver(self, alert: ProviderAlert):
+        body = format_alert_message(alert.concern_level, alert.key_concerns)
+        try:
+            sid = self.transport.send(body)
+        except Exception as e:
+            if alert.attempts >= self.max_retries:
+                self.outbox.mark_failed(alert.id, str(e))
+                logger.error(f"❌ Failed to send provider alert after {alert.attempts + 1} attempts: {e}")
+                with self._lock:
+                    self._stats["failed"] += 1
+                return
+            delay = self.backoff_seconds * 2 ** alert.attempts
+            self.outbox.mark_retry(alert.id, str(e), delay)
+            logger.warning(f"⚠️ Provider alert send failed ({e}) - retrying in {delay:.1f}s")
+            with self._lock:
+                self._stats["retried"] += 1
+            return
+        
+        self.outbox.mark_sent(alert.id)
+        logger.info(f"✅ Provider alert sent successfully (SID: {sid})")
+        with self._lock:
+            self._stats["sent"] += 1
+    
+    def _purge_delivered(self):
+        now = time.monotonic()
+        if now - self._last_purge >= 3600:
+            self._last_purge = now
+            self.outbox.purge(self.retention_seconds)
+
+
+_dispatcher: Optional[AlertDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_alert_dispatcher() -> AlertDispatcher:
+    """Process-wide dispatcher built from settings on first use."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            transport = create_alert_transport(settings.alert_transport, **settings.get_alert_transport_options())
+            _dispatcher = AlertDispatcher(
+                transport,
+                outbox=AlertOutbox(settings.alert_outbox_path),
+                max_retries=settings.alert_max_retries,
+                backoff_seconds=settings.alert_retry_backoff_seconds,
+                dedupe_window_seconds=settings.alert_dedupe_window_seconds,
+                retention_seconds=settings.alert_outbox_retention_hours * 3600
+            )
+        return _dispatcher
+
+
+def current_alert_dispatcher() -> Optional[AlertDispatcher]:
+    """Process-wide dispatcher if one has been created (never creates one)."""
+    with _dispatcher_lock:
+        return _dispatcher
+
+
+def shutdown_alert_dispatcher(timeout: float = 5.0):
+    """Drain and stop the process-wide dispatcher, if one was created."""
+    global _dispatcher
+    with _dispatcher_lock:
+        dispatcher, _dispatcher = _dispatcher, None
+    if dispatcher is not None:
+        dispatcher.close(timeout)
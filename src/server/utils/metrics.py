@@ -0,0 +1,180 @@
+"""In-process counters for Claude token usage, request latency and upstream health."""
+
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+import numpy as np
+
+
+USAGE_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+)
+
+
+class UsageMetrics:
+    """
+    Per-endpoint totals of the ``usage`` block returned with every Claude response.
+    
+    Cache reads are billed at a fraction of normal input tokens and skip
+    prefill, so ``cache_hit_ratio`` (cached input over all input) is the
+    number to watch when tuning prompt caching.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(("calls",) + USAGE_FIELDS, 0)
+        )
+    
+    def record(self, endpoint: str, usage: Any):
+        """
+        Add one response's usage to an endpoint's totals.
+        
+        Args:
+            endpoint: Endpoint name (chat, sentiment, diagnosis, survey)
+            usage: The response's ``usage`` object (missing fields count as 0)
+        """
+        if usage is None:
+            return
+        with self._lock:
+            totals = self._totals[endpoint]
+            totals["calls"] += 1
+            for field in USAGE_FIELDS:
+                totals[field] += getattr(usage, field, None) or 0
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get a copy of the totals.
+        
+        Returns:
+            Per-endpoint token totals with a derived ``cache_hit_ratio``
+        """
+        with self._lock:
+            result = {}
+            for endpoint, totals in self._totals.items():
+                entry = dict(totals)
+                cached = entry["cache_read_input_tokens"]
+                total_input = entry["input_tokens"] + entry["cache_creation_input_tokens"] + cached
+                entry["cache_hit_ratio"] = round(cached / total_input, 4) if total_input else 0.0
+                result[endpoint] = entry
+            return result
+
+
+class LatencyMetrics:
+    """
+    Per-mode latency summaries over a sliding window of recent requests.
+    
+    Keeps the last ``window`` durations for each mode (e.g. ``template`` vs
+    ``claude`` survey responses) and reports count, mean and percentiles.
+    """
+    
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.window))
+        self._counts: Dict[str, int] = defaultdict(int)
+    
+    def record(self, mode: str, seconds: float):
+        """
+        Record one request's duration.
+        
+        Args:
+            mode: How the request was served
+            seconds: Wall-clock duration
+        """
+        with self._lock:
+            self._samples[mode].append(seconds)
+            self._counts[mode] += 1
+    
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize recorded durations.
+        
+        Returns:
+            Per-mode total count plus mean/p50/p95/max milliseconds over the window
+        """
+        with self._lock:
+            samples = {mode: np.array(values) * 1000 for mode, values in self._samples.items()}
+            counts = dict(self._counts)
+        return {
+            mode: {
+                "count": counts[mode],
+                "mean_ms": round(float(ms.mean()), 3),
+                "p50_ms": round(float(np.percentile(ms, 50)), 3),
+                "p95_ms": round(float(np.percentile(ms, 95)), 3),
+                "max_ms": round(float(ms.max()), 3),
+            }
+            for mode, ms in samples.items()
+        }
+
+
+class UpstreamHealth:
+    """
+    Success and error counts for upstream (Claude) calls over a rolling time window.
+    
+    Fed by the requests the service already makes, so readiness can reflect
+    upstream trouble without sending probe traffic of its own.
+    """
+    
+    def __init__(self, window_seconds: float = 300.0, clock: Callable[[], float] = time.time):
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._events: Deque[Tuple[float, bool]] = deque()
+        self._errors = 0
+        self._last_success: Optional[float] = None
+        self._last_error: Optional[Tuple[float, str]] = None
+    
+    def record(self, ok: bool, error: Optional[Exception] = None):
+        """
+        Record the outcome of one upstream call.
+        
+        Args:
+            ok: Whether the call succeeded
+            error: The exception raised by a failed call
+        """
+        with self._lock:
+            now = self._clock()
+            self._events.append((now, ok))
+            if ok:
+                self._last_success = now
+            else:
+                self._errors += 1
+                self._last_error = (now, str(error) if error else "")
+            self._expire(now)
+    
+    def _expire(self, now: float):
+        """Drop outcomes older than the window (caller holds the lock)."""
+        cutoff = now - self.window_seconds
+        while self._events and self._events[0][0] < cutoff:
+            if not self._events.popleft()[1]:
+                self._errors -= 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Summarize the window.
+        
+        Returns:
+            Call and error counts, error rate and the age of the last success/error
+        """
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            calls = len(self._events)
+            return {
+                "window_seconds": self.window_seconds,
+                "calls": calls,
+                "errors": self._errors,
+                "error_rate": round(self._errors / calls, 4) if calls else 0.0,
+                "last_success_seconds_ago": (
+                    round(now - self._last_success, 3) if self._last_success is not None else None
+                ),
+                "last_error_seconds_ago": (
+                    round(now - self._last_error[0], 3) if self._last_error is not None else None
+                ),
+                "last_error": self._last_error[1] if self._last_error is not None else None,
+            }
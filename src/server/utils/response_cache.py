@@ -0,0 +1,149 @@
+"""Bounded LRU cache for model responses with optional SQLite persistence."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+from loguru import logger
+
+
+class ResponseCache:
+    """
+    Least-recently-used cache of JSON-serializable results keyed by string.
+    
+    Lookups hit an in-memory LRU first; when a ``path`` is given, entries are
+    also written through to a SQLite file so they survive restarts and are
+    shared by worker processes on the same host. The file holds at most
+    ``max_entries`` rows too, dropping the oldest written first.
+    """
+    
+    def __init__(self, max_entries: int = 2048, path: Optional[Union[str, Path]] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: In-memory and on-disk capacity (0 disables the cache)
+            path: Optional SQLite file for persistence
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        
+        self._conn = None
+        if path and max_entries > 0:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(
+                str(path), timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_created ON responses (created)")
+            logger.info(f"✅ Persistent response cache at {path}")
+    
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """
+        Build a cache key from its components.
+        
+        Args:
+            *parts: Key components (e.g. normalized input, model, prompt version)
+        
+        Returns:
+            Hex digest identifying the combination
+        """
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Copy of the cached result, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None and self._conn is not None:
+                row = self._conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._remember(key, value)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(value)
+    
+    def put(self, key: str, value: Dict[str, Any]):
+        """
+        Store a result.
+        
+        Args:
+            key: Cache key
+            value: JSON-serializable result
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._remember(key, dict(value))
+            if self._conn is not None:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO responses (key, value, created) VALUES (?, ?, ?)",
+                        (key, json.dumps(value), time.time())
+                    )
+                    # Keep the file as bounded as the in-memory LRU
+                    self._conn.execute(
+                        "DELETE FROM responses WHERE created <= ("
+                        "SELECT created FROM responses ORDER BY created DESC LIMIT 1 OFFSET ?)",
+                        (self.max_entries,)
+                    )
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+    
+    def _remember(self, key: str, value: Dict[str, Any]):
+        """Insert into the in-memory LRU, evicting the oldest entry if full (lock held)."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+        
+        Returns:
+            Size, capacity, hit/miss counts and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "persistent": self._conn is not None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
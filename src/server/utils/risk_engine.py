@@ -0,0 +1,224 @@
+"""Rule-based survey risk scoring, vectorized over arrays and DataFrames.
+
+Pure NumPy/pandas with no model or I/O dependencies, so the same rules serve
+the online survey endpoints and offline scoring of historical check-ins.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Tuple, Union
+import numpy as np
+import pandas as pd
+
+
+ArrayLike = Union[np.ndarray, pd.Series, List, bool, int]
+
+# Survey concern labels, in the order they are reported
+SURVEY_CONCERNS: Tuple[str, ...] = (
+    "missed_medication",
+    "low_mood",
+    "mediocre_mood",
+    "okay_mood",
+    "poor_sleep",
+    "mediocre_sleep",
+    "minimal_activity",
+    "low_activity",
+    "mood_physical_discrepancy",
+    "severe_mood_discrepancy",
+)
+
+RISK_LEVELS = ("low", "moderate", "high")
+
+# Phrases that always warrant a full (model or human) assessment
+SELF_HARM_PATTERN = re.compile(
+    r"suicid|kill (?:my)?self|end (?:it all|my life)|self[- ]?harm|hurt(?:ing)? myself|"
+    r"want(?:ed)? to die|better off dead|no reason to live|overdose",
+    re.IGNORECASE
+)
+
+
+@dataclass
+class SurveyScores:
+    """Element-wise results of :func:`score_surveys`."""
+    
+    risk_level: np.ndarray  # str per survey: low | moderate | high
+    concern_flags: np.ndarray  # bool matrix, one column per SURVEY_CONCERNS entry
+    provider_alert: np.ndarray  # bool per survey
+    
+    def __len__(self) -> int:
+        return len(self.risk_level)
+    
+    def concerns(self, i: int) -> List[str]:
+        """Concern labels of survey ``i``."""
+        return [SURVEY_CONCERNS[j] for j in np.flatnonzero(self.concern_flags[i])]
+    
+    def concern_lists(self) -> List[List[str]]:
+        """Concern labels of every survey."""
+        return [self.concerns(i) for i in range(len(self))]
+
+
+def _critical_factors(missed, mood, sleep, activity) -> np.ndarray:
+    """Count missed meds, very low mood, very poor sleep and minimal activity per survey."""
+    return missed.astype(np.int64) + (mood <= 3) + (sleep <= 3) + (activity <= 2)
+
+
+def score_surveys(
+    medication_taken: ArrayLike,
+    mood: ArrayLike,
+    sleep: ArrayLike,
+    activity: ArrayLike
+) -> SurveyScores:
+    """
+    Evaluate the clinical survey rules element-wise.
+    
+    Args:
+        medication_taken: Whether medication was taken
+        mood: Mood ratings (1-10)
+        sleep: Sleep quality ratings (1-10)
+        activity: Physical activity ratings (1-10)
+    
+    Returns:
+        Risk level, concern flags and provider-alert mask per survey
+    """
+    missed = ~np.atleast_1d(np.asarray(medication_taken, dtype=bool))
+    mood = np.atleast_1d(np.asarray(mood, dtype=np.int64))
+    sleep = np.atleast_1d(np.asarray(sleep, dtype=np.int64))
+    activity = np.atleast_1d(np.asarray(activity, dtype=np.int64))
+    
+    low_mood = mood <= 3
+    poor_sleep = sleep <= 3
+    minimal_activity = activity <= 2
+    
+    # CRITICAL: Detect discrepancy between physical health and mood
+    physical_sum = sleep + activity  # average >= 7 <=> sum >= 14
+    mood_discrepancy = (physical_sum >= 14) & (mood <= 6)
+    severe_mood_discrepancy = (physical_sum >= 12) & (mood <= 4)
+    
+    concern_flags = np.column_stack([
+        missed,
+        low_mood,
+        ~low_mood & (mood <= 5),
+        mood == 6,  # Track "just okay" separately
+        poor_sleep,
+        ~poor_sleep & (sleep <= 5),
+        minimal_activity,
+        ~minimal_activity & (activity <= 5),
+        mood_discrepancy,
+        severe_mood_discrepancy,
+    ])
+    
+    # Count CRITICAL concerns (not mediocre ones)
+    critical = _critical_factors(missed, mood, sleep, activity)
+    
+    # HIGH RISK criteria (serious combinations requiring immediate attention)
+    high = (
+        severe_mood_discrepancy  # Good physical health but very low mood - major red flag
+        | (missed & (mood <= 3))  # Missed meds + very low mood
+        | (critical >= 3)  # 3+ critical factors
+        | ((critical >= 2) & (mood <= 2))  # 2+ factors with critical mood
+        | (missed & (mood <= 4) & (sleep <= 3))  # Missed meds + low mood + poor sleep
+    )
+    # MODERATE RISK criteria (concerning patterns)
+    moderate = (
+        mood_discrepancy  # Physical health good but mood mediocre/low - underlying issue
+        | (critical >= 2)  # 2+ critical concerns
+        | (missed & ((mood <= 5) | (sleep <= 5)))  # Missed meds + mediocre metrics
+        | low_mood  # Very low mood alone
+        | ((mood <= 5) & (sleep <= 5) & (activity <= 5))  # Everything mediocre
+        | ((mood == 6) & (sleep >= 7) & (activity >= 7))  # Just "okay" mood despite good physical health
+    )
+    # LOW RISK - only when things are genuinely going well
+    risk_level = np.where(high, "high", np.where(moderate, "moderate", "low"))
+    
+    provider_alert = _alert_mask(critical, low_mood, missed, high)
+    return SurveyScores(risk_level, concern_flags, provider_alert)
+
+
+def _alert_mask(critical, low_mood, missed, high_risk) -> np.ndarray:
+    """Alert on 3+ critical factors, high risk with 2+, or very low mood + missed meds."""
+    return (critical >= 3) | (high_risk & (critical >= 2)) | (low_mood & missed)
+
+
+def deterioration_alert(
+    medication_taken: ArrayLike,
+    mood: ArrayLike,
+    sleep: ArrayLike,
+    activity: ArrayLike,
+    risk_level: ArrayLike
+) -> np.ndarray:
+    """
+    Decide element-wise whether the provider should be alerted, given a risk level.
+    
+    Args:
+        medication_taken: Whether medication was taken
+        mood: Mood ratings (1-10)
+        sleep: Sleep quality ratings (1-10)
+        activity: Physical activity ratings (1-10)
+        risk_level: Risk level per survey (low, moderate or high)
+    
+    Returns:
+        Boolean alert mask
+    """
+    missed = ~np.atleast_1d(np.asarray(medication_taken, dtype=bool))
+    mood = np.atleast_1d(np.asarray(mood, dtype=np.int64))
+    critical = _critical_factors(
+        missed, mood,
+        np.atleast_1d(np.asarray(sleep, dtype=np.int64)),
+        np.atleast_1d(np.asarray(activity, dtype=np.int64))
+    )
+    high = np.atleast_1d(np.asarray(risk_level)) == "high"
+    return _alert_mask(critical, mood <= 3, missed, high)
+
+
+def assess_survey(
+    medication_taken: bool,
+    mood: int,
+    sleep: int,
+    activity: int
+) -> Tuple[str, List[str], bool]:
+    """
+    Score a single survey.
+    
+    Returns:
+        Tuple of (risk level, concerns, whether the provider should be alerted)
+    """
+    scores = score_surveys(medication_taken, mood, sleep, activity)
+    return str(scores.risk_level[0]), scores.concerns(0), bool(scores.provider_alert[0])
+
+
+def mentions_self_harm(text: str) -> bool:
+    """Whether free text contains an explicit self-harm or suicide phrase."""
+    return bool(text) and SELF_HARM_PATTERN.search(text) is not None
+
+
+def score_survey_frame(
+    surveys: pd.DataFrame,
+    medication_col: str = "medication_taken",
+    mood_col: str = "mood_rating",
+    sleep_col: str = "sleep_quality",
+    activity_col: str = "physical_activity"
+) -> pd.DataFrame:
+    """
+    Score a DataFrame of surveys, e.g. historical check-ins.
+    
+    Args:
+        surveys: One survey per row
+        medication_col: Boolean medication column
+        mood_col: Mood rating column
+        sleep_col: Sleep quality column
+        activity_col: Physical activity column
+    
+    Returns:
+        DataFrame on the same index with a categorical ``risk_level``, a
+        boolean ``provider_alert`` and one boolean column per concern
+    """
+    scores = score_surveys(
+        surveys[medication_col].to_numpy(),
+        surveys[mood_col].to_numpy(),
+        surveys[sleep_col].to_numpy(),
+        surveys[activity_col].to_numpy()
+    )
+    result = pd.DataFrame(scores.concern_flags, index=surveys.index, columns=list(SURVEY_CONCERNS))
+    result.insert(0, "provider_alert", scores.provider_alert)
+    result.insert(0, "risk_level", pd.Categorical(scores.risk_level, categories=RISK_LEVELS, ordered=True))
+    return result
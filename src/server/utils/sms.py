@@ -3,29 +3,36 @@
 from typing import Optional
 from loguru import logger
 from config import settings
+from utils.alerts import get_alert_dispatcher
+from utils.risk_engine import deterioration_alert
 
 
 def send_provider_alert(
     patient_info: str,
     concern_level: str,
-    key_concerns: list
+    key_concerns: list,
+    patient_id: Optional[str] = None
 ) -> bool:
     """
-    Send SMS alert to provider about patient deterioration.
+    Queue an SMS alert to the provider about patient deterioration.
+    
+    The message is sent by the background dispatcher in utils.alerts, so this
+    returns without waiting on the SMS gateway.
     
     Args:
         patient_info: Patient identifier or info
         concern_level: Risk level (moderate/high)
         key_concerns: List of concerning factors
-        
+        patient_id: Stable patient identifier, used to drop repeat alerts
+    
     Returns:
-        True if SMS sent successfully, False otherwise
+        True if the alert was queued, False otherwise
     """
     if not settings.enable_sms_alerts:
         logger.info("SMS alerts disabled - skipping provider notification")
         return False
     
-    if not all([
+    if settings.alert_transport.lower() == "twilio" and not all([
         settings.twilio_account_sid,
         settings.twilio_auth_token,
         settings.twilio_phone_number,
@@ -35,40 +42,10 @@ def send_provider_alert(
         return False
     
     try:
-        from twilio.rest import Client
-        
-        client = Client(
-            settings.twilio_account_sid,
-            settings.twilio_auth_token
-        )
-        
-        # Create alert message
-        concerns_text = ", ".join(key_concerns) if key_concerns else "multiple factors"
-        
-        message_body = f"""
-🚨 MindPulse Alert - {concern_level.upper()} Risk
-
-Patient check-in shows concerning patterns:
-• Risk Level: {concern_level}
-• Concerns: {concerns_text}
-• Time: Just now
-
-Please review patient status.
-- MindPulse System
-        """.strip()
-        
-        # Send SMS
-        message = client.messages.create(
-            body=message_body,
-            from_=settings.twilio_phone_number,
-            to=settings.provider_phone_number
-        )
-        
-        logger.info(f"✅ Provider alert sent successfully (SID: {message.sid})")
-        return True
-        
+        return get_alert_dispatcher().enqueue(patient_info, concern_level, key_concerns, patient_id)
+    
     except Exception as e:
-        logger.error(f"❌ Failed to send provider alert: {e}")
+        logger.error(f"❌ Failed to queue provider alert: {e}")
         return False
 
 
@@ -82,45 +59,23 @@ def is_deterioration_detected(
     """
     Determine if mental health deterioration indicators are present.
     
-    Criteria for alerting provider:
-    - Medication not taken
-    - Mood rating <= 3 (very low)
-    - Sleep quality <= 3 (very poor)
-    - Physical activity <= 2 (minimal)
-    - Risk level is moderate or high
+    Concerning factors: medication not taken, mood <= 3, sleep <= 3 and
+    activity <= 2. The provider is alerted on 3+ factors, high risk with 2+
+    factors, or very low mood with missed medication (rules live in
+    utils.risk_engine, shared with the survey endpoints).
     
     Returns:
         True if deterioration detected and provider should be alerted
     """
-    # Check critical indicators
-    critical_mood = mood_rating <= 3
-    critical_sleep = sleep_quality <= 3
-    no_medication = not medication_taken
-    minimal_activity = physical_activity <= 2
-    elevated_risk = risk_level in ['moderate', 'high']
-    
-    # Count concerning factors
-    concerning_factors = sum([
-        critical_mood,
-        critical_sleep,
-        no_medication,
-        minimal_activity
-    ])
-    
-    # Alert if:
-    # - 3+ concerning factors, OR
-    # - High risk level with 2+ factors, OR
-    # - Critical mood + no medication
-    should_alert = (
-        concerning_factors >= 3 or
-        (risk_level == 'high' and concerning_factors >= 2) or
-        (critical_mood and no_medication)
-    )
+    should_alert = bool(deterioration_alert(
+        medication_taken, mood_rating, sleep_quality, physical_activity, risk_level
+    )[0])
     
     if should_alert:
         logger.warning(
             f"⚠️ Deterioration detected: "
-            f"factors={concerning_factors}, risk={risk_level}"
+            f"mood={mood_rating}, sleep={sleep_quality}, activity={physical_activity}, "
+            f"medication_taken={medication_taken}, risk={risk_level}"
         )
     
     return should_alert